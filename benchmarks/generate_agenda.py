@@ -0,0 +1,171 @@
+"""Generate synthetic developers-conferences-agenda READMEs for benchmarks."""
+
+#region Imports
+import argparse
+import calendar
+import random
+from datetime import date
+from pathlib import Path
+#endregion
+
+# Entry counts of the standard benchmark agendas
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# Years covered by generated agendas, around the current year so that date and
+# open CFP filters select a realistic share of the conferences
+YEARS_BEFORE = 3
+YEARS_AFTER = 2
+
+LOCATIONS = [
+    ("Paris", "France"),
+    ("Lyon", "France"),
+    ("Nantes", "France"),
+    ("Brussels", "Belgium"),
+    ("London", "UK"),
+    ("San Francisco, CA", "USA"),
+    ("New York, NY", "USA"),
+    ("Austin, TX", "USA"),
+    ("Berlin", "Germany"),
+    ("Munich", "Germany"),
+    ("Amsterdam", "The Netherlands"),
+    ("Madrid", "Spain"),
+    ("Krakow", "Poland"),
+    ("Bengaluru", "India"),
+    ("Bali", "Indonesia"),
+    ("Tokyo", "Japan"),
+    ("Montreal", "Canada"),
+    ("Sydney", "Australia"),
+]
+
+NAMES = [
+    "Devoxx",
+    "DevFest",
+    "PyCon",
+    "DjangoCon",
+    "JSConf",
+    "React Summit",
+    "VueConf",
+    "NodeConf",
+    "KubeCon",
+    "DockerCon",
+    "Cloud Native Days",
+    "AWS Community Day",
+    "AI Summit",
+    "Machine Learning Week",
+    "Data Days",
+    "Big Data Conference",
+    "Mobile World",
+    "Android Makers",
+    "Java Day",
+    "Spring I/O",
+    "DotNet Conf",
+    "Agile Tour",
+    "Scrum Gathering",
+    "Security BSides",
+    "InfoSec World",
+    "Web Summit",
+    "Frontend Masters Live",
+    "Software Craft",
+    "GDG Meetup",
+    "Tech Leaders Forum",
+]
+
+
+def generate_agenda(entries: int, seed: int = 42, today: date | None = None) -> str:
+    """
+    Generate the content of a README in the developers-conferences-agenda format.
+
+    Conferences are spread evenly over the months of the years around today, with
+    single-day, multi-day and month-spanning dates, online events, entries without
+    location, CFP badges and the non-entry lines found in the real agenda.
+
+    Args:
+        entries: Number of conference entries
+        seed: Random seed, the same seed always generates the same README
+        today: Reference date of the covered years, defaults to today
+
+    Returns:
+        README content
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    years = range(today.year - YEARS_BEFORE, today.year + YEARS_AFTER + 1)
+    months = len(years) * 12
+
+    lines = [
+        "# Developers Conferences Agenda",
+        "",
+        "List of all Developers Conferences and Events.",
+        "",
+        "Contributions are welcome, [see how to contribute](CONTRIBUTING.md).",
+        "",
+    ]
+    count = 0
+    for month_index in range(months):
+        year = years[month_index // 12]
+        month = month_index % 12 + 1
+        if month == 1:
+            lines += [f"## {year}", ""]
+        lines += [f"### {calendar.month_name[month]}", ""]
+
+        # Spread the remaining entries over the remaining months
+        month_entries = (entries - count) // (months - month_index)
+        last_day = calendar.monthrange(year, month)[1]
+        for day in sorted(rng.randint(1, last_day) for _ in range(month_entries)):
+            lines.append(_entry_line(rng, count, year, month, day, last_day))
+            count += 1
+        lines += ["", "[Back to top](#top)", ""]
+
+    return "\n".join(lines)
+
+
+def _entry_line(rng: random.Random, number: int, year: int, month: int, day: int,
+                last_day: int) -> str:
+    roll = rng.random()
+    if roll < 0.05 and day == last_day and month < 12:
+        dates = f"{day}-02/{month + 1:02d}"
+    elif roll < 0.4 and day < last_day:
+        dates = f"{day}-{min(day + rng.randint(1, 2), last_day)}"
+    else:
+        dates = str(day)
+
+    name = f"{rng.choice(NAMES)} {year} #{number}"
+    line = f"* {dates}: [{name}](https://example.com/{year}/{number})"
+
+    roll = rng.random()
+    if roll < 0.1:
+        line += " - Online"
+    elif roll < 0.97:
+        city, country = rng.choice(LOCATIONS)
+        line += f" - {city} ({country})"
+
+    if rng.random() < 0.35:
+        # CFP closing a few weeks to a few months before the conference
+        offset = rng.randint(20, 150)
+        cfp = date.fromordinal(date(year, month, day).toordinal() - offset)
+        until = f"{cfp.day}-{calendar.month_name[cfp.month]}-{cfp.year}"
+        line += (
+            f' <a href="https://cfp.example.com/{number}"><img alt="CFP {name}" '
+            f'src="https://img.shields.io/static/v1?label=CFP&message=until%20{until}'
+            f'&color=red"></a>'
+        )
+    return line
+
+
+def write_agenda(entries: int, data_dir: Path, seed: int = 42) -> Path:
+    """Write a generated README.md in data_dir and return its path."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    readme = data_dir / "README.md"
+    readme.write_text(generate_agenda(entries, seed), encoding="utf-8")
+    return readme
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("entries", type=int, help="Number of conference entries")
+    parser.add_argument("data_dir", type=Path, help="Directory where README.md is written")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    path = write_agenda(args.entries, args.data_dir, args.seed)
+    print(f"Wrote {args.entries} conferences to {path}")
@@ -0,0 +1,289 @@
+"""
+Benchmarks of the agenda parser, of apply_filter and of search_conferences tool calls.
+
+Synthetic agendas of each size are generated in a temporary directory, then each
+benchmark is timed over several iterations. Results (throughput, p50/p99 latency,
+peak traced memory) are printed and saved as JSON; with --baseline, p50 latencies
+are compared to a previous run and the exit status is 1 on regressions.
+
+Usage:
+    uv run benchmarks/run_benchmarks.py --sizes 1k,10k --baseline benchmarks/results/main.json
+"""
+
+#region Imports
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_server"))
+
+from generate_agenda import SIZES, write_agenda  # noqa: E402
+#endregion
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Iterations of the query benchmarks for each size, parsing runs fewer times
+QUERY_ITERATIONS = {"1k": 200, "10k": 100, "100k": 20}
+PARSE_ITERATIONS = {"1k": 10, "10k": 5, "100k": 3}
+
+TODAY = date.today()
+
+# Representative filter mixes, as search_conferences arguments
+FILTER_MIXES: dict[str, dict[str, Any]] = {
+    "all": {},
+    "country": {"country": "France"},
+    "tags": {"tags": "python,ai"},
+    "dates": {"min_date": TODAY, "max_date": TODAY + timedelta(days=90)},
+    "cfp_open": {"cfp_open": True},
+    "combined": {"cfp_open": True, "country": "USA", "tags": "cloud", "min_date": TODAY},
+}
+
+
+#region Measures
+def percentile(values: list[float], percent: float) -> float:
+    """Percentile of values, linearly interpolated between the closest ranks."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percent / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(name: str, size: str, durations: list[float], peak_memory: int,
+              items: int | None = None) -> dict[str, Any]:
+    """Build the result of a benchmark from its per-iteration durations in seconds."""
+    total = sum(durations)
+    result = {
+        "name": name,
+        "size": size,
+        "iterations": len(durations),
+        "ops_per_second": round(len(durations) / total, 3),
+        "p50_ms": round(percentile(durations, 50) * 1000, 3),
+        "p99_ms": round(percentile(durations, 99) * 1000, 3),
+        "mean_ms": round(total / len(durations) * 1000, 3),
+        "peak_memory_bytes": peak_memory,
+    }
+    if items is not None:
+        result["items_per_second"] = round(items * len(durations) / total, 1)
+    return result
+
+
+def measure(func: Callable[[], Any], iterations: int) -> tuple[list[float], int]:
+    """Time iterations calls of func, then trace the memory of one more call."""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations, _traced_peak(func)
+
+
+async def measure_async(func: Callable[[], Awaitable[Any]],
+                        iterations: int) -> tuple[list[float], int]:
+    """Time iterations awaits of func, then trace the memory of one more await."""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        await func()
+        return durations, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _traced_peak(func: Callable[[], Any]) -> int:
+    # Tracing slows allocations down, so it is kept out of the timed iterations
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+#endregion
+
+
+#region Benchmarks
+def bench_parser(size: str, data_dir: Path, snapshot_dir: Path) -> list[dict[str, Any]]:
+    """Time MarkdownParserService construction, parsing the README or loading a snapshot."""
+    from markdown_parser import MarkdownParserService
+
+    iterations = PARSE_ITERATIONS[size]
+    entries = SIZES[size]
+
+    durations, peak = measure(
+        lambda: MarkdownParserService(data_dir, snapshot_dir=None), iterations
+    )
+    results = [summarize("parse", size, durations, peak, entries)]
+
+    MarkdownParserService(data_dir, snapshot_dir=snapshot_dir)
+    durations, peak = measure(
+        lambda: MarkdownParserService(data_dir, snapshot_dir=snapshot_dir), iterations
+    )
+    results.append(summarize("snapshot_load", size, durations, peak, entries))
+    return results
+
+
+async def bench_queries(size: str, data_dir: Path) -> list[dict[str, Any]]:
+    """Time apply_filter and in-process search_conferences calls for each filter mix."""
+    import server_demo1
+    from fastmcp import Client
+    from markdown_parser import MarkdownParserService
+    from startup import AgendaLoader
+    from utils import apply_filter
+
+    iterations = QUERY_ITERATIONS[size]
+    service = MarkdownParserService(data_dir, snapshot_dir=None)
+    conferences = service.get_conferences()
+    results = []
+
+    for mix, filters in FILTER_MIXES.items():
+        arguments = (
+            filters.get("cfp_open"),
+            filters.get("country"),
+            filters.get("max_date"),
+            filters.get("min_date"),
+            filters.get("tags"),
+        )
+        matches = len(await apply_filter(conferences, *arguments))
+        durations, peak = await measure_async(
+            lambda: apply_filter(conferences, *arguments), iterations
+        )
+        result = summarize(f"apply_filter[{mix}]", size, durations, peak, matches)
+        result["matches"] = matches
+        results.append(result)
+
+    server_demo1.agenda = AgendaLoader(lambda: service)
+    async with Client(server_demo1.mcp) as client:
+        for mix, filters in FILTER_MIXES.items():
+            tool_arguments = {
+                key: value.isoformat() if isinstance(value, date) else value
+                for key, value in filters.items()
+            }
+
+            # Cold calls compute the matching rows, warm calls find them in the query cache
+            async def cold_call() -> None:
+                server_demo1.search_cache.clear()
+                await client.call_tool("search_conferences", tool_arguments)
+
+            durations, peak = await measure_async(cold_call, iterations)
+            results.append(summarize(f"search_conferences[{mix}]", size, durations, peak))
+
+            durations, peak = await measure_async(
+                lambda: client.call_tool("search_conferences", tool_arguments), iterations
+            )
+            results.append(
+                summarize(f"search_conferences[{mix},cached]", size, durations, peak)
+            )
+    return results
+#endregion
+
+
+#region Report
+def print_results(results: list[dict[str, Any]]) -> None:
+    print(f"{'benchmark':<40} {'size':>5} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10} "
+          f"{'peak MiB':>9} {'items/s':>12}")
+    for result in results:
+        items = result.get("items_per_second")
+        print(
+            f"{result['name']:<40} {result['size']:>5} {result['ops_per_second']:>10.1f} "
+            f"{result['p50_ms']:>10.3f} {result['p99_ms']:>10.3f} "
+            f"{result['peak_memory_bytes'] / 2**20:>9.1f} "
+            f"{'' if items is None else f'{items:.0f}':>12}"
+        )
+
+
+def compare(results: list[dict[str, Any]], baseline: dict[str, Any],
+            tolerance: float) -> list[str]:
+    """Return the benchmarks whose p50 latency grew by more than tolerance over the baseline."""
+    previous = {(result["name"], result["size"]): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["name"], result["size"]))
+        if before is None or not before["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{result['name']} ({result['size']}): p50 {before['p50_ms']:.3f} ms -> "
+                f"{result['p50_ms']:.3f} ms (x{ratio:.2f})"
+            )
+    return regressions
+#endregion
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the conference parser and search.")
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"Comma-separated agenda sizes among {', '.join(SIZES)}")
+    parser.add_argument("--output", type=Path,
+                        help="JSON results file, defaults to benchmarks/results/<timestamp>.json")
+    parser.add_argument("--baseline", type=Path, help="Previous JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed p50 slowdown over the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"Unknown sizes {unknown}, available sizes: {', '.join(SIZES)}")
+
+    started = datetime.now(timezone.utc)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="prez-mcp-bench-") as work_dir:
+        work_dir = Path(work_dir)
+        data_dirs = {size: work_dir / size for size in sizes}
+        for size, data_dir in data_dirs.items():
+            write_agenda(SIZES[size], data_dir)
+
+        # The servers read their configuration when imported
+        os.environ["CFP_CACHE_DIR"] = str(work_dir / "cache")
+        os.environ["CFP_DATA_DIR"] = str(data_dirs[sizes[0]])
+        os.environ["CFP_WATCH_INTERVAL"] = "0"
+
+        for size, data_dir in data_dirs.items():
+            print(f"Benchmarking {SIZES[size]} conferences...", file=sys.stderr)
+            results += bench_parser(size, data_dir, work_dir / "snapshots" / size)
+            results += asyncio.run(bench_queries(size, data_dir))
+
+    report = {
+        "started_at": started.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        # ru_maxrss is in kilobytes on Linux
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "results": results,
+    }
+    print_results(results)
+
+    output = args.output or RESULTS_DIR / f"{started:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,13 @@
 """MCP Client package."""
 
-from .client import run_client
+__all__ = ["main"]
 
-__all__ = ["run_client"]
+
+def __getattr__(name: str):
+    # The client is imported on first access, so that importing a module of the package
+    # (e.g. python -m mcp_client.fake_llm) does not need the whole client
+    if name == "main":
+        from .client import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
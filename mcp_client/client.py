@@ -1,61 +1,92 @@
 #region Imports
 import asyncio
 import json
+import os
+import time
 
-import httpx
 from fastmcp.client import Client
 from fastmcp.client.elicitation import ElicitResult
 from fastmcp.client.sampling import RequestContext, SamplingMessage, SamplingParams
+
+try:
+    from .llm_client import LLMClient
+except ImportError:
+    from llm_client import LLMClient
 #endregion
 
+# Connection pool shared by the sampling requests and the tool-calling requests
+llm = LLMClient()
+
+# Budget of the agent loop: LLM turns and wall-clock seconds
+AGENT_MAX_TURNS = int(os.environ.get("AGENT_MAX_TURNS", "8"))
+AGENT_TIME_BUDGET = float(os.environ.get("AGENT_TIME_BUDGET", "600"))
+
+# Stream the sampling completions, showing the text as it arrives
+LLM_STREAM = os.environ.get("LLM_STREAM", "1") == "1"
+
+# Requests handled concurrently ask the user one at a time
+prompt_lock = asyncio.Lock()
+
+
+async def ask(question: str) -> str:
+    """Read the user answer in a thread, so that the other requests keep running."""
+    return (await asyncio.to_thread(input, question)).strip().lower()
+
 #region Sampling Handler
 async def sampling_handler(
     messages: list[SamplingMessage],
     params: SamplingParams,
     context: RequestContext,
 ):
-    #region Affichage du prompt envoyé par le serveur
-    content_text = messages[0].content.text
-
-    print()
-    print()
-    print("📢 New sampling request from server")
-    print("🤖 Server requests an LLM call:")
-    print("-" * 80)
-    if len(content_text) > 400:
-        print(content_text[:400] + "...")
-    else:
-        print(content_text)
-    print("-" * 80)
-    #endregion
+    async with prompt_lock:
+        #region Affichage du prompt envoyé par le serveur
+        content_text = messages[0].content.text
 
-    #region Demande de confirmation à l'utilisateur
-    response = input("Allow? (y/n): ").strip().lower()
+        print()
+        print()
+        print("📢 New sampling request from server")
+        print("🤖 Server requests an LLM call:")
+        print("-" * 80)
+        if len(content_text) > 400:
+            print(content_text[:400] + "...")
+        else:
+            print(content_text)
+        print("-" * 80)
+        #endregion
 
-    if response in ["n", "no", "non"]:
-        return '{"error": "Sampling denied by user"}'
+        #region Demande de confirmation à l'utilisateur
+        response = await ask("Allow? (y/n): ")
 
-    if response not in ["y", "yes", "o", "oui"]:
-        print("⚠️  Invalid response. Use 'y' or 'n'.")
-        return '{"error": "Invalid user response"}'
-    #endregion
+        if response in ["n", "no", "non"]:
+            return '{"error": "Sampling denied by user"}'
+
+        if response not in ["y", "yes", "o", "oui"]:
+            print("⚠️  Invalid response. Use 'y' or 'n'.")
+            return '{"error": "Invalid user response"}'
+        #endregion
 
     #region Appel au LLM
+    payload = {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": message.role, "content": message.content.text} for message in messages
+        ],
+        "temperature": params.temperature,
+        "max_tokens": params.maxTokens,
+    }
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "http://localhost:4141/v1/chat/completions",
-                json={
-                    "model": "gpt-4o",
-                    "messages": [{"role": message.role, "content": message.content.text} for message in messages],
-                    "temperature": params.temperature,
-                    "max_tokens": params.maxTokens,
-                },
-            )
-
-            result = response.json()
+        if not LLM_STREAM:
+            result = await llm.chat(payload)
             return result["choices"][0]["message"]["content"]
 
+        print("📝 LLM: ", end="", flush=True)
+        completion = await llm.stream_chat(
+            payload, on_delta=lambda delta: print(delta, end="", flush=True)
+        )
+        print()
+        print(f"⏱️  {json.dumps(completion.stats())}")
+        return completion.content
+
     except Exception as e:
         return f'{{"error": "{str(e)}"}}'
     #endregion
@@ -63,25 +94,118 @@ async def sampling_handler(
 
 #region Elicitation Handler
 async def elicitation_handler(prompt: str, response_type: type | None, params, context):
-    print()
-    print()
-    print("📢 New elicitation request from server")
-    print(prompt)
-    answer = input("Answer (y/n or 'cancel' to abort): ").strip().lower()
+    async with prompt_lock:
+        print()
+        print()
+        print("📢 New elicitation request from server")
+        print(prompt)
+
+        #region Sélection multiple
+        value_schema = params.requestedSchema.get("properties", {}).get("value", {})
+        if value_schema.get("type") == "array":
+            options = value_schema["items"]["anyOf"]
+            for number, option in enumerate(options, start=1):
+                print(f"  {number}. {option.get('title', option['const'])}")
+            answer = await ask("Numbers to select (e.g. 1,3), 'all', 'none' or 'cancel' to abort: ")
+
+            if answer == "cancel":
+                print("⚠️  Operation cancelled\n")
+                return ElicitResult(action="cancel")
+            if answer == "all":
+                selected = options
+            else:
+                numbers = {int(n) for n in answer.replace(" ", "").split(",") if n.isdigit()}
+                selected = [
+                    option for number, option in enumerate(options, start=1) if number in numbers
+                ]
+
+            print(f"✅ {len(selected)} selected\n")
+            return ElicitResult(
+                action="accept", content={"value": [option["const"] for option in selected]}
+            )
+        #endregion
+        answer = await ask("Answer (y/n or 'cancel' to abort): ")
+
+        if answer == "cancel":
+            print("⚠️  Operation cancelled\n")
+            return ElicitResult(action="cancel")
+
+        if answer in ["y", "yes", "o", "oui"]:
+                print("✅ Answer: Yes\n")
+                return ElicitResult(action="accept")
 
-    if answer == "cancel":
-        print("⚠️  Operation cancelled\n")
-        return ElicitResult(action="cancel")
+        if answer in ["n", "no", "non"]:
+                print("❌ Answer: No\n")
+                return ElicitResult(action="decline")
 
-    if answer in ["y", "yes", "o", "oui"]:
-            print("✅ Answer: Yes\n")
-            return ElicitResult(action="accept")
+        print("⚠️  Invalid response. Use 'y' for yes, 'n' for no.")
+#endregion
+
+#region Boucle agent
+async def execute_tool_call(mcp_client: Client, tool_call: dict) -> dict:
+    """Run one tool call requested by the LLM and return the tool message answering it."""
+    function_name = tool_call["function"]["name"]
+    try:
+        function_args = json.loads(tool_call["function"]["arguments"] or "{}")
+        print(f"\n🔧 Tool call: {function_name}")
+        print(f"📋 Arguments: {json.dumps(function_args, indent=2)}")
+
+        result = await mcp_client.call_tool(function_name, function_args, raise_on_error=False)
+        content = "\n".join(item.text for item in result.content if hasattr(item, "text"))
+    except Exception as e:
+        # The model gets the error back and may fix its call on the next turn
+        content = json.dumps({"error": str(e)})
+    return {"role": "tool", "tool_call_id": tool_call["id"], "content": content}
+
+
+async def run_agent(
+    mcp_client: Client,
+    messages: list[dict],
+    tools: list[dict],
+    max_turns: int = AGENT_MAX_TURNS,
+    time_budget: float = AGENT_TIME_BUDGET,
+) -> str | None:
+    """
+    Let the LLM call MCP tools until it answers without a tool call.
+
+    All the tool calls of a turn run concurrently over the MCP session, so independent
+    calls (several countries or months) take the time of the slowest one. Their results
+    are appended to messages for the next turn.
+
+    Returns:
+        The final answer of the LLM, or None when the turn or time budget ran out
+    """
+    deadline = time.monotonic() + time_budget
+
+    for turn in range(1, max_turns + 1):
+        try:
+            result = await asyncio.wait_for(llm.chat({
+                "model": "gpt-4o",
+                "messages": messages,
+                "tools": tools,
+                "tool_choice": "auto",
+            }), deadline - time.monotonic())
+            message = result["choices"][0]["message"]
+            messages.append(message)
 
-    if answer in ["n", "no", "non"]:
-            print("❌ Answer: No\n")
-            return ElicitResult(action="decline")
+            tool_calls = message.get("tool_calls") or []
+            if not tool_calls:
+                return message.get("content")
+            if message.get("content"):
+                print(f"🤖 LLM: {message['content']}")
 
-    print("⚠️  Invalid response. Use 'y' for yes, 'n' for no.")
+            started = time.perf_counter()
+            messages.extend(await asyncio.wait_for(asyncio.gather(
+                *(execute_tool_call(mcp_client, tool_call) for tool_call in tool_calls)
+            ), deadline - time.monotonic()))
+            print(f"\n⏱️  Turn {turn}: {len(tool_calls)} tool call(s) "
+                  f"in {time.perf_counter() - started:.1f} s")
+        except asyncio.TimeoutError:
+            print(f"\n⚠️  Time budget of {time_budget:g} s exhausted at turn {turn}")
+            return None
+
+    print(f"\n⚠️  Turn budget of {max_turns} exhausted")
+    return None
 #endregion
 
 async def main():
@@ -91,7 +215,7 @@ async def main():
         elicitation_handler=elicitation_handler,
     )
 
-    async with mcp_client:
+    async with llm, mcp_client:
         #region Récupération des outils MCP disponibles
         tools_list = await mcp_client.list_tools()
 
@@ -105,46 +229,32 @@ async def main():
         } for tool in tools_list]
         #endregion
 
-        #region Appel au LLM avec tool calling
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "http://localhost:4141/v1/chat/completions",
-                json={
-                    "model": "gpt-4o",
-                    "messages": [{"role": "user",
-                                  "content": "Je voudrais candidater aux conférences en France en octobre 2026 pour parler de MCP"}],
-                    "tools": openai_tools,
-                    "tool_choice": "auto",
-                },
-            )
-
-            result = response.json()
-            message = result["choices"][0]["message"]
-
-            print(f"🤖 LLM: {message.get('content', '(calling tool)')}")
-        #endregion
-
-        #region Exécution de l'appel d'outil si demandé
-        result = None
-        if message.get("tool_calls"):
-            tool_call = message["tool_calls"][0]
-            function_name = tool_call["function"]["name"]
-            function_args = json.loads(tool_call["function"]["arguments"])
-
-            print(f"\n🔧 Tool call: {function_name}")
-            print(f"📋 Arguments: {json.dumps(function_args, indent=2)}")
-
-            result = await mcp_client.call_tool(function_name, function_args)
+        #region Boucle agent avec tool calling
+        messages = [{
+            "role": "user",
+            "content": "Je voudrais candidater aux conférences en France en octobre 2026 "
+                       "pour parler de MCP",
+        }]
+        answer = await run_agent(mcp_client, messages, openai_tools)
         #endregion
 
         #region Affichage des résultats
+        applied_confs = []
+        for message in messages:
+            if message["role"] == "tool":
+                try:
+                    applied_confs += json.loads(message["content"]).get("applied_confs", [])
+                except (ValueError, AttributeError):
+                    continue
+
         print("\n✅ Result:")
-        for content in result.content:
-            if hasattr(content, "text"):
-                data = json.loads(content.text)
-                print("You applied to:")
-                for conf in data['applied_confs']:
-                    print(f"  - {conf}")
+        print("You applied to:")
+        for conf in applied_confs:
+            print(f"  - {conf}")
+        if answer:
+            print(f"\n🤖 LLM: {answer}")
+
+        print(f"\n📊 LLM HTTP pool: {json.dumps(llm.stats())}")
         #endregion
 
 
@@ -152,4 +262,4 @@ if __name__ == "__main__":
     try:
         asyncio.run(main())
     except Exception as e:
-        print(f"Error: {e}")
\ No newline at end of file
+        print(f"Error: {e}")
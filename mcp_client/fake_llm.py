@@ -0,0 +1,124 @@
+"""
+Fake OpenAI-compatible LLM server, to try the client without a real LLM proxy.
+
+It answers /v1/chat/completions with a fixed reply, in one piece or streamed as
+server-sent events, after a configurable time to first token and at a configurable
+token rate.
+
+    python mcp_client/fake_llm.py --port 4141 --ttft 0.5 --tokens-per-second 30
+"""
+
+#region Imports
+import argparse
+import asyncio
+import json
+import re
+import time
+import uuid
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+#endregion
+
+DEFAULT_REPLY = (
+    "This is a fake LLM answer, streamed word by word so that the client can show "
+    "the text as it arrives and measure the time to first token and the token rate."
+)
+
+# One fake token per word, with its trailing spaces
+_TOKEN = re.compile(r"\s*\S+\s*")
+
+
+def create_app(reply: str = DEFAULT_REPLY, ttft: float = 0.2,
+               tokens_per_second: float = 50.0) -> Starlette:
+    """
+    Build the fake LLM application.
+
+    Args:
+        reply: Text of every completion
+        ttft: Seconds before the first token
+        tokens_per_second: Streaming rate of the following tokens (0 sends them at once)
+    """
+    tokens = _TOKEN.findall(reply) or [reply]
+
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = payload.get("model", "fake")
+        usage = {
+            "prompt_tokens": sum(
+                len(_TOKEN.findall(str(message.get("content") or "")))
+                for message in payload.get("messages", [])
+            ),
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        def chunk(delta: dict, finish_reason: str | None = None) -> str:
+            event = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(event)}\n\n"
+
+        async def events():
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": tokens[0]})
+            for token in tokens[1:]:
+                if tokens_per_second > 0:
+                    await asyncio.sleep(1 / tokens_per_second)
+                yield chunk({"content": token})
+            yield chunk({}, finish_reason="stop")
+            if (payload.get("stream_options") or {}).get("include_usage"):
+                event = {"id": completion_id, "object": "chat.completion.chunk",
+                         "model": model, "choices": [], "usage": usage}
+                yield f"data: {json.dumps(event)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        if payload.get("stream"):
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(ttft + (len(tokens) - 1) / tokens_per_second
+                            if tokens_per_second > 0 else ttft)
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4141)
+    parser.add_argument("--reply", default=DEFAULT_REPLY, help="Text of every completion")
+    parser.add_argument("--ttft", type=float, default=0.2,
+                        help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0,
+                        help="Streaming rate of the following tokens (0 = no delay)")
+    args = parser.parse_args()
+
+    app = create_app(args.reply, args.ttft, args.tokens_per_second)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
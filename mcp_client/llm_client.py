@@ -0,0 +1,274 @@
+"""Shared, pooled HTTP client for the OpenAI-compatible LLM proxy."""
+
+#region Imports
+import asyncio
+import inspect
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+#endregion
+
+logger = logging.getLogger(__name__)
+
+LLM_BASE_URL = os.environ.get("LLM_BASE_URL", "http://localhost:4141")
+
+# Pool limits, timeouts (s) and HTTP/2 (needs the h2 package: pip install httpx[http2])
+LLM_HTTP2 = os.environ.get("LLM_HTTP2", "0") == "1"
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "10"))
+LLM_MAX_KEEPALIVE = int(os.environ.get("LLM_MAX_KEEPALIVE", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.environ.get("LLM_KEEPALIVE_EXPIRY", "30"))
+LLM_CONNECT_TIMEOUT = float(os.environ.get("LLM_CONNECT_TIMEOUT", "5"))
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "60"))
+
+# Retries of transient failures, with exponential backoff from LLM_RETRY_BACKOFF seconds
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BACKOFF = float(os.environ.get("LLM_RETRY_BACKOFF", "0.5"))
+
+# Statuses of an overloaded or restarting proxy
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Called with each piece of text of a streamed completion, as it arrives
+DeltaHook = Callable[[str], Awaitable[None] | None]
+
+
+@dataclass
+class StreamedCompletion:
+    """Text of a streamed chat completion and its timings."""
+
+    content: str
+    finish_reason: str | None
+    # Seconds from sending the request to the first piece of text
+    time_to_first_token: float | None
+    # Seconds from sending the request to the end of the stream
+    duration: float
+    # Completion tokens, from the usage chunk when the proxy sends one, else content deltas
+    tokens: int
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        """Generation speed after the first token."""
+        if self.time_to_first_token is None or self.tokens < 2:
+            return None
+        generation = self.duration - self.time_to_first_token
+        return (self.tokens - 1) / generation if generation > 0 else None
+
+    def stats(self) -> dict[str, Any]:
+        tokens_per_second = self.tokens_per_second
+        return {
+            "ttft_s": None if self.time_to_first_token is None
+            else round(self.time_to_first_token, 3),
+            "duration_s": round(self.duration, 3),
+            "tokens": self.tokens,
+            "tokens_per_s": None if tokens_per_second is None else round(tokens_per_second, 1),
+        }
+
+
+class LLMClient:
+    """
+    One pooled HTTP client for all the calls to the LLM proxy.
+
+    Connections are kept alive between calls, so sampling requests after the first
+    one skip the TCP (and TLS) setup. Transport errors and transient statuses are
+    retried with exponential backoff and jitter, honoring Retry-After. Use it as an
+    async context manager: the pool is opened on enter and closed on exit.
+    """
+
+    def __init__(
+        self,
+        base_url: str = LLM_BASE_URL,
+        http2: bool = LLM_HTTP2,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        max_keepalive: int = LLM_MAX_KEEPALIVE,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        connect_timeout: float = LLM_CONNECT_TIMEOUT,
+        timeout: float = LLM_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_backoff: float = LLM_RETRY_BACKOFF,
+    ):
+        self.base_url = base_url
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.requests = 0
+        self.retries = 0
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "LLMClient":
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 needs the h2 package (httpx[http2]), using HTTP/1.1")
+                self.http2 = False
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=self.http2,
+            limits=self.limits,
+            timeout=self.timeout,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def chat(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send a chat completion request and return the decoded response.
+
+        Raises:
+            httpx.HTTPError: When the request still fails after the retries
+        """
+        response = await self.post("/v1/chat/completions", payload)
+        return response.json()
+
+    async def stream_chat(self, payload: dict[str, Any],
+                          on_delta: DeltaHook | None = None) -> StreamedCompletion:
+        """
+        Send a chat completion request in streaming mode and assemble the answer.
+
+        The proxy answers with server-sent events, one per content delta. on_delta is
+        called (and awaited when it returns an awaitable) with each delta as soon as it
+        arrives, so the text can be shown or processed before the generation ends.
+        Only the request is retried: a stream cut in the middle raises.
+
+        Raises:
+            httpx.HTTPError: When the request still fails after the retries
+        """
+        payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        started = time.perf_counter()
+        time_to_first_token = None
+        parts: list[str] = []
+        usage_tokens = None
+        finish_reason = None
+
+        response = await self._send("/v1/chat/completions", payload, stream=True)
+        try:
+            async for data in _sse_data(response):
+                if data == "[DONE]":
+                    # Read on to the end of the body so the connection goes back to the pool
+                    continue
+                event = json.loads(data)
+                if event.get("usage"):
+                    usage_tokens = event["usage"].get("completion_tokens")
+                for choice in event.get("choices") or ():
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                    delta = (choice.get("delta") or {}).get("content")
+                    if not delta:
+                        continue
+                    if time_to_first_token is None:
+                        time_to_first_token = time.perf_counter() - started
+                    parts.append(delta)
+                    if on_delta is not None:
+                        result = on_delta(delta)
+                        if inspect.isawaitable(result):
+                            await result
+        finally:
+            await response.aclose()
+
+        return StreamedCompletion(
+            content="".join(parts),
+            finish_reason=finish_reason,
+            time_to_first_token=time_to_first_token,
+            duration=time.perf_counter() - started,
+            tokens=usage_tokens or len(parts),
+        )
+
+    async def post(self, path: str, payload: dict[str, Any]) -> httpx.Response:
+        """POST a JSON payload, retrying transient failures."""
+        return await self._send(path, payload)
+
+    async def _send(self, path: str, payload: dict[str, Any],
+                    stream: bool = False) -> httpx.Response:
+        # With stream=True the body is left unread: the caller must close the response
+        if self._client is None:
+            raise RuntimeError("LLMClient must be used as an async context manager")
+
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            request = self._client.build_request(
+                "POST", path, json=payload, extensions={"trace": self._trace}
+            )
+            try:
+                response = await self._client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.info("LLM request failed (%s), retrying in %.1f s", e, delay)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    return response
+                await response.aclose()
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.info("LLM proxy answered %d, retrying in %.1f s",
+                            response.status_code, delay)
+            self.retries += 1
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Request, retry and connection counters.
+
+        requests counts every attempt, requests_sent those that reached a connection;
+        connections_reused is the number of requests sent on an already open connection.
+        """
+        return {
+            "http_version": "HTTP/2" if self.http2 else "HTTP/1.1",
+            "requests": self.requests,
+            "retries": self.retries,
+            "requests_sent": self.requests_sent,
+            "connections_opened": self.connections_opened,
+            "connections_reused": max(0, self.requests_sent - self.connections_opened),
+        }
+
+    async def _trace(self, event: str, info: dict[str, Any]) -> None:
+        # httpcore reports a TCP connection only when the pool has none to reuse
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event.endswith(".send_request_headers.started"):
+            self.requests_sent += 1
+
+    def _backoff(self, attempt: int) -> float:
+        return self.retry_backoff * 2**attempt * random.uniform(0.5, 1.5)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float | None:
+        try:
+            return min(float(response.headers["retry-after"]), 60.0)
+        except (KeyError, ValueError):
+            return None
+
+
+async def _sse_data(response: httpx.Response):
+    """Data of the server-sent events of a response, multi-line data joined."""
+    data: list[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
+    if data:
+        yield "\n".join(data)
@@ -1,5 +1,13 @@
 """MCP Server package."""
 
-from .server import mcp
-
 __all__ = ["mcp"]
+
+
+def __getattr__(name: str):
+    # The server is imported on first access, so that importing a module of the package
+    # (e.g. python -m mcp_server.snapshot) does not start loading the agenda
+    if name == "mcp":
+        from .server_demo1 import mcp
+
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
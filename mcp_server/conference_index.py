@@ -0,0 +1,781 @@
+"""Secondary indexes over a ConferenceStore, built once at parse time."""
+
+import heapq
+import operator
+import os
+import re
+import string
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from itertools import accumulate, compress, groupby
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
+
+try:
+    from .gazetteer import chord_length, unit_vector
+except ImportError:
+    from gazetteer import chord_length, unit_vector
+
+if TYPE_CHECKING:
+    from .conference_store import ConferenceStore
+
+# Trigram similarity from which a word of the agenda matches a word of a text query
+TEXT_MIN_SIMILARITY = float(os.environ.get("CFP_TEXT_MIN_SIMILARITY", "0.3"))
+
+# ASCII punctuation separates words and digits are folded to "0", so that names differing
+# by a year or an edition number only share their folded form
+_ASCII_FOLD = str.maketrans(
+    {**dict.fromkeys(string.punctuation, " "), **dict.fromkeys(string.digits, "0")}
+)
+_WORD = re.compile(r"[^\W_]+")
+
+# Words found in at least 1/_DENSE_RATIO of the rows are intersected as bitmaps, which
+# then take less memory than their posting lists
+_DENSE_RATIO = 32
+_NONZERO = re.compile(rb"[^\x00]")
+_BIT_POSITIONS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+class PostingLists:
+    """
+    Inverted index mapping dense integer keys to sorted row ids.
+
+    Stored in CSR layout: the ids of key ``k`` are ``ids[offsets[k]:offsets[k + 1]]``.
+    """
+
+    __slots__ = ("offsets", "ids")
+
+    def __init__(self, offsets: Sequence[int], ids: Sequence[int]):
+        self.offsets = offsets
+        self.ids = ids
+
+    @classmethod
+    def group(cls, keys: Sequence[int], key_count: int) -> "PostingLists":
+        """
+        Build posting lists from a column holding one key per row.
+
+        Args:
+            keys: Key of each row, in row order
+            key_count: Number of distinct keys
+
+        Returns:
+            Posting lists where every list is sorted by row id
+        """
+        # A stable sort by key keeps the row ids of each key in ascending order
+        ids = array("I", sorted(range(len(keys)), key=keys.__getitem__))
+        counts = Counter(keys)
+        offsets = array("I", [0])
+        offsets.extend(accumulate(counts[key] for key in range(key_count)))
+        return cls(offsets, ids)
+
+    @classmethod
+    def invert(cls, keys: Sequence[int], ids: Sequence[int], key_count: int) -> "PostingLists":
+        """
+        Build posting lists from (key, id) pairs given as two parallel columns.
+
+        Pairs must come in ascending id order: ids are placed with a counting sort,
+        which keeps that order within every list.
+        """
+        counts = Counter(keys)
+        offsets = array("I", [0])
+        offsets.extend(accumulate(counts[key] for key in range(key_count)))
+        free = array("I", offsets[:-1])
+        out = array("I", [0]) * len(keys)
+        for key, id_ in zip(keys, ids):
+            out[free[key]] = id_
+            free[key] += 1
+        return cls(offsets, out)
+
+    def get(self, key: int) -> Sequence[int]:
+        """Return the sorted row ids of a key (empty for unknown keys)."""
+        if key + 1 >= len(self.offsets):
+            return ()
+        return memoryview(self.ids)[self.offsets[key] : self.offsets[key + 1]]
+
+    def size(self, key: int) -> int:
+        if key + 1 >= len(self.offsets):
+            return 0
+        return self.offsets[key + 1] - self.offsets[key]
+
+
+class TextIndex:
+    """
+    Fuzzy full-text index over the words of conference names, cities and countries.
+
+    Words are split into trigrams of their padded form ("devoxx" gives "  d", " de",
+    "dev", ..., "xx "), as PostgreSQL's pg_trgm does. A query word matches the agenda
+    words sharing enough trigrams with it (Jaccard similarity of at least
+    min_similarity), so "devox" finds "devoxx" and "brussel" finds "brussels". A row
+    matches when each query word matches one of its words, and rows are ranked by the
+    similarity of their best matches. Words made only of digits (years, edition
+    numbers) are not indexed: dates have their own filters.
+
+    Trigrams index the vocabulary of the agenda, not its rows, so matching query words
+    costs about the same at any agenda size; only the rows of the matched words are
+    then read, lazily for one-word queries.
+    """
+
+    __slots__ = ("grams", "gram_words", "word_grams", "word_rows", "row_count", "_bitmaps")
+
+    def __init__(
+        self,
+        grams: Sequence[int],
+        gram_words: PostingLists,
+        word_grams: Sequence[int],
+        word_rows: PostingLists,
+        row_count: int,
+    ):
+        # Sorted trigram keys, the words having each trigram, the trigram count of each
+        # word and the rows having each word
+        self.grams = grams
+        self.gram_words = gram_words
+        self.word_grams = word_grams
+        self.word_rows = word_rows
+        self.row_count = row_count
+        self._bitmaps: dict[int, bytes] = {}
+
+    @classmethod
+    def build(cls, store: "ConferenceStore") -> "TextIndex":
+        """Index the words of the names, cities and countries of a store."""
+        vocabulary: dict[str, int] = {}
+        word_sets: dict[str, frozenset[int]] = {}
+
+        def codes(folded: str) -> frozenset[int]:
+            found = word_sets.get(folded)
+            if found is None:
+                found = word_sets[folded] = frozenset(
+                    vocabulary.setdefault(word, len(vocabulary)) for word in _folded_words(folded)
+                )
+            return found
+
+        # Cities and countries are pooled; names are folded all at once, which leaves
+        # few distinct names
+        city_words = [codes(_fold(city)) for city in store.cities.values]
+        country_words = [codes(_fold(country)) for country in store.countries.values]
+        names = _fold("\n".join(store.name)).split("\n")
+
+        keys = array("I")
+        ids = array("I")
+        for row, (name, city, country) in enumerate(zip(names, store.city, store.country)):
+            words = codes(name) | city_words[city] | country_words[country]
+            keys.extend(words)
+            ids.extend([row] * len(words))
+        word_rows = PostingLists.invert(keys, ids, len(vocabulary))
+
+        word_grams = array("H")
+        gram_keys = array("Q")
+        gram_ids = array("I")
+        for word, code in vocabulary.items():
+            grams = _trigrams(word)
+            word_grams.append(len(grams))
+            gram_keys.extend(grams)
+            gram_ids.extend([code] * len(grams))
+        grams = array("Q", sorted(set(gram_keys)))
+        gram_codes = {key: code for code, key in enumerate(grams)}
+        gram_words = PostingLists.invert(
+            array("I", map(gram_codes.__getitem__, gram_keys)), gram_ids, len(grams)
+        )
+        return cls(grams, gram_words, word_grams, word_rows, len(store))
+
+    def similar_words(self, word: str,
+                      min_similarity: float = TEXT_MIN_SIMILARITY) -> list[tuple[float, int]]:
+        """Return the (similarity, word code) pairs of the words similar to word, best first."""
+        grams = _trigrams(word)
+        shared: Counter[int] = Counter()
+        for key in grams:
+            code = bisect_left(self.grams, key)
+            if code < len(self.grams) and self.grams[code] == key:
+                shared.update(self.gram_words.get(code))
+
+        matches = []
+        for code, count in shared.items():
+            similarity = count / (len(grams) + self.word_grams[code] - count)
+            if similarity >= min_similarity:
+                matches.append((round(similarity, 6), code))
+        matches.sort(key=lambda match: -match[0])
+        return matches
+
+    def rank(self, text: str, min_similarity: float = TEXT_MIN_SIMILARITY) -> Iterator[int]:
+        """Lazily yield the rows matching a text query, best first, ties in date order."""
+        matches = [self.similar_words(word, min_similarity)
+                   for word in dict.fromkeys(text_words(text))]
+        if not matches or not all(matches):
+            return iter(())
+        if len(matches) == 1:
+            return self._rank_one(matches[0])
+
+        if all(len(similar) == 1 for similar in matches):
+            # One agenda word per query word: the rows having all of them are equally good
+            return self._intersect([similar[0][1] for similar in matches])
+
+        # Every query word must match: start from the one with the fewest rows, and only
+        # keep the rows of the next words that matched all the previous ones
+        matches.sort(key=lambda similar: sum(self.word_rows.size(code) for _, code in similar))
+        candidates: set[int] | None = None
+        levels: list[tuple[float, set[int]]] = []
+        for similar in matches:
+            found: set[int] = set()
+            for similarity, group in groupby(similar, key=operator.itemgetter(0)):
+                rows: set[int] = set()
+                for _, code in group:
+                    postings = self.word_rows.get(code)
+                    rows.update(postings if candidates is None
+                                else candidates.intersection(postings))
+                # A row only counts for the most similar of the words it has
+                rows -= found
+                found |= rows
+                levels.append((similarity, rows))
+            candidates = found
+            if not candidates:
+                return iter(())
+
+        if len(levels) == len(matches):
+            # One similarity per query word: all the rows are equally good
+            return iter(sorted(candidates))
+        scores = dict.fromkeys(candidates, 0.0)
+        for similarity, rows in levels:
+            for row in candidates.intersection(rows):
+                scores[row] += similarity
+        return iter(sorted(candidates, key=lambda row: (-scores[row], row)))
+
+    def _intersect(self, codes: list[int]) -> Iterator[int]:
+        # Rows having all the words, lazily in row order
+        codes = sorted(codes, key=self.word_rows.size)
+        dense = [
+            code for code in codes if self.word_rows.size(code) * _DENSE_RATIO >= self.row_count
+        ]
+        sparse = codes[: len(codes) - len(dense)]
+        bitmaps = [self._bitmap(code) for code in dense]
+
+        if sparse:
+            # Walk the rows of the rarest word and look the others up
+            others = [set(self.word_rows.get(code)) for code in sparse[1:]]
+            for row in self.word_rows.get(sparse[0]):
+                if all(row in rows for rows in others) and all(
+                    bitmap[row >> 3] >> (row & 7) & 1 for bitmap in bitmaps
+                ):
+                    yield row
+            return
+
+        # Frequent words only: AND their bitmaps and read the set bits
+        bits = int.from_bytes(bitmaps[0], "little")
+        for bitmap in bitmaps[1:]:
+            bits &= int.from_bytes(bitmap, "little")
+        data = bits.to_bytes(len(bitmaps[0]), "little")
+        for match in _NONZERO.finditer(data):
+            first = match.start()
+            for bit in _BIT_POSITIONS[data[first]]:
+                yield first * 8 + bit
+
+    def _bitmap(self, code: int) -> bytes:
+        # Built on first use, only requested for frequent words
+        bitmap = self._bitmaps.get(code)
+        if bitmap is None:
+            bits = bytearray((self.row_count + 7) // 8)
+            for row in self.word_rows.get(code):
+                bits[row >> 3] |= 1 << (row & 7)
+            bitmap = self._bitmaps[code] = bytes(bits)
+        return bitmap
+
+    def _rank_one(self, similar: list[tuple[float, int]]) -> Iterator[int]:
+        # Rows of equally similar words are merged in row order, best similarity first;
+        # a row having several of the words is only yielded for the best one
+        seen: set[int] = set()
+        for _, group in groupby(similar, key=operator.itemgetter(0)):
+            for row in _merge(self.word_rows.get(code) for _, code in group):
+                if row not in seen:
+                    if len(similar) > 1:
+                        seen.add(row)
+                    yield row
+
+
+def text_words(text: str) -> list[str]:
+    """
+    Words of a text as TextIndex indexes them.
+
+    Words are lowercased, without accents and with their digits folded to "0"; words
+    made only of digits are dropped.
+    """
+    return _folded_words(_fold(text))
+
+
+def _fold(text: str) -> str:
+    return text.casefold().translate(_ASCII_FOLD)
+
+
+def _folded_words(folded: str) -> list[str]:
+    if not folded.isascii():
+        decomposed = unicodedata.normalize("NFKD", folded)
+        words = _WORD.findall(
+            "".join(char for char in decomposed if not unicodedata.combining(char))
+        )
+        folded = " ".join(words).translate(_ASCII_FOLD)
+    return [word for word in folded.split() if word.strip("0")]
+
+
+def _trigrams(word: str) -> set[int]:
+    # Trigrams of the padded word, each packed in an int (21 bits per code point)
+    padded = f"  {word} "
+    return {
+        ord(padded[i]) << 42 | ord(padded[i + 1]) << 21 | ord(padded[i + 2])
+        for i in range(len(padded) - 2)
+    }
+
+
+class GeoIndex:
+    """
+    KD-tree over the distinct locations of a store, answering radius queries.
+
+    Locations are stored as points of the unit sphere, so a great-circle radius maps to
+    a straight-line (chord) distance and the tree prunes on plain coordinates, without
+    computing the distance of every location. The tree is implicit: ``points`` holds
+    the x, y, z of each location in tree order, the node of a range ``[lo, hi)`` is its
+    middle location, split on ``axes[middle]``, and the two halves are its subtrees.
+    Rows without coordinates belong to no location.
+    """
+
+    __slots__ = ("points", "axes", "latitudes", "longitudes", "place_rows")
+
+    def __init__(
+        self,
+        points: Sequence[float],
+        axes: Sequence[int],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        place_rows: PostingLists,
+    ):
+        # Unit vectors (3 floats per location), split axis of each node, coordinates of
+        # each location as stored in the row columns and the rows at each location
+        self.points = points
+        self.axes = axes
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.place_rows = place_rows
+
+    @classmethod
+    def build(cls, store: "ConferenceStore") -> "GeoIndex":
+        """Index the locations of the rows of a store."""
+        coordinates = list(zip(store.latitude, store.longitude))
+        # NaN coordinates (unknown cities) compare unequal to themselves and are left out
+        places = [place for place in dict.fromkeys(coordinates) if place[0] == place[0]]
+        vectors = [unit_vector(*place) for place in places]
+
+        order = list(range(len(places)))
+        axes = array("B", bytes(len(places)))
+        ranges = [(0, len(places))]
+        while ranges:
+            lo, hi = ranges.pop()
+            if hi - lo < 2:
+                continue
+            # Split on the axis along which the locations of the range spread the most
+            axis = max(range(3), key=lambda a: _spread(vectors[i][a] for i in order[lo:hi]))
+            order[lo:hi] = sorted(order[lo:hi], key=lambda i: vectors[i][axis])
+            middle = (lo + hi) // 2
+            axes[middle] = axis
+            ranges += [(lo, middle), (middle + 1, hi)]
+
+        points = array("d", (value for i in order for value in vectors[i]))
+        position = {places[i]: code for code, i in enumerate(order)}
+        # Rows without a location are grouped under an extra, never queried key
+        keys = array("I", (position.get(place, len(places)) for place in coordinates))
+        return cls(
+            points,
+            axes,
+            array("f", (places[i][0] for i in order)),
+            array("f", (places[i][1] for i in order)),
+            PostingLists.group(keys, len(places) + 1),
+        )
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> list[int]:
+        """Return the codes of the locations at most radius_km away from a point."""
+        query = unit_vector(latitude, longitude)
+        # Squared chord, with some slack for the rounding of the float32 coordinates
+        limit = chord_length(radius_km) ** 2 + 1e-12
+        points, axes = self.points, self.axes
+        found = []
+        ranges = [(0, len(axes))]
+        while ranges:
+            lo, hi = ranges.pop()
+            if lo >= hi:
+                continue
+            middle = (lo + hi) // 2
+            x, y, z = points[3 * middle : 3 * middle + 3]
+            if (x - query[0]) ** 2 + (y - query[1]) ** 2 + (z - query[2]) ** 2 <= limit:
+                found.append(middle)
+            delta = query[axes[middle]] - points[3 * middle + axes[middle]]
+            # The other side of the split plane only matters if the ball crosses it
+            if delta <= 0 or delta * delta <= limit:
+                ranges.append((lo, middle))
+            if delta >= 0 or delta * delta <= limit:
+                ranges.append((middle + 1, hi))
+        return found
+
+    def coordinates(self, places: Iterable[int]) -> set[tuple[float, float]]:
+        """Return the (latitude, longitude) of locations, as stored in the row columns."""
+        return {(self.latitudes[place], self.longitudes[place]) for place in places}
+
+
+def _spread(values: Iterable[float]) -> float:
+    values = list(values)
+    return max(values) - min(values)
+
+
+class ConferenceIndex:
+    """
+    Query engine over a date-ordered ConferenceStore.
+
+    Rows are stored sorted by beginning date, so the row order itself is the
+    interval index: a date range maps to a contiguous row range found by bisection.
+    Countries and distinct tag sets have inverted indexes (a tag filter unions the
+    lists of the tag sets it intersects) and open CFPs are found by bisecting
+    row ids sorted by deadline. A query starts from the most selective of these
+    candidate sets and checks the remaining predicates on the columns, so its cost
+    grows with the number of candidates rather than with the size of the agenda.
+    Radius queries read the rows of the locations a GeoIndex finds around a point.
+    Text queries go through a TextIndex and return rows by relevance instead.
+    """
+
+    __slots__ = (
+        "store",
+        "by_country",
+        "tag_sets",
+        "by_tag_set",
+        "cfp_rows",
+        "cfp_deadlines",
+        "max_duration",
+        "text",
+        "geo",
+        "_months",
+    )
+
+    def __init__(
+        self,
+        store: "ConferenceStore",
+        by_country: PostingLists,
+        tag_sets: Sequence[int],
+        by_tag_set: PostingLists,
+        cfp_rows: Sequence[int],
+        cfp_deadlines: Sequence[int],
+        max_duration: int,
+        text: TextIndex,
+        geo: GeoIndex,
+    ):
+        self.store = store
+        self.by_country = by_country
+        self.tag_sets = tag_sets
+        self.by_tag_set = by_tag_set
+        self.cfp_rows = cfp_rows
+        self.cfp_deadlines = cfp_deadlines
+        self.max_duration = max_duration
+        self.text = text
+        self.geo = geo
+        self._months: list[tuple[str, int]] | None = None
+
+    @classmethod
+    def build(cls, store: "ConferenceStore") -> "ConferenceIndex":
+        """Build all indexes from the columns of a date-ordered store."""
+        rows = range(len(store))
+        by_country = PostingLists.group(store.country, len(store.countries))
+
+        # Few distinct tag masks exist, so rows are grouped by mask rather than by tag
+        tag_sets = array("Q", sorted(set(store.tags)))
+        tag_set_codes = {mask: code for code, mask in enumerate(tag_sets)}
+        by_tag_set = PostingLists.group(
+            array("I", map(tag_set_codes.__getitem__, store.tags)), len(tag_sets)
+        )
+
+        # Rows with a known CFP deadline, sorted by deadline
+        with_deadline = compress(rows, map((0).__lt__, store.cfp_until))
+        cfp_rows = array("I", sorted(with_deadline, key=store.cfp_until.__getitem__))
+        cfp_deadlines = array("q", map(store.cfp_until.__getitem__, cfp_rows))
+
+        # Longest conference, to bound the rows that may still be running at a given date
+        max_duration = max(map(operator.sub, store.end, store.beginning), default=0)
+        return cls(
+            store,
+            by_country,
+            tag_sets,
+            by_tag_set,
+            cfp_rows,
+            cfp_deadlines,
+            max_duration,
+            TextIndex.build(store),
+            GeoIndex.build(store),
+        )
+
+    def scan(
+        self,
+        cfp_open_at: int | None = None,
+        country_codes: Iterable[int] | None = None,
+        tag_mask: int | None = None,
+        min_ts: int | None = None,
+        max_ts: int | None = None,
+        near: tuple[float, float, float] | None = None,
+        after: int = -1,
+    ) -> Iterator[int]:
+        """
+        Lazily yield the ids of the rows matching all filters, in date order.
+
+        Rows are checked as the iterator is consumed, so reading a page costs about one
+        page of work (plus sorting the candidate ids when open CFPs drive the query).
+
+        Args:
+            cfp_open_at: Only keep rows whose CFP deadline is at or after this timestamp
+            country_codes: Only keep rows whose country code is in this set
+            tag_mask: Only keep rows having at least one of these tag bits
+            min_ts: Only keep rows ending at or after this timestamp
+            max_ts: Only keep rows beginning at or before this timestamp
+            near: Only keep rows located within radius_km of a point, given as
+                (latitude, longitude, radius_km)
+            after: Only keep rows with a greater id, so that a scan can resume where a
+                previous one stopped
+        """
+        store = self.store
+        candidates: list[tuple[int, str]] = []
+
+        # Date range: contiguous rows in the date-ordered store
+        lo, hi = after + 1, len(store)
+        if min_ts is not None:
+            lo = max(lo, bisect_left(store.beginning, min_ts - self.max_duration))
+        if max_ts is not None:
+            hi = bisect_right(store.beginning, max_ts)
+        if hi <= lo:
+            return iter(())
+        candidates.append((hi - lo, "date"))
+
+        if country_codes is not None:
+            country_codes = set(country_codes)
+            candidates.append((sum(self.by_country.size(c) for c in country_codes), "country"))
+
+        tag_set_codes = None
+        if tag_mask is not None:
+            tag_set_codes = [code for code, mask in enumerate(self.tag_sets) if mask & tag_mask]
+            candidates.append((sum(self.by_tag_set.size(c) for c in tag_set_codes), "tags"))
+
+        cfp_start = 0
+        if cfp_open_at is not None:
+            cfp_start = bisect_left(self.cfp_deadlines, cfp_open_at)
+            candidates.append((len(self.cfp_rows) - cfp_start, "cfp"))
+
+        places = None
+        if near is not None:
+            places = self.geo.within(*near)
+            candidates.append((sum(self.geo.place_rows.size(p) for p in places), "near"))
+
+        size, driver = min(candidates)
+        if size == 0:
+            return iter(())
+
+        if driver == "date":
+            rows: Iterable[int] = range(lo, hi)
+        elif driver == "country":
+            rows = _merge(_tail(self.by_country.get(c), after) for c in country_codes)
+        elif driver == "tags":
+            rows = _merge(_tail(self.by_tag_set.get(c), after) for c in tag_set_codes)
+        elif driver == "near":
+            rows = _merge(_tail(self.geo.place_rows.get(p), after) for p in places)
+        else:
+            rows = sorted(row for row in self.cfp_rows[cfp_start:] if row > after)
+
+        return _residual(
+            rows,
+            store,
+            cfp_open_at if driver != "cfp" else None,
+            country_codes if driver != "country" else None,
+            tag_mask if driver != "tags" else None,
+            min_ts,
+            max_ts if driver != "date" else None,
+            self.geo.coordinates(places) if places is not None and driver != "near" else None,
+        )
+
+    def facets(
+        self, rows: Sequence[int] | None = None, cfp_open_at: int | None = None
+    ) -> dict[str, Any]:
+        """
+        Count rows per country, tag and beginning month, without materializing them.
+
+        Counts over the whole store come from the sizes of the posting lists and from
+        the first row of every month, so they cost one operation per distinct value.
+        Counts over matching rows read the code columns of their ids only, and bisect
+        their months in the id list.
+
+        Args:
+            rows: Sorted ids of the rows to count, None for all rows
+            cfp_open_at: Also count the rows whose CFP is still open at this timestamp
+
+        Returns:
+            ``{"total": int, "cfp_open": int | None, "country": Counter[country code],
+            "tag": Counter[tag code], "month": Counter["YYYY-MM"]}``
+        """
+        store = self.store
+        if rows is None:
+            total = len(store)
+            countries = Counter(
+                {code: self.by_country.size(code) for code in range(len(store.countries))}
+            )
+            tag_sets = Counter(
+                {mask: self.by_tag_set.size(code) for code, mask in enumerate(self.tag_sets)}
+            )
+            position = int.__index__
+            cfp_open = None
+            if cfp_open_at is not None:
+                cfp_open = len(self.cfp_rows) - bisect_left(self.cfp_deadlines, cfp_open_at)
+        else:
+            total = len(rows)
+            countries = Counter(_gather(store.country, rows))
+            tag_sets = Counter(_gather(store.tags, rows))
+
+            def position(row: int) -> int:
+                return bisect_left(rows, row)
+
+            cfp_open = None
+            if cfp_open_at is not None:
+                # Unknown deadlines are negative, below any reference time
+                cfp_open = sum(map(cfp_open_at.__le__, _gather(store.cfp_until, rows)))
+
+        tags: Counter[int] = Counter()
+        for mask, count in tag_sets.items():
+            while mask and count:
+                bit = mask & -mask
+                tags[bit.bit_length() - 1] += count
+                mask ^= bit
+        # Rows are sorted by date, so the rows of a month lie between two month starts
+        months: Counter[str] = Counter()
+        starts = self._month_starts()
+        if rows is not None and total:
+            # Only the months between the first and the last row
+            first_rows = [start for _, start in starts]
+            starts = starts[
+                max(bisect_right(first_rows, rows[0]) - 1, 0) : bisect_right(first_rows, rows[-1])
+            ]
+        bounds = [position(start) for _, start in starts] + [total]
+        for (month, _), first, stop in zip(starts, bounds, bounds[1:]):
+            if stop > first:
+                months[month] = stop - first
+        return {
+            "total": total,
+            "cfp_open": cfp_open,
+            "country": +countries,
+            "tag": tags,
+            "month": months,
+        }
+
+    def _month_starts(self) -> list[tuple[str, int]]:
+        # ("YYYY-MM", first row) of every month from the first to the last beginning date,
+        # computed once per store; rows without a date come first as "unknown"
+        if self._months is None:
+            store = self.store
+            beginning, iso_dates = store.beginning, store.iso_dates
+            first = 0
+            while first < len(store) and beginning[first] not in iso_dates:
+                first += 1
+            months = [("unknown", 0)] if first else []
+            if first < len(store):
+                day = datetime.fromtimestamp(beginning[first])
+                year, month = day.year, day.month
+                while True:
+                    start = bisect_left(
+                        beginning, int(datetime(year, month, 1).timestamp()), first
+                    )
+                    if start >= len(store):
+                        break
+                    months.append((f"{year:04d}-{month:02d}", start))
+                    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            self._months = months
+        return self._months
+
+    def search(
+        self,
+        text: str,
+        cfp_open_at: int | None = None,
+        country_codes: Iterable[int] | None = None,
+        tag_mask: int | None = None,
+        min_ts: int | None = None,
+        max_ts: int | None = None,
+        near: tuple[float, float, float] | None = None,
+    ) -> Iterator[int]:
+        """
+        Lazily yield the ids of the rows matching a text query and all filters.
+
+        Takes the filters of ``scan``. Rows come best match first (see TextIndex),
+        the filters are checked on each of them as the iterator is consumed.
+        """
+        if country_codes is not None:
+            country_codes = set(country_codes)
+        located = None
+        if near is not None:
+            located = self.geo.coordinates(self.geo.within(*near))
+        return _residual(
+            self.text.rank(text),
+            self.store,
+            cfp_open_at,
+            country_codes,
+            tag_mask,
+            min_ts,
+            max_ts,
+            located,
+        )
+
+
+def _residual(
+    rows: Iterable[int],
+    store: "ConferenceStore",
+    cfp_open_at: int | None,
+    country_codes: set[int] | None,
+    tag_mask: int | None,
+    min_ts: int | None,
+    max_ts: int | None,
+    located: set[tuple[float, float]] | None = None,
+) -> Iterator[int]:
+    """
+    Check the filters not covered by the driving index on each candidate row.
+
+    ``located`` holds the coordinates of the locations within the radius of a near
+    filter, so rows are checked by a lookup rather than a distance computation.
+    """
+    for row in rows:
+        if cfp_open_at is not None:
+            cfp_deadline = store.cfp_until[row]
+            if cfp_deadline <= 0 or cfp_deadline < cfp_open_at:
+                continue
+        if country_codes is not None and store.country[row] not in country_codes:
+            continue
+        if tag_mask is not None and not store.tags[row] & tag_mask:
+            continue
+        if min_ts is not None and store.end[row] < min_ts:
+            continue
+        if max_ts is not None and store.beginning[row] > max_ts:
+            continue
+        if located is not None and (store.latitude[row], store.longitude[row]) not in located:
+            continue
+        yield row
+
+
+def _gather(column: Sequence[int], rows: Sequence[int]) -> Sequence[int]:
+    """Return the values of a column at some rows, read in C by itemgetter."""
+    if len(rows) < 2:
+        return [column[row] for row in rows]
+    return operator.itemgetter(*rows)(column)
+
+
+def _tail(ids: Sequence[int], after: int) -> Sequence[int]:
+    """Return the ids of a sorted id list that are greater than ``after``."""
+    if after < 0:
+        return ids
+    return ids[bisect_right(ids, after) :]
+
+
+def _merge(lists: Iterable[Sequence[int]]) -> Iterator[int]:
+    """Merge sorted row id lists into one sorted stream without duplicates."""
+    lists = [ids for ids in lists if len(ids)]
+    if len(lists) == 1:
+        yield from lists[0]
+        return
+    previous = -1
+    for row in heapq.merge(*lists):
+        if row != previous:
+            yield row
+            previous = row
+
@@ -0,0 +1,544 @@
+"""Compact column-oriented storage for parsed conference data."""
+
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import chain, compress
+from typing import Any, Iterable, Iterator, NamedTuple, Sequence
+
+try:
+    from .conference_index import ConferenceIndex
+    from .gazetteer import locate
+    from .utils import Conference, ConferenceCfp, ConferenceDates
+except ImportError:
+    from conference_index import ConferenceIndex
+    from gazetteer import locate
+    from utils import Conference, ConferenceCfp, ConferenceDates
+
+# Sentinel stored in timestamp columns when the value is unknown
+NO_DATE = -(2**63)
+
+# Tag sets are stored as bitmasks in an unsigned 64-bit column
+MAX_TAGS = 64
+
+# Coordinates stored for the rows whose city is not in the gazetteer
+NO_COORDINATE = math.nan
+
+# Per-row columns and their array typecodes, as saved in snapshots
+ARRAY_COLUMNS = {
+    "city": "I",
+    "country": "I",
+    "latitude": "f",
+    "longitude": "f",
+    "beginning": "q",
+    "end": "q",
+    "tags": "Q",
+    "cfp_until": "q",
+    "section": "I",
+}
+STRING_COLUMNS = ("name", "hyperlink", "location", "cfp_link")
+
+
+class StringPool:
+    """Interned vocabulary mapping repeated strings (countries, cities, tags) to dense codes."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        """Return the code of a value, adding it to the pool if needed."""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int | None:
+        """Return the code of a value, or None if it is not in the pool."""
+        return self._codes.get(value)
+
+    def search(self, needle: str) -> set[int]:
+        """Return the codes of all values containing needle (case-insensitive)."""
+        needle = needle.lower()
+        return {code for code, value in enumerate(self.values) if needle in value.lower()}
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class PackedStrings:
+    """
+    Read-only string column stored as one UTF-8 blob plus end offsets.
+
+    Used for stores loaded from a snapshot: values are decoded on access instead of
+    being materialized as one Python string per row.
+    """
+
+    __slots__ = ("blob", "offsets", "nullable")
+
+    def __init__(self, blob: bytes | memoryview, offsets: Sequence[int], nullable: bool = False):
+        self.blob = blob
+        self.offsets = offsets
+        self.nullable = nullable
+
+    @classmethod
+    def pack(cls, values: Iterable[str | None]) -> "PackedStrings":
+        """Pack a sequence of strings; ``None`` values are stored as empty strings."""
+        blob = bytearray()
+        offsets = array("Q", [0])
+        nullable = False
+        for value in values:
+            if value is None:
+                nullable = True
+            else:
+                blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        return cls(bytes(blob), offsets, nullable)
+
+    def __getitem__(self, i: int) -> str | None:
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        start, end = self.offsets[i], self.offsets[i + 1]
+        if start == end and self.nullable:
+            return None
+        return str(self.blob[start:end], "utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[str | None]:
+        return (self[i] for i in range(len(self)))
+
+
+class ConferenceEntry(NamedTuple):
+    """One parsed agenda line, with its fields in column form."""
+
+    beginning: int
+    end: int
+    name: str
+    hyperlink: str
+    location: str
+    city: str
+    country: str
+    tags: tuple[str, ...]
+    cfp_link: str | None
+    cfp_until: int
+    # Resolved from the city and country with the gazetteer, NO_COORDINATE if unknown
+    latitude: float = NO_COORDINATE
+    longitude: float = NO_COORDINATE
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "ConferenceEntry":
+        """Convert a conference dictionary (as returned by the parser) to an entry."""
+        dates = record.get("date") or {}
+        cfp = record.get("cfp")
+        city, country = record.get("city", ""), record.get("country", "")
+        latitude, longitude = locate(city, country) or (NO_COORDINATE, NO_COORDINATE)
+        return cls(
+            beginning=_ts(dates.get("beginning")),
+            end=_ts(dates.get("end")),
+            name=record["name"],
+            hyperlink=record["hyperlink"],
+            location=record["location"],
+            city=city,
+            country=country,
+            tags=tuple(record.get("tags", ())),
+            cfp_link=cfp["link"] if cfp else None,
+            cfp_until=_ts(cfp.get("untilDate")) if cfp else NO_DATE,
+            latitude=latitude,
+            longitude=longitude,
+        )
+
+    def record(self) -> dict[str, Any]:
+        """Return the entry as a conference dictionary."""
+        (
+            beginning, end, name, hyperlink, location, city, country, tags, cfp_link, cfp_until,
+            _, _,
+        ) = self
+        record = {
+            "name": name,
+            "date": {"beginning": beginning, "end": end},
+            "city": city,
+            "country": country,
+            "location": location,
+            "hyperlink": hyperlink,
+            "tags": list(tags),
+        }
+        if cfp_link is not None:
+            record["cfp"] = {
+                "link": cfp_link,
+                "untilDate": None if cfp_until == NO_DATE else cfp_until,
+            }
+        return record
+
+
+class ConferenceStore:
+    """
+    Read-only conference collection stored as parallel columns.
+
+    Row ``i`` is spread across the columns: timestamps live in ``array`` columns,
+    countries and cities are codes into interned string pools, tags are bitmasks
+    over ``tag_names`` and the coordinates of the city are float32 columns (NaN when
+    the city is not in the gazetteer). ``row(i)`` materializes a typed ``Conference``
+    view on demand.
+
+    Stores built with ``from_sections`` keep their rows sorted by beginning date,
+    carry a ``ConferenceIndex`` used to answer filter queries and hold the ISO
+    strings of every timestamp they contain, so building rows does no date work.
+    Each row also remembers the README section it was parsed from, so a reload can
+    reuse the rows of unchanged sections.
+    """
+
+    __slots__ = (
+        "name",
+        "hyperlink",
+        "location",
+        "city",
+        "country",
+        "latitude",
+        "longitude",
+        "beginning",
+        "end",
+        "tags",
+        "cfp_link",
+        "cfp_until",
+        "cities",
+        "countries",
+        "tag_names",
+        "section",
+        "sections",
+        "source_hash",
+        "index",
+        "iso_dates",
+        "_tag_tuples",
+    )
+
+    def __init__(self, tag_names: Iterable[str] = ()):
+        self.name: list[str] = []
+        self.hyperlink: list[str] = []
+        self.location: list[str] = []
+        self.city = array(ARRAY_COLUMNS["city"])
+        self.country = array(ARRAY_COLUMNS["country"])
+        self.latitude = array(ARRAY_COLUMNS["latitude"])
+        self.longitude = array(ARRAY_COLUMNS["longitude"])
+        self.beginning = array(ARRAY_COLUMNS["beginning"])
+        self.end = array(ARRAY_COLUMNS["end"])
+        self.tags = array(ARRAY_COLUMNS["tags"])
+        self.cfp_link: list[str | None] = []
+        self.cfp_until = array(ARRAY_COLUMNS["cfp_until"])
+        self.cities = StringPool()
+        self.countries = StringPool()
+        self.tag_names = StringPool(tag_names)
+        self.section = array(ARRAY_COLUMNS["section"])
+        self.sections = StringPool()
+        self.source_hash = ""
+        self.index: ConferenceIndex | None = None
+        self.iso_dates: dict[int, str] = {}
+        self._tag_tuples: dict[int, tuple[str, ...]] = {}
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[dict[str, Any]],
+        tag_names: Iterable[str] = (),
+        source_hash: str = "",
+    ) -> "ConferenceStore":
+        """Build an indexed, date-ordered store from conference dictionaries."""
+        return cls.from_sections(
+            [("", map(ConferenceEntry.from_record, records))], tag_names, source_hash
+        )
+
+    @classmethod
+    def from_sections(
+        cls,
+        sections: Iterable[tuple[str, Iterable[ConferenceEntry]]],
+        tag_names: Iterable[str] = (),
+        source_hash: str = "",
+    ) -> "ConferenceStore":
+        """
+        Build an indexed, date-ordered store from parsed entries.
+
+        Args:
+            sections: (section key, entries) pairs in document order
+            tag_names: Tag vocabulary, in the order tags are reported
+            source_hash: Content hash of the parsed document
+
+        Returns:
+            Store whose rows are sorted by beginning date, ties keeping document order
+        """
+        store = cls(tag_names)
+        store.source_hash = source_hash
+        store.extend(store._sectioned(sections))
+        store._finish()
+        return store
+
+    def rebuild(
+        self,
+        sections: Iterable[tuple[str, Iterable[ConferenceEntry] | None]],
+        source_hash: str,
+    ) -> "ConferenceStore":
+        """
+        Build the store of an edited document, reusing the rows of unchanged sections.
+
+        Reused rows are copied column by column instead of being converted back to
+        entries; only the rows of new sections go through ``extend``.
+
+        Args:
+            sections: (section key, entries) pairs in document order,
+                where None stands for the rows this store already holds for the key
+            source_hash: Content hash of the edited document
+
+        Returns:
+            A new store, equal to ``from_sections`` over the whole edited document
+        """
+        sections = list(sections)
+        kept = [key for key, entries in sections if entries is None]
+        previous_position = {key: position for position, key in enumerate(self.sections.values)}
+        if any(previous_position[a] > previous_position[b] for a, b in zip(kept, kept[1:])):
+            # Unchanged sections moved around: row order cannot be reused
+            previous_rows = self.rows_by_section()
+            return ConferenceStore.from_sections(
+                (
+                    (key, entries if entries is not None else map(self.entry, previous_rows[key]))
+                    for key, entries in sections
+                ),
+                self.tag_names.values,
+                source_hash,
+            )
+
+        store = ConferenceStore(self.tag_names.values)
+        store.source_hash = source_hash
+        store.cities = StringPool(self.cities.values)
+        store.countries = StringPool(self.countries.values)
+
+        # Rows of new sections, appended to a staging store sharing the new pools
+        staging = ConferenceStore()
+        staging.cities, staging.countries = store.cities, store.countries
+        staging.tag_names, staging.sections = store.tag_names, store.sections
+        staging.extend(
+            store._sectioned(
+                (key, entries if entries is not None else ()) for key, entries in sections
+            )
+        )
+
+        # Rows of sections that changed or disappeared are dropped
+        keep_codes = {self.sections.lookup(key) for key in kept}
+        drop_codes = set(range(len(self.sections))) - keep_codes
+        dropped = list(compress(range(len(self)), map(drop_codes.__contains__, self.section)))
+        remap = array("I", (store.sections.lookup(key) or 0 for key in self.sections.values))
+        sections_column = array("I", map(remap.__getitem__, self.section))
+
+        # Merge the new rows into the kept rows as (source, start, stop) row ranges;
+        # ties on the beginning date are ordered by section position
+        plan: list[tuple[ConferenceStore, int, int]] = []
+        start = 0
+        for j in range(len(staging)):
+            beginning, section = staging.beginning[j], staging.section[j]
+            position = bisect_left(self.beginning, beginning, start)
+            while (
+                position < len(self)
+                and self.beginning[position] == beginning
+                and (self.section[position] in drop_codes or sections_column[position] < section)
+            ):
+                position += 1
+            _plan_kept(plan, self, start, position, dropped)
+            _plan_range(plan, staging, j, j + 1)
+            start = position
+        _plan_kept(plan, self, start, len(self), dropped)
+
+        for name, typecode in ARRAY_COLUMNS.items():
+            column = array(typecode)
+            for source, first, stop in plan:
+                values = getattr(source, name)
+                if source is self and name == "section":
+                    values = sections_column
+                column.frombytes(memoryview(values)[first:stop].cast("B"))
+            setattr(store, name, column)
+        for name in STRING_COLUMNS:
+            column = []
+            for source, first, stop in plan:
+                column.extend(getattr(source, name)[first:stop])
+            setattr(store, name, column)
+
+        store._finish(self.iso_dates)
+        return store
+
+    def _finish(self, iso_dates: dict[int, str] | None = None) -> None:
+        """Build the indexes and ISO date strings once all rows are appended."""
+        iso_dates = iso_dates or {}
+        self.index = ConferenceIndex.build(self)
+        self.iso_dates = {
+            ts: iso_dates.get(ts) or datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+            for ts in set(chain(self.beginning, self.end, self.cfp_until))
+            if ts != NO_DATE
+        }
+
+    def extend(self, rows: Iterable[tuple[ConferenceEntry, int]]) -> None:
+        """
+        Append entries as new rows, in beginning date order.
+
+        Args:
+            rows: (entry, section code) pairs; pairs with the same beginning date keep
+                their relative order
+        """
+        rows = sorted(rows, key=_beginning_of)
+        if not rows:
+            return
+        entries, sections = zip(*rows)
+        (
+            beginning, end, name, hyperlink, location, city, country, tags, cfp_link, cfp_until,
+            latitude, longitude,
+        ) = zip(*entries)
+        self.beginning.extend(beginning)
+        self.end.extend(end)
+        self.name.extend(name)
+        self.hyperlink.extend(hyperlink)
+        self.location.extend(location)
+        self.city.extend(map(self.cities.code, city))
+        self.country.extend(map(self.countries.code, country))
+        self.latitude.extend(latitude)
+        self.longitude.extend(longitude)
+        masks = {tag_set: self.tag_mask(tag_set, add=True) for tag_set in dict.fromkeys(tags)}
+        self.tags.extend(map(masks.__getitem__, tags))
+        self.cfp_link.extend(cfp_link)
+        self.cfp_until.extend(cfp_until)
+        self.section.extend(sections)
+
+    def entry(self, i: int) -> ConferenceEntry:
+        """Return row ``i`` as the entry it was built from."""
+        return ConferenceEntry(
+            beginning=self.beginning[i],
+            end=self.end[i],
+            name=self.name[i],
+            hyperlink=self.hyperlink[i],
+            location=self.location[i],
+            city=self.cities[self.city[i]],
+            country=self.countries[self.country[i]],
+            tags=tuple(self.tag_list(self.tags[i])),
+            cfp_link=self.cfp_link[i],
+            cfp_until=self.cfp_until[i],
+            latitude=self.latitude[i],
+            longitude=self.longitude[i],
+        )
+
+    def _sectioned(
+        self, sections: Iterable[tuple[str, Iterable[ConferenceEntry]]]
+    ) -> Iterator[tuple[ConferenceEntry, int]]:
+        """Register section keys in document order and pair entries with their code."""
+        for key, entries in sections:
+            section = self.sections.code(key)
+            for entry in entries:
+                yield entry, section
+
+    def rows_by_section(self) -> dict[str, list[int]]:
+        """Group row ids by the key of the section they were parsed from."""
+        rows: dict[str, list[int]] = {key: [] for key in self.sections.values}
+        keys = self.sections.values
+        for i, section in enumerate(self.section):
+            rows[keys[section]].append(i)
+        return rows
+
+    def tag_mask(self, tags: Iterable[str], add: bool = False) -> int:
+        """
+        Convert tag names to a bitmask over ``tag_names``.
+
+        Args:
+            tags: Tag names (case-insensitive)
+            add: Register unknown tags instead of ignoring them
+
+        Returns:
+            Bitmask with one bit per known tag
+        """
+        mask = 0
+        for tag in tags:
+            code = self.tag_names.code(tag) if add else self.tag_names.lookup(tag.lower())
+            if code is None:
+                continue
+            if code >= MAX_TAGS:
+                raise ValueError(f"Too many distinct tags (maximum is {MAX_TAGS})")
+            mask |= 1 << code
+        return mask
+
+    def tag_list(self, mask: int) -> list[str]:
+        """Convert a tag bitmask back to tag names."""
+        return [tag for code, tag in enumerate(self.tag_names.values) if mask >> code & 1]
+
+    def row(self, i: int) -> Conference:
+        """Materialize row ``i`` as an immutable ``Conference`` with ISO-formatted dates."""
+        iso_dates = self.iso_dates
+        cfp = None
+        cfp_link = self.cfp_link[i]
+        if cfp_link is not None:
+            cfp = ConferenceCfp(link=cfp_link, untilDate=iso_dates.get(self.cfp_until[i]))
+
+        mask = self.tags[i]
+        tags = self._tag_tuples.get(mask)
+        if tags is None:
+            tags = self._tag_tuples[mask] = tuple(self.tag_list(mask))
+
+        return Conference(
+            name=self.name[i],
+            date=ConferenceDates(
+                beginning=iso_dates.get(self.beginning[i]), end=iso_dates.get(self.end[i])
+            ),
+            location=self.location[i],
+            country=self.countries[self.country[i]],
+            city=self.cities[self.city[i]],
+            tags=tags,
+            cfp=cfp,
+            hyperlink=self.hyperlink[i],
+        )
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def __iter__(self) -> Iterator[Conference]:
+        return (self.row(i) for i in range(len(self)))
+
+
+def _plan_range(
+    plan: list[tuple[ConferenceStore, int, int]], source: ConferenceStore, start: int, stop: int
+) -> None:
+    """Add a row range to a copy plan, extending the previous range when contiguous."""
+    if start >= stop:
+        return
+    if plan and plan[-1][0] is source and plan[-1][2] == start:
+        plan[-1] = (source, plan[-1][1], stop)
+    else:
+        plan.append((source, start, stop))
+
+
+def _plan_kept(
+    plan: list[tuple[ConferenceStore, int, int]],
+    source: ConferenceStore,
+    start: int,
+    stop: int,
+    dropped: list[int],
+) -> None:
+    """Add the rows of [start, stop) that are not dropped to a copy plan."""
+    i = bisect_left(dropped, start)
+    while i < len(dropped) and dropped[i] < stop:
+        _plan_range(plan, source, start, dropped[i])
+        start = dropped[i] + 1
+        i += 1
+    _plan_range(plan, source, start, stop)
+
+
+def _beginning_of(row: tuple[ConferenceEntry, int]) -> int:
+    return row[0].beginning
+
+
+def _ts(value: int | None) -> int:
+    return NO_DATE if value is None else value
@@ -0,0 +1,159 @@
+"""Offline gazetteer resolving the cities of the agenda to coordinates."""
+
+import hashlib
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+GAZETTEER_PATH = Path(__file__).parent / "gazetteer.tsv"
+
+# Mean Earth radius, for great-circle distances
+EARTH_RADIUS_KM = 6371.0088
+
+# Other spellings of the countries of the gazetteer, by folded name
+COUNTRY_ALIASES = {
+    "us": "usa",
+    "unitedstates": "usa",
+    "unitedstatesofamerica": "usa",
+    "unitedkingdom": "uk",
+    "greatbritain": "uk",
+    "england": "uk",
+    "scotland": "uk",
+    "wales": "uk",
+    "northernireland": "uk",
+    "netherlands": "thenetherlands",
+    "holland": "thenetherlands",
+    "czechia": "czechrepublic",
+    "korea": "southkorea",
+    "republicofkorea": "southkorea",
+    "unitedarabemirates": "uae",
+    "turkiye": "turkey",
+    "ivorycoast": "cotedivoire",
+    "drc": "drcongo",
+    "democraticrepublicofthecongo": "drcongo",
+    "macedonia": "northmacedonia",
+    "bosnia": "bosniaandherzegovina",
+    "russianfederation": "russia",
+}
+
+# "lat, lon" in decimal degrees
+_COORDINATES = re.compile(r"\s*([-+]?\d+(?:\.\d*)?)\s*[,;\s]\s*([-+]?\d+(?:\.\d*)?)\s*")
+
+
+class Gazetteer:
+    """
+    Coordinates of cities, looked up by city and country name.
+
+    Names are compared folded (case, accents and punctuation ignored) and cities may
+    have aliases ("Bangalore" for "Bengaluru"). A city given with a country only
+    matches a row of that country; without a country, the first row of the city wins.
+    """
+
+    __slots__ = ("fingerprint", "_cities")
+
+    def __init__(self, rows: list[tuple[str, str, float, float, list[str]]], fingerprint: str = ""):
+        """
+        Args:
+            rows: (city, country, latitude, longitude, aliases) rows, by precedence
+            fingerprint: Digest of the rows, stored with the coordinates derived from them
+        """
+        self.fingerprint = fingerprint
+        self._cities: dict[str, list[tuple[str, tuple[float, float]]]] = {}
+        for city, country, latitude, longitude, aliases in rows:
+            place = (_country_key(country), (latitude, longitude))
+            for name in dict.fromkeys(map(_key, [city, *aliases])):
+                self._cities.setdefault(name, []).append(place)
+
+    @classmethod
+    def load(cls, path: Path = GAZETTEER_PATH) -> "Gazetteer":
+        """Read a tab-separated city, country, latitude, longitude, aliases file."""
+        content = path.read_bytes()
+        rows = []
+        for number, line in enumerate(content.decode("utf-8").splitlines(), start=1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            try:
+                city, country, latitude, longitude = fields[:4]
+                aliases = fields[4].split(",") if len(fields) > 4 and fields[4] else []
+                rows.append((city, country, float(latitude), float(longitude), aliases))
+            except ValueError:
+                raise ValueError(f"{path}:{number}: malformed gazetteer row") from None
+        return cls(rows, hashlib.sha256(content).hexdigest())
+
+    def locate(self, city: str, country: str = "") -> tuple[float, float] | None:
+        """Return the (latitude, longitude) of a city, None when it is not known."""
+        places = self._cities.get(_key(city))
+        if not places:
+            return None
+        if not country:
+            return places[0][1]
+        country = _country_key(country)
+        for place_country, coordinates in places:
+            if place_country == country:
+                return coordinates
+        return None
+
+    def resolve(self, place: str) -> tuple[float, float] | None:
+        """
+        Return the coordinates of a place written by a user.
+
+        Accepts "City", "City, Country", "City (Country)", "City, State" (the state is
+        ignored) and "latitude, longitude" in decimal degrees.
+        """
+        match = _COORDINATES.fullmatch(place)
+        if match:
+            latitude, longitude = float(match[1]), float(match[2])
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return latitude, longitude
+            return None
+
+        place = place.strip()
+        coordinates = self.locate(place)
+        if coordinates is not None:
+            return coordinates
+        if place.endswith(")") and "(" in place:
+            city, country = place[:-1].rsplit("(", 1)
+            return self.locate(city.strip().rstrip(","), country.strip())
+        if "," in place:
+            city, country = (part.strip() for part in place.rsplit(",", 1))
+            city = city.split(",")[0]
+            return self.locate(city, country) or self.locate(city)
+        return None
+
+
+@lru_cache(maxsize=None)
+def default_gazetteer() -> Gazetteer:
+    """The bundled gazetteer, read once per process."""
+    return Gazetteer.load()
+
+
+@lru_cache(maxsize=16384)
+def locate(city: str, country: str) -> tuple[float, float] | None:
+    """Coordinates of an agenda city in the bundled gazetteer (memoized)."""
+    if not city:
+        return None
+    return default_gazetteer().locate(city, country)
+
+
+def unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    """Point of the unit sphere at a latitude and longitude in degrees."""
+    phi, lam = math.radians(latitude), math.radians(longitude)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+
+def chord_length(radius_km: float) -> float:
+    """Straight-line distance on the unit sphere between points radius_km apart on Earth."""
+    return 2 * math.sin(min(max(radius_km, 0.0) / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def _key(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(char for char in decomposed if char.isalnum())
+
+
+def _country_key(country: str) -> str:
+    key = _key(country)
+    return COUNTRY_ALIASES.get(key, key)
@@ -0,0 +1,144 @@
+"""Middleware timing the MCP requests, and the endpoint serving the metrics."""
+
+import json
+import logging
+import os
+import time
+from typing import Any
+
+import pydantic_core
+from fastmcp import FastMCP
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+try:
+    from .metrics import (
+        REGISTRY,
+        REQUEST_DURATION,
+        REQUEST_ERRORS,
+        REQUEST_SIZE,
+        RESPONSE_SIZE,
+        request_spans,
+    )
+except ImportError:
+    from metrics import (
+        REGISTRY,
+        REQUEST_DURATION,
+        REQUEST_ERRORS,
+        REQUEST_SIZE,
+        RESPONSE_SIZE,
+        request_spans,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Calls slower than this are logged with the operations they spent their time in (0 disables)
+SLOW_CALL_MS = float(os.environ.get("CFP_SLOW_CALL_MS", "1000"))
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _json_size(value: Any) -> int:
+    try:
+        return len(pydantic_core.to_json(value, fallback=str))
+    except (TypeError, ValueError, pydantic_core.PydanticSerializationError):
+        return len(str(value).encode("utf-8"))
+
+
+class InstrumentationMiddleware(Middleware):
+    """
+    Time every tool call, resource read and prompt rendering.
+
+    Records their duration, the JSON size of their arguments and result and the errors
+    they raise, and logs the calls slower than slow_call_ms with the time spent in the
+    operations timed with OPERATION_DURATION during the call.
+    """
+
+    def __init__(self, slow_call_ms: float = SLOW_CALL_MS):
+        self.slow_call_ms = slow_call_ms
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        message = context.message
+        return await self._observe("tool", message.name, message.arguments, context, call_next)
+
+    async def on_read_resource(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        name = await self._resource_label(context)
+        return await self._observe("resource", name, None, context, call_next)
+
+    async def on_get_prompt(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        message = context.message
+        return await self._observe("prompt", message.name, message.arguments, context, call_next)
+
+    async def _observe(self, kind: str, name: str, arguments: dict[str, Any] | None,
+                       context: MiddlewareContext, call_next: CallNext) -> Any:
+        request_size = len(json.dumps(arguments, default=str)) if arguments else 0
+        REQUEST_SIZE.observe(request_size, kind=kind, name=name)
+
+        spans: list[tuple[str, float]] = []
+        token = request_spans.set(spans)
+        start = time.perf_counter()
+        response_size = None
+        try:
+            result = await call_next(context)
+            response_size = _json_size(result)
+            RESPONSE_SIZE.observe(response_size, kind=kind, name=name)
+            return result
+        except Exception as e:
+            REQUEST_ERRORS.inc(kind=kind, name=name, error=type(e).__name__)
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            request_spans.reset(token)
+            REQUEST_DURATION.observe(seconds, kind=kind, name=name)
+            if self.slow_call_ms and seconds * 1000 >= self.slow_call_ms:
+                self._log_slow_call(kind, name, seconds, request_size, response_size, spans)
+
+    @staticmethod
+    async def _resource_label(context: MiddlewareContext) -> str:
+        """
+        Template matching the URI read, else its scheme: labelling with the URI itself
+        would add time series for every talk or file ever read.
+        """
+        uri = str(context.message.uri)
+        server = context.fastmcp_context.fastmcp if context.fastmcp_context else None
+        if server is not None:
+            for template in await server.list_resource_templates(run_middleware=False):
+                if template.matches(uri) is not None:
+                    return template.uri_template
+        scheme, separator, _ = uri.partition("://")
+        return f"{scheme}://" if separator else "unknown"
+
+    @staticmethod
+    def _log_slow_call(kind: str, name: str, seconds: float, request_size: int,
+                       response_size: int | None, spans: list[tuple[str, float]]) -> None:
+        breakdown: dict[str, list[float]] = {}
+        for operation, duration in spans:
+            breakdown.setdefault(operation, []).append(duration)
+        logger.warning(
+            "Slow %s %s: %.1f ms, request %d B, response %s B%s",
+            kind,
+            name,
+            seconds * 1000,
+            request_size,
+            "-" if response_size is None else response_size,
+            "".join(
+                f", {operation} {len(durations)}x {sum(durations) * 1000:.1f} ms"
+                for operation, durations in breakdown.items()
+            ),
+        )
+
+
+def instrument(mcp: FastMCP, path: str = METRICS_PATH,
+               slow_call_ms: float = SLOW_CALL_MS) -> None:
+    """
+    Add the instrumentation middleware to a server and serve the metrics on path.
+
+    The metrics endpoint is served by the HTTP transports, next to the MCP endpoint.
+    """
+    mcp.add_middleware(InstrumentationMiddleware(slow_call_ms))
+
+    @mcp.custom_route(path, methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,139 @@
+"""Local BM25 ranking of conferences against a talk, ahead of LLM sampling."""
+
+import heapq
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Sequence
+
+# Conferences kept for sampling after the local ranking (0 keeps them all)
+PRERANK_TOP_K = int(os.environ.get("CFP_PRERANK_TOP_K", "100"))
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Words, keeping the "#", "+" and "." of names such as "c#", "c++" or ".net"
+_TOKEN = re.compile(r"\.?[^\W_][\w#+]*(?:\.[^\W_][\w#+]*)*")
+
+# Talks are written in English or French
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from has in is it its of on or that the this to was
+    will with you your we our how what when why
+    au aux avec ce ces cette dans de des du en est et il ils je la le les leur mais
+    ne nous on ou par pas plus pour qu que qui sa se ses son sur un une vous vos votre
+    """.split()
+)
+
+# French talks say "IA" where conference names and tags say "AI"
+ALIASES = {"ia": "ai", "llm": "ai", "llms": "ai"}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase terms of a text, without stop words, numbers and single characters."""
+    return [
+        ALIASES.get(token, token)
+        for token in _TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS and not token.isdigit()
+    ]
+
+
+@lru_cache(maxsize=1 << 17)
+def _name_terms(name: str) -> tuple[str, ...]:
+    # Names come back on every call for the same agenda
+    return tuple(tokenize(name))
+
+
+def conference_terms(conference: Mapping[str, Any],
+                     tag_keywords: Mapping[str, Iterable[str]] | None = None) -> tuple[str, ...]:
+    """
+    Terms describing a conference: its name and tags, and the keywords of its tags.
+
+    Tag keywords let a talk about "machine learning" reach conferences tagged "ai"
+    whose name only says "AI".
+    """
+    terms = _name_terms(conference["name"])
+    for tag in conference.get("tags", ()):
+        terms += _tag_terms(tag, tag_keywords)
+    return terms
+
+
+def _tag_terms(tag: str, tag_keywords: Mapping[str, Iterable[str]] | None) -> tuple[str, ...]:
+    keywords = tag_keywords.get(tag, ()) if tag_keywords else ()
+    return _name_terms(" ".join((tag, *keywords)))
+
+
+def bm25_scores(query: Sequence[str], documents: Sequence[Sequence[str]]) -> list[float]:
+    """
+    Score tokenized documents against a tokenized query with Okapi BM25.
+
+    Inverse document frequencies are computed over the given documents. Repeated query
+    terms weigh more, with a logarithmic damping so that a long talk repeating one
+    word does not drown the others.
+    """
+    if not documents:
+        return []
+    query_weights = {term: 1 + math.log(count) for term, count in Counter(query).items()}
+
+    # Only the query terms of each document matter, most documents have none
+    matches: list[tuple[int, list[str]]] = []
+    document_frequency: dict[str, int] = {}
+    total_length = 0
+    for i, terms in enumerate(documents):
+        total_length += len(terms)
+        matched = [term for term in terms if term in query_weights]
+        if matched:
+            matches.append((i, matched))
+            for term in set(matched):
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    count = len(documents)
+    idf = {
+        term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+        for term, frequency in document_frequency.items()
+    }
+    average_length = total_length / count or 1
+
+    scores = [0.0] * count
+    for i, matched in matches:
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(documents[i]) / average_length)
+        for term, frequency in Counter(matched).items():
+            scores[i] += (
+                query_weights[term] * idf[term] * frequency * (BM25_K1 + 1) / (frequency + norm)
+            )
+    return scores
+
+
+def prerank(talk_text: str, conferences: Sequence[dict[str, Any]], top_k: int = PRERANK_TOP_K,
+            tag_keywords: Mapping[str, Iterable[str]] | None = None
+            ) -> tuple[list[dict[str, Any]], dict[str, float]]:
+    """
+    Keep the conferences of a talk most worth sending to the LLM.
+
+    Args:
+        talk_text: Markdown of the talk
+        conferences: Conference summaries ({"name", "tags", ...}), in date order
+        top_k: Number of conferences kept, 0 keeps them all
+        tag_keywords: Keywords of each tag, see conference_terms
+
+    Returns:
+        The top_k conferences, best local score first (ties in date order), and the
+        local score of each of them by conference name
+    """
+    scores = bm25_scores(
+        tokenize(talk_text), [conference_terms(conf, tag_keywords) for conf in conferences]
+    )
+    ranked = range(len(conferences))
+    if 0 < top_k < len(conferences):
+        ranked = heapq.nsmallest(top_k, ranked, key=lambda i: (-scores[i], i))
+    else:
+        ranked = sorted(ranked, key=lambda i: (-scores[i], i))
+
+    kept = [conferences[i] for i in ranked]
+    local_scores = {}
+    for i in ranked:
+        local_scores.setdefault(conferences[i]["name"], round(scores[i], 3))
+    return kept, local_scores
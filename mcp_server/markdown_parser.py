@@ -1,38 +1,700 @@
 """Parser for extracting conference data from markdown README."""
 
+import gc
+import hashlib
+import json
+import logging
+import os
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, suppress
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+try:
+    from .conference_store import NO_COORDINATE, NO_DATE, ConferenceEntry, ConferenceStore
+    from .gazetteer import locate
+    from .metrics import CONFERENCES, OPERATION_DURATION, SNAPSHOT_GENERATION
+    from .snapshot import (
+        prune_snapshots,
+        publish_snapshot,
+        published_path,
+        published_snapshot,
+        read_snapshot,
+        snapshot_path,
+        source_hash,
+        write_snapshot,
+    )
+    from .tag_matcher import TagMatcher
+    from .utils import CACHE_DIR
+except ImportError:
+    from conference_store import NO_COORDINATE, NO_DATE, ConferenceEntry, ConferenceStore
+    from gazetteer import locate
+    from metrics import CONFERENCES, OPERATION_DURATION, SNAPSHOT_GENERATION
+    from snapshot import (
+        prune_snapshots,
+        publish_snapshot,
+        published_path,
+        published_snapshot,
+        read_snapshot,
+        snapshot_path,
+        source_hash,
+        write_snapshot,
+    )
+    from tag_matcher import TagMatcher
+    from utils import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = CACHE_DIR / "snapshots"
+
+# Directory of the agenda README, defaults to the data/developers-conferences-agenda submodule
+DATA_DIR = Path(
+    os.environ.get(
+        "CFP_DATA_DIR", Path(__file__).parent.parent / "data" / "developers-conferences-agenda"
+    )
+)
+
+# Seconds between two checks of the README for changes (0 disables hot reload)
+WATCH_INTERVAL = float(os.environ.get("CFP_WATCH_INTERVAL", "0"))
+
+# Serve the snapshots published in the snapshot directory by another process (the one
+# parsing the README) instead of parsing it, following their generations while watching
+SNAPSHOT_ATTACH = os.environ.get("CFP_SNAPSHOT_ATTACH", "0") == "1"
+
+# Seconds an attached process waits at startup for a snapshot to be published
+SNAPSHOT_WAIT = float(os.environ.get("CFP_SNAPSHOT_WAIT", "60"))
+
+# Optional JSON file of {tag: [keywords]} added to (or replacing tags of) TECH_KEYWORDS
+TAGS_FILE = os.environ.get("CFP_TAGS_FILE")
+
+# Where tag keywords may match in conference names, see tag_matcher.BOUNDARIES
+TAG_BOUNDARY = os.environ.get("CFP_TAG_BOUNDARY", "start")
+
+# Number of processes parsing large READMEs (0 for one per CPU, 1 always parses in-process)
+# and README size, in characters, from which the process pool is used
+PARSE_WORKERS = int(os.environ.get("CFP_PARSE_WORKERS", "0")) or os.cpu_count() or 1
+PARALLEL_THRESHOLD = int(os.environ.get("CFP_PARALLEL_THRESHOLD", str(4 * 1024 * 1024)))
+
+# Technology keywords, in the order tags are reported
+TECH_KEYWORDS = {
+    "ai": ["ai", "artificial intelligence", "machine learning", "ml"],
+    "cloud": ["cloud", "aws", "azure", "gcp"],
+    "devops": ["devops", "kubernetes", "docker"],
+    "security": ["security", "infosec", "cybersec"],
+    "web": ["web", "frontend", "backend", "fullstack"],
+    "data": ["data", "database", "analytics", "bigdata"],
+    "mobile": ["mobile", "ios", "android"],
+    "javascript": ["javascript", "js", "node", "react", "vue", "angular"],
+    "python": ["python", "django", "flask"],
+    "java": ["java", "spring"],
+    ".net": [".net", "dotnet", "csharp", "c#"],
+    "agile": ["agile", "scrum"],
+    "development": ["voxx", "craft", "gdg", "dev", "developers"],
+}
+
+# Year (## 2026) and month (### January) headers; leaving out the "^" anchor lets the
+# scan jump between "##" occurrences, matches not starting a line are skipped
+_HEADER = re.compile(r"##(?:[^\S\n]+(\d{4})|#[^\S\n]+(\w+))$", re.MULTILINE)
+
+# Fields of a conference entry line, after its "* ": "5-6: [Name](URL) - City (Country)
+# <a href="..."><img ... message=until%2015-May-2026...". The CFP badge is searched after
+# the location, and no field runs past the end of the line
+_ENTRY_FIELDS = (
+    r"([\d\-/]+):[^\S\n]+\[([^\]\n]+)\]\(([^)\n]+)\)[^\S\n]*(?:-[^\S\n]+([^<\n]+))?"
+    r'(?:.*?<a href="([^"\n]+)"><img[^>\n]*message=until%20([^"&\n]+))?'
+)
+_ENTRY = re.compile(_ENTRY_FIELDS)
+
+# Every conference entry line of a section, matched in one scan
+_ENTRY_LINES = re.compile(r"^\* [^\S\n]*" + _ENTRY_FIELDS, re.MULTILINE)
+
+# Location fields of the entries without a location
+_NOWHERE = ("Unknown", "", "", NO_COORDINATE, NO_COORDINATE)
+
+
+@lru_cache(maxsize=None)
+def _month_number(month: str) -> int:
+    return datetime.strptime(month, "%B").month
+
+
+@lru_cache(maxsize=4096)
+def _day_timestamp(year: int, month: int, day: int) -> int:
+    return int(datetime(year, month, day).timestamp())
+
+
+@lru_cache(maxsize=16384)
+def _cfp_deadline(encoded: str) -> int | None:
+    """Convert a CFP badge date (e.g., "15-November-2025") to a timestamp, None if invalid."""
+    try:
+        return int(datetime.strptime(encoded.replace("-", " "), "%d %B %Y").timestamp())
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=16384)
+def _date_range(date_str: str, year: int, month: str) -> tuple[int, int]:
+    month_num = _month_number(month)
+
+    # Handle cross-month ranges (e.g., "31-01/02")
+    if "-" in date_str and "/" in date_str:
+        parts = date_str.split("-")
+        start_day = int(parts[0])
+        end_part = parts[1]
+
+        # Start date
+        beginning = _day_timestamp(year, month_num, start_day)
+
+        # End date (next month)
+        next_month = month_num + 1 if month_num < 12 else 1
+        next_year = year if month_num < 12 else year + 1
+        end_days = end_part.split("/")
+        end_day = int(end_days[0])
+
+        end = _day_timestamp(next_year, next_month, end_day)
+
+    # Handle same-month ranges (e.g., "5-6")
+    elif "-" in date_str:
+        parts = date_str.split("-")
+        start_day = int(parts[0])
+        end_day = int(parts[1])
+
+        beginning = _day_timestamp(year, month_num, start_day)
+        end = _day_timestamp(year, month_num, end_day)
+
+    # Handle single day (e.g., "15")
+    else:
+        beginning = end = _day_timestamp(year, month_num, int(date_str))
+
+    return beginning, end
+
+
+@lru_cache(maxsize=16384)
+def _place(location: str) -> tuple[str, str, str, float, float]:
+    """
+    Split "City, State (Country)" or "City (Country)" into location, city, country and
+    the coordinates of the city.
+    """
+    if not location:
+        return _NOWHERE
+    location = location.strip()
+    city = country = ""
+    loc_parts = location.rsplit("(", 1)
+    if len(loc_parts) == 2:
+        city = loc_parts[0].strip().rstrip(",")
+        country = loc_parts[1].rstrip(")").strip()
+
+        # Handle "City, State" format
+        if "," in city:
+            city = city.split(",")[0].strip()
+
+    latitude, longitude = locate(city, country) or (NO_COORDINATE, NO_COORDINATE)
+    return location, city, country, latitude, longitude
+
+
+def tag_keywords(tags_file: str | Path | None = TAGS_FILE) -> dict[str, list[str]]:
+    """
+    Return the keyword-to-tag map used to tag conferences.
+
+    Args:
+        tags_file: Optional JSON file mapping tags to keyword lists. Its tags are added
+                   after the TECH_KEYWORDS ones, or replace them when they have the same name.
+
+    Returns:
+        Keywords of each tag, in the order tags are reported
+    """
+    keywords = dict(TECH_KEYWORDS)
+    if tags_file:
+        with open(tags_file, encoding="utf-8") as f:
+            custom = json.load(f)
+        if not isinstance(custom, dict) or not all(
+            isinstance(words, list) and all(isinstance(word, str) for word in words)
+            for words in custom.values()
+        ):
+            raise ValueError(f"{tags_file} must map tag names to lists of keywords")
+        keywords.update(custom)
+    return keywords
+
+
+def _entries(
+    lines: Iterable[Sequence[str]],
+    year: int,
+    month: str,
+    tags_of: Callable[[str], tuple[str, ...]],
+) -> list[ConferenceEntry]:
+    """Build entries from the fields of entry lines, "" standing for missing fields."""
+    entries = []
+    append = entries.append
+    # Builds the named tuple from a plain one, as ConferenceEntry._make does, without
+    # going through the generated constructor for each entry
+    new_entry = partial(tuple.__new__, ConferenceEntry)
+    for date_str, name, hyperlink, location, cfp_link, cfp_until in lines:
+        beginning, end = _date_range(date_str, year, month)
+        location, city, country, latitude, longitude = _place(location)
+
+        # Decode URL-encoded CFP date (e.g., "15-November-2025" or "15-October-2025")
+        if cfp_link:
+            deadline = _cfp_deadline(cfp_until)
+            cfp_until = NO_DATE if deadline is None else deadline
+        else:
+            cfp_link = None
+            cfp_until = NO_DATE
+
+        append(
+            new_entry(
+                (
+                    beginning,
+                    end,
+                    name,
+                    hyperlink,
+                    location,
+                    city,
+                    country,
+                    tags_of(name),
+                    cfp_link,
+                    cfp_until,
+                    latitude,
+                    longitude,
+                )
+            )
+        )
+    return entries
+
+
+def _parse_body(
+    body: str, year: int | None, month: str | None, tags_of: Callable[[str], tuple[str, ...]]
+) -> list[ConferenceEntry]:
+    if not (year and month):
+        return []
+
+    # Match in one scan every entry line (starting with "* ") with its date range
+    # (e.g., "5-6:", "15:", "31-01/02:"), [Name](URL) link, location (after " - ") and
+    # first CFP badge; lines starting with "* " but not shaped like an entry are skipped
+    return _entries(_ENTRY_LINES.findall(body), year, month, tags_of)
+
+
+def _year_chunks(
+    sections: Sequence[tuple[int | None, str | None, str]],
+) -> list[list[tuple[int | None, str | None, str]]]:
+    """Group consecutive sections of the same year, the unit of work of parallel parsing."""
+    chunks: list[list[tuple[int | None, str | None, str]]] = []
+    year: object = object()
+    for section in sections:
+        if section[0] != year or not chunks:
+            year = section[0]
+            chunks.append([])
+        chunks[-1].append(section)
+    return chunks
+
+
+# Tagger of a parsing worker process, set once when the worker starts
+_worker_tagger: TagMatcher | None = None
+
+
+def _init_worker(tagger: TagMatcher) -> None:
+    global _worker_tagger
+    _worker_tagger = tagger
+
+
+def _parse_chunk(
+    chunk: list[tuple[int | None, str | None, str]],
+) -> list[list[ConferenceEntry]]:
+    """Parse the sections of one year in a worker process."""
+    tags_of = _worker_tagger.tags
+    with _gc_paused():
+        return [_parse_body(body, year, month, tags_of) for year, month, body in chunk]
+
+
+def split_sections(content: str) -> list[tuple[str, int | None, str | None, str]]:
+    """
+    Split a README into the runs of lines between year and month headers.
+
+    Args:
+        content: README content
+
+    Returns:
+        (key, year, month, body) tuples in document order, where year and month are
+        the values in effect after the header, body holds the lines up to the next
+        header and key identifies the section content (identical sections get
+        distinct keys)
+    """
+    sections = []
+    seen: dict[str, int] = {}
+    year: int | None = None
+    month: str | None = None
+    start = 0
+
+    def close(end: int) -> None:
+        body = content[start : max(start, end)]
+        digest = hashlib.sha1(f"{year}\0{month}\0".encode())
+        digest.update(body.encode("utf-8"))
+        key = digest.hexdigest()
+        occurrence = seen[key] = seen.get(key, -1) + 1
+        sections.append((f"{key}:{occurrence}", year, month, body))
+
+    for header in _HEADER.finditer(content):
+        if header.start() and content[header.start() - 1] != "\n":
+            continue
+
+        # The body ends before the newline preceding the header line
+        close(header.start() - 1)
+        if header.group(1) is not None:
+            year = int(header.group(1))
+        else:
+            month = header.group(2)
+        start = header.end() + 1
+
+    close(len(content))
+    return sections
 
 
 class MarkdownParserService:
     """Service for parsing and caching conference data from markdown files."""
 
-    def __init__(self, data_dir: Path | None = None):
+    def __init__(
+        self,
+        data_dir: Path | None = None,
+        snapshot_dir: Path | None = SNAPSHOT_DIR,
+        watch_interval: float = WATCH_INTERVAL,
+        tagger: TagMatcher | None = None,
+        parse_workers: int = PARSE_WORKERS,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        attach: bool = SNAPSHOT_ATTACH,
+        snapshot_wait: float = SNAPSHOT_WAIT,
+    ):
         """
         Initialize the parser service.
 
         Args:
             data_dir: Optional custom data directory path.
-                     Defaults to data/developers-conferences-agenda relative to this file.
+                     Defaults to CFP_DATA_DIR, or data/developers-conferences-agenda
+                     relative to the repository root.
+            snapshot_dir: Directory of parse snapshots, reused while the README is unchanged.
+                     None always parses the README.
+            watch_interval: If not 0, poll the README every watch_interval seconds and
+                     reload the conferences when it changes.
+            tagger: Tags conferences from their name. Defaults to the tag_keywords()
+                     taxonomy matched in TAG_BOUNDARY mode.
+            parse_workers: Number of processes parsing the README when it holds at least
+                     parallel_threshold characters. 1 always parses in-process.
+            parallel_threshold: README size from which parsing is split across processes.
+            attach: Serve the snapshots published in snapshot_dir by another service
+                     instead of parsing the README, and while watching, switch to each
+                     new generation they publish. The README is not read.
+            snapshot_wait: Seconds an attached service waits for a first snapshot.
         """
         if data_dir is None:
-            data_dir = Path(__file__).parent.parent / "data" / "developers-conferences-agenda"
+            data_dir = DATA_DIR
+        if attach and snapshot_dir is None:
+            raise ValueError("Attaching to published snapshots needs a snapshot directory")
 
         self.data_dir = data_dir
-        readme_path = data_dir / "README.md"
-        if not readme_path.exists():
+        self.readme_path = data_dir / "README.md"
+        if not attach and not self.readme_path.exists():
             raise FileNotFoundError(
-                f"Conference data not found at {readme_path}. "
+                f"Conference data not found at {self.readme_path}. "
                 "Please ensure the git submodule is initialized: "
                 "git submodule update --init --recursive"
             )
-        self._conferences = MarkdownParserService.parse_markdown_conferences(self, readme_path)
+        self.snapshot_dir = snapshot_dir
+        self.attach = attach
+        self.snapshot_wait = snapshot_wait
+        # Generation of the published snapshot served, None while none is
+        self.generation: int | None = None
+        self.tagger = tagger or TagMatcher(tag_keywords(), TAG_BOUNDARY)
+        self.parse_workers = parse_workers
+        self.parallel_threshold = parallel_threshold
+        self.startup_report: dict[str, Any] = {}
+        self._reload_lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop_watching = threading.Event()
+        self._rejected_generation: int | None = None
+        if attach:
+            self._watched_path = published_path(snapshot_dir)
+            self._conferences = self._attach_conferences()
+        else:
+            self._watched_path = self.readme_path
+            self._watched_stat = _stat(self.readme_path)
+            self._conferences = self._load_conferences()
+
+        if watch_interval:
+            self.start_watching(watch_interval)
 
-    def get_conferences(self) -> list[dict[str, Any]]:
+    def get_conferences(self) -> ConferenceStore:
         return self._conferences
 
+    def reload(self) -> bool:
+        """
+        Reload the conferences if the README content changed.
+
+        Only the sections whose content changed are parsed again; rows of the other
+        sections are copied from the current store. The new store replaces the current
+        one in a single assignment, so queries already running keep the store they
+        started with. Its snapshot is then published, and the store swapped for the
+        mapping of the snapshot.
+
+        An attached service switches to the last published snapshot instead.
+
+        Returns:
+            True if the conferences were reloaded
+        """
+        if self.attach:
+            return self._reattach()
+
+        with self._reload_lock:
+            self._watched_stat = _stat(self.readme_path)
+            content = self.readme_path.read_text(encoding="utf-8")
+            digest = source_hash(content)
+            current = self._conferences
+            if digest == current.source_hash:
+                return False
+
+            start = time.perf_counter()
+            previous_keys = set(current.sections.values)
+            with _gc_paused():
+                sections = split_sections(content)
+                changed = [
+                    (year, month, body)
+                    for key, year, month, body in sections
+                    if key not in previous_keys
+                ]
+                parsed = iter(self.parse_sections(changed))
+                store = current.rebuild(
+                    [
+                        (key, None if key in previous_keys else next(parsed))
+                        for key, _, _, _ in sections
+                    ],
+                    digest,
+                )
+            reload_seconds = time.perf_counter() - start
+            self._conferences = store
+            OPERATION_DURATION.observe(reload_seconds, operation="agenda_reload")
+            CONFERENCES.set(len(store))
+            logger.info(
+                "Reloaded %d conferences in %.1f ms (%d of %d sections parsed)",
+                len(store),
+                reload_seconds * 1000,
+                len(changed),
+                len(sections),
+            )
+            self._conferences = self._share(store, reload_seconds)
+            return True
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Poll the README modification time in a background thread and reload on change."""
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="agenda-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher started by start_watching."""
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_watching.wait(interval):
+            try:
+                if _stat(self._watched_path) != self._watched_stat:
+                    self.reload()
+            except Exception:
+                logger.exception("Unable to reload %s", self.readme_path)
+
+    def _load_conferences(self) -> ConferenceStore:
+        """Load the conferences from a snapshot of the README if possible, else parse it."""
+        start = time.perf_counter()
+        content = self.readme_path.read_text(encoding="utf-8")
+        digest = source_hash(content)
+        report: dict[str, Any] = {
+            "source_hash": digest,
+            "hash_ms": _ms_since(start),
+        }
+
+        if self.snapshot_dir is not None:
+            start = time.perf_counter()
+            path = snapshot_path(self.snapshot_dir, digest)
+            loaded = read_snapshot(path, digest, self.tagger.fingerprint)
+            if loaded is not None:
+                store, header = loaded
+                self._publish(path)
+                report.update(
+                    source="snapshot",
+                    load_ms=_ms_since(start),
+                    parse_ms=round(header["parse_seconds"] * 1000, 3),
+                    conferences=len(store),
+                    generation=self.generation,
+                )
+                self._report_startup(report)
+                return store
+
+        start = time.perf_counter()
+        with _gc_paused():
+            sections = split_sections(content)
+            parsed = self.parse_sections([(year, month, body) for _, year, month, body in sections])
+            store = ConferenceStore.from_sections(
+                zip((key for key, _, _, _ in sections), parsed),
+                self.tagger.tag_names,
+                digest,
+            )
+        parse_seconds = time.perf_counter() - start
+        report.update(
+            source="parse", parse_ms=round(parse_seconds * 1000, 3), conferences=len(store)
+        )
+
+        start = time.perf_counter()
+        shared = self._share(store, parse_seconds)
+        if shared is not store:
+            report.update(snapshot_write_ms=_ms_since(start), generation=self.generation)
+
+        self._report_startup(report)
+        return shared
+
+    def _attach_conferences(self) -> ConferenceStore:
+        """Wait for a snapshot to be published in the snapshot directory and map it."""
+        start = time.perf_counter()
+        while True:
+            with suppress(FileNotFoundError):
+                self._watched_stat = _stat(self._watched_path)
+            attempt = time.perf_counter()
+            attached = self._attach_published()
+            if attached is not None:
+                break
+            if attempt - start >= self.snapshot_wait:
+                raise TimeoutError(
+                    f"No usable snapshot published in {self.snapshot_dir} after "
+                    f"{self.snapshot_wait:g} s. Start a server without CFP_SNAPSHOT_ATTACH on "
+                    "the same CFP_CACHE_DIR and the same tags, or run mcp_server/snapshot.py"
+                )
+            time.sleep(0.5)
+
+        store, header = attached
+        self._report_startup({
+            "source_hash": header["source_hash"],
+            "source": "attach",
+            "wait_ms": round((attempt - start) * 1000, 3),
+            "load_ms": _ms_since(attempt),
+            "parse_ms": round(header["parse_seconds"] * 1000, 3),
+            "conferences": len(store),
+            "generation": self.generation,
+        })
+        return store
+
+    def _reattach(self) -> bool:
+        with self._reload_lock:
+            self._watched_stat = _stat(self._watched_path)
+            start = time.perf_counter()
+            attached = self._attach_published()
+            if attached is None:
+                return False
+            store, _ = attached
+            self._conferences = store
+            load_seconds = time.perf_counter() - start
+            OPERATION_DURATION.observe(load_seconds, operation="agenda_snapshot_load")
+            CONFERENCES.set(len(store))
+            logger.info(
+                "Attached to snapshot generation %d: %d conferences in %.1f ms",
+                self.generation,
+                len(store),
+                load_seconds * 1000,
+            )
+            return True
+
+    def _attach_published(self) -> tuple[ConferenceStore, dict[str, Any]] | None:
+        """Map the published snapshot if it is a new generation, None otherwise."""
+        published = published_snapshot(self.snapshot_dir)
+        if published is None or published[0] in (self.generation, self._rejected_generation):
+            return None
+        generation, path = published
+        loaded = read_snapshot(path, None, self.tagger.fingerprint)
+        if loaded is None:
+            # Logged once per generation, the watcher retries at the next publication
+            self._rejected_generation = generation
+            logger.warning(
+                "Ignoring snapshot generation %d (%s): missing, or built with other tags "
+                "or another gazetteer",
+                generation,
+                path.name,
+            )
+            return None
+        self.generation = generation
+        SNAPSHOT_GENERATION.set(generation)
+        return loaded
+
+    def _share(self, store: ConferenceStore, parse_seconds: float) -> ConferenceStore:
+        """
+        Write and publish the snapshot of a store just built.
+
+        Returns the store mapped from the snapshot, whose pages are shared with the
+        attached services, or store itself when the snapshot could not be written.
+        """
+        if not self._write_snapshot(store, parse_seconds):
+            return store
+        path = snapshot_path(self.snapshot_dir, store.source_hash)
+        loaded = read_snapshot(path, store.source_hash, self.tagger.fingerprint)
+        if loaded is None:
+            return store
+        self._publish(path)
+        return loaded[0]
+
+    def _publish(self, path: Path) -> None:
+        try:
+            self.generation = publish_snapshot(self.snapshot_dir, path)
+        except OSError as e:
+            logger.warning("Unable to publish parse snapshot %s: %s", path, e)
+            return
+        SNAPSHOT_GENERATION.set(self.generation)
+
+    def _write_snapshot(self, store: ConferenceStore, parse_seconds: float) -> bool:
+        if self.snapshot_dir is None:
+            return False
+        path = snapshot_path(self.snapshot_dir, store.source_hash)
+        try:
+            write_snapshot(store, path, store.source_hash, parse_seconds, self.tagger.fingerprint)
+            prune_snapshots(self.snapshot_dir)
+        except OSError as e:
+            logger.warning("Unable to write parse snapshot to %s: %s", path, e)
+            return False
+        return True
+
+    def _report_startup(self, report: dict[str, Any]) -> None:
+        self.startup_report = report
+        CONFERENCES.set(report["conferences"])
+        if report["source"] == "attach":
+            OPERATION_DURATION.observe(report["load_ms"] / 1000, operation="agenda_snapshot_load")
+            logger.info(
+                "Attached to snapshot generation %d: %d conferences in %.1f ms "
+                "(waited %.1f ms, parsing took %.1f ms)",
+                report["generation"],
+                report["conferences"],
+                report["load_ms"],
+                report["wait_ms"],
+                report["parse_ms"],
+            )
+        elif report["source"] == "snapshot":
+            OPERATION_DURATION.observe(report["load_ms"] / 1000, operation="agenda_snapshot_load")
+            logger.info(
+                "Loaded %d conferences from snapshot in %.1f ms (parsing took %.1f ms)",
+                report["conferences"],
+                report["load_ms"],
+                report["parse_ms"],
+            )
+        else:
+            OPERATION_DURATION.observe(report["parse_ms"] / 1000, operation="agenda_parse")
+            logger.info(
+                "Parsed %d conferences in %.1f ms", report["conferences"], report["parse_ms"]
+            )
+
     def parse_markdown_conferences(self, readme_path: str | Path) -> list[dict[str, Any]]:
         """
         Parse conference data from the developers-conferences-agenda README.md file.
@@ -46,33 +708,59 @@ class MarkdownParserService:
         with open(readme_path, encoding="utf-8") as f:
             content = f.read()
 
-        conferences = []
-        current_year = None
-        current_month = None
+        with _gc_paused():
+            sections = [(year, month, body) for _, year, month, body in split_sections(content)]
+            return [
+                entry.record() for entries in self.parse_sections(sections) for entry in entries
+            ]
 
-        # Split into lines for processing
-        lines = content.split("\n")
+    def parse_sections(
+        self, sections: Sequence[tuple[int | None, str | None, str]]
+    ) -> list[list[ConferenceEntry]]:
+        """
+        Parse sections of the README, across processes when they are large enough.
 
-        for line in lines:
-            # Detect year headers (## 2026)
-            year_match = re.match(r"^##\s+(\d{4})$", line)
-            if year_match:
-                current_year = int(year_match.group(1))
-                continue
+        Sections are split at year boundaries and each year is parsed by a worker of a
+        process pool; results are merged back in document order, so the output is the
+        same as parsing each section in turn with parse_section.
 
-            # Detect month headers (### January)
-            month_match = re.match(r"^###\s+(\w+)$", line)
-            if month_match:
-                current_month = month_match.group(1)
-                continue
+        Args:
+            sections: (year, month, body) tuples, as returned by split_sections
 
-            # Parse conference entry lines (start with "* ")
-            if line.startswith("* ") and current_year and current_month:
-                conf = self.parse_conference_line(line, current_year, current_month)
-                if conf:
-                    conferences.append(conf)
+        Returns:
+            Parsed entries of each section, in the order of sections
+        """
+        chunks = _year_chunks(sections)
+        workers = min(self.parse_workers, len(chunks))
+        size = sum(len(body) for _, _, body in sections)
+        if workers > 1 and size >= self.parallel_threshold:
+            try:
+                with ProcessPoolExecutor(
+                    workers, initializer=_init_worker, initargs=(self.tagger,)
+                ) as pool:
+                    return [
+                        entries for chunk in pool.map(_parse_chunk, chunks) for entries in chunk
+                    ]
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning("Parallel parsing failed, parsing in-process: %s", e)
+
+        return [self.parse_section(body, year, month) for year, month, body in sections]
+
+    def parse_section(
+        self, body: str, year: int | None, month: str | None
+    ) -> list[ConferenceEntry]:
+        """
+        Parse the conference entries of one section of the README.
 
-        return conferences
+        Args:
+            body: Lines following a year or month header
+            year: Year in effect for these lines
+            month: Month in effect for these lines
+
+        Returns:
+            Parsed entries, in document order
+        """
+        return _parse_body(body, year, month, self.tagger.tags)
 
     def parse_conference_line(self, line: str, year: int, month: str) -> dict[str, Any] | None:
         """
@@ -84,87 +772,10 @@ class MarkdownParserService:
         * 31-01/02: [FOSDEM 2026](https://fosdem.org/2026/) - Brussels (Belgium)
           <a href="...">CFP...</a>
         """
-        # Remove the leading "* "
-        line = line[2:].strip()
-
-        # Extract date range (e.g., "5-6:", "15:", "31-01/02:")
-        date_match = re.match(r"^([\d\-/]+):\s+", line)
-        if not date_match:
+        entry_match = _ENTRY.match(line[2:].strip())
+        if not entry_match:
             return None
-
-        date_str = date_match.group(1)
-        line = line[len(date_match.group(0)) :]
-
-        # Extract conference name and link [Name](URL)
-        name_link_match = re.match(r"\[([^\]]+)\]\(([^)]+)\)", line)
-        if not name_link_match:
-            return None
-
-        name = name_link_match.group(1)
-        hyperlink = name_link_match.group(2)
-        line = line[len(name_link_match.group(0)) :].strip()
-
-        # Extract location (after " - ")
-        location_match = re.match(r"^-\s+([^<\n]+)", line)
-        location = "Unknown"
-        city = ""
-        country = ""
-
-        if location_match:
-            location = location_match.group(1).strip()
-            line = line[len(location_match.group(0)) :]
-
-            # Parse location (format: "City, State (Country)" or "City (Country)")
-            loc_parts = location.rsplit("(", 1)
-            if len(loc_parts) == 2:
-                city_part = loc_parts[0].strip().rstrip(",")
-                country = loc_parts[1].rstrip(")").strip()
-
-                # Handle "City, State" format
-                if "," in city_part:
-                    city = city_part.split(",")[0].strip()
-                else:
-                    city = city_part
-
-        # Extract CFP information if present
-        cfp_info = None
-        cfp_match = re.search(r'<a href="([^"]+)"><img[^>]*message=until%20([^"&]+)', line)
-        if cfp_match:
-            cfp_link = cfp_match.group(1)
-            cfp_date_encoded = cfp_match.group(2)
-            # Decode URL-encoded date (e.g., "15-November-2025" or "15-October-2025")
-            cfp_date_str = cfp_date_encoded.replace("-", " ")
-            try:
-                cfp_deadline = datetime.strptime(cfp_date_str, "%d %B %Y")
-                cfp_info = {
-                    "link": cfp_link,
-                    "untilDate": int(cfp_deadline.timestamp()),
-                }
-            except ValueError:
-                # If parsing fails, include CFP link without deadline
-                cfp_info = {"link": cfp_link, "untilDate": None}
-
-        # Parse dates into timestamps
-        dates = self.parse_date_range(date_str, year, month)
-
-        # Extract tags from the conference name and location
-        tags = self.extract_tags(name)
-
-        # Build conference object
-        conference = {
-            "name": name,
-            "date": dates,
-            "city": city,
-            "country": country,
-            "location": location,
-            "hyperlink": hyperlink,
-            "tags": tags,
-        }
-
-        if cfp_info:
-            conference["cfp"] = cfp_info
-
-        return conference
+        return _entries([entry_match.groups("")], year, month, self.tagger.tags)[0].record()
 
     def parse_date_range(self, date_str: str, year: int, month: str) -> dict[str, int]:
         """
@@ -183,73 +794,30 @@ class MarkdownParserService:
             "15" -> {"beginning": timestamp for 15th, "end": timestamp for 15th}
             "31-01/02" -> {"beginning": timestamp for 31st, "end": timestamp for 2nd of next month}
         """
-        month_num = datetime.strptime(month, "%B").month
-
-        # Handle cross-month ranges (e.g., "31-01/02")
-        if "-" in date_str and "/" in date_str:
-            parts = date_str.split("-")
-            start_day = int(parts[0])
-            end_part = parts[1]
-
-            # Start date
-            start_date = datetime(year, month_num, start_day)
-            beginning = int(start_date.timestamp())
-
-            # End date (next month)
-            next_month = month_num + 1 if month_num < 12 else 1
-            next_year = year if month_num < 12 else year + 1
-            end_days = end_part.split("/")
-            end_day = int(end_days[0])
-
-            end_date = datetime(next_year, next_month, end_day)
-            end = int(end_date.timestamp())
+        beginning, end = _date_range(date_str, year, month)
+        return {"beginning": beginning, "end": end}
 
-        # Handle same-month ranges (e.g., "5-6")
-        elif "-" in date_str:
-            parts = date_str.split("-")
-            start_day = int(parts[0])
-            end_day = int(parts[1])
+    def extract_tags(self, name: str) -> list[str]:
+        """Extract tags based on conference name keywords."""
+        return list(self.tagger.tags(name))
 
-            start_date = datetime(year, month_num, start_day)
-            end_date = datetime(year, month_num, end_day)
 
-            beginning = int(start_date.timestamp())
-            end = int(end_date.timestamp())
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector while building objects that all stay alive."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
-        # Handle single day (e.g., "15")
-        else:
-            day = int(date_str)
-            date = datetime(year, month_num, day)
-            timestamp = int(date.timestamp())
-            beginning = timestamp
-            end = timestamp
 
-        return {"beginning": beginning, "end": end}
-
-    def extract_tags(self, name: str) -> list[str]:
-        """Extract tags based on conference name and location keywords."""
-        tags = []
-        name_lower = name.lower()
-
-        # Technology keywords
-        tech_keywords = {
-            "ai": ["ai", "artificial intelligence", "machine learning", "ml"],
-            "cloud": ["cloud", "aws", "azure", "gcp"],
-            "devops": ["devops", "kubernetes", "docker"],
-            "security": ["security", "infosec", "cybersec"],
-            "web": ["web", "frontend", "backend", "fullstack"],
-            "data": ["data", "database", "analytics", "bigdata"],
-            "mobile": ["mobile", "ios", "android"],
-            "javascript": ["javascript", "js", "node", "react", "vue", "angular"],
-            "python": ["python", "django", "flask"],
-            "java": ["java", "spring"],
-            ".net": [".net", "dotnet", "csharp", "c#"],
-            "agile": ["agile", "scrum"],
-            "development": ["voxx", "craft", "gdg", "dev", "developers"],
-        }
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
 
-        for tag, keywords in tech_keywords.items():
-            if any(keyword in name_lower for keyword in keywords):
-                tags.append(tag)
 
-        return tags
+def _stat(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
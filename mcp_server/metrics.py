@@ -0,0 +1,206 @@
+"""
+Latency histograms, payload sizes and error counters, rendered in Prometheus text format.
+
+This module has no dependencies, so that the agenda parsing can record metrics without
+importing the MCP server; instrumentation serves them.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Sequence
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+SIZE_BUCKETS = tuple(256 * 4**i for i in range(9))  # 256 B to 16 MiB
+COUNT_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+# Operations timed during the current MCP request, for the slow call log
+request_spans: ContextVar[list[tuple[str, float]] | None] = ContextVar("spans", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if labels.keys() != set(self.labels):
+            raise ValueError(f"{self.name} takes the labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count, per label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return super().render() + [
+            f"{self.name}{_label_text(self.labels, key)} {_number(value)}" for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, per label values."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values over fixed buckets, per label values.
+
+    time() also records the duration in the trace of the current MCP request, so that
+    slow calls can be broken down by operation.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: count of each bucket (non-cumulative, last one is +Inf) and sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the block, in seconds, even when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.observe(seconds, **labels)
+            spans = request_spans.get()
+            if spans is not None:
+                spans.append((",".join(str(value) for value in labels.values()) or self.name,
+                              seconds))
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0]))
+                            for key, (counts, total) in self._values.items())
+        lines = super().render()
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                labels = _label_text(self.labels, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_text(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics rendered together on the metrics endpoint."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_DURATION = REGISTRY.register(Histogram(
+    "cfp_request_duration_seconds",
+    "Duration of the MCP tool calls, resource reads and prompt renderings.",
+    ("kind", "name"),
+))
+REQUEST_ERRORS = REGISTRY.register(Counter(
+    "cfp_request_errors_total",
+    "MCP tool calls, resource reads and prompt renderings that raised.",
+    ("kind", "name", "error"),
+))
+REQUEST_SIZE = REGISTRY.register(Histogram(
+    "cfp_request_size_bytes",
+    "JSON size of the arguments of the MCP requests.",
+    ("kind", "name"),
+    SIZE_BUCKETS,
+))
+RESPONSE_SIZE = REGISTRY.register(Histogram(
+    "cfp_response_size_bytes",
+    "JSON size of the results of the MCP requests.",
+    ("kind", "name"),
+    SIZE_BUCKETS,
+))
+OPERATION_DURATION = REGISTRY.register(Histogram(
+    "cfp_operation_duration_seconds",
+    "Duration of the operations inside the MCP requests and of the agenda loading.",
+    ("operation",),
+))
+FILTER_RESULTS = REGISTRY.register(Histogram(
+    "cfp_filter_results",
+    "Number of conferences returned by apply_filter.",
+    buckets=COUNT_BUCKETS,
+))
+CONFERENCES = REGISTRY.register(Gauge(
+    "cfp_conferences",
+    "Number of conferences of the loaded agenda.",
+))
+SNAPSHOT_GENERATION = REGISTRY.register(Gauge(
+    "cfp_snapshot_generation",
+    "Generation of the published agenda snapshot served by the process.",
+))
@@ -0,0 +1,110 @@
+"""LRU/TTL cache of search results, keyed by normalized filters and data version."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Sequence
+
+# Number of search results kept (0 disables the cache) and their maximum age in seconds
+QUERY_CACHE_SIZE = int(os.environ.get("CFP_QUERY_CACHE_SIZE", "256"))
+QUERY_CACHE_TTL = float(os.environ.get("CFP_QUERY_CACHE_TTL", "600"))
+
+
+class QueryCache:
+    """
+    Bounded cache of matching row ids.
+
+    Entries are keyed by the data version they were computed on plus a normalized
+    filter key, so a reload of the agenda never serves stale rows: the first lookup
+    with a new version drops every entry of the previous one. Each entry also carries
+    an expiry timestamp, the earliest of its TTL and of any deadline after which its
+    result changes (for open-CFP searches, the closest CFP deadline in the result).
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL):
+        """
+        Args:
+            max_entries: Number of results kept, least recently used are evicted first
+            ttl: Seconds a result is kept at most
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._version: str | None = None
+        self._entries: OrderedDict[Hashable, tuple[Sequence[int], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, key: Hashable) -> Sequence[int] | None:
+        """Return the cached row ids of a query, or None on a miss."""
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            rows, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(
+        self, version: str, key: Hashable, rows: Sequence[int], valid_until: float | None = None
+    ) -> None:
+        """
+        Cache the row ids of a query.
+
+        Args:
+            version: Data version the rows were computed on
+            key: Normalized filters of the query
+            rows: Matching row ids
+            valid_until: Optional timestamp after which the result may change
+        """
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if valid_until is not None:
+            expires_at = min(expires_at, valid_until)
+
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._entries[key] = (rows, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "version": self._version,
+            }
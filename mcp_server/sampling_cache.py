@@ -0,0 +1,117 @@
+"""Disk cache of the conference matches sampled for a talk."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+try:
+    from .snapshot import atomic_file
+    from .utils import CACHE_DIR
+except ImportError:
+    from snapshot import atomic_file
+    from utils import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+SAMPLING_CACHE_DIR = CACHE_DIR / "sampling"
+
+# Number of sampling results kept on disk (0 disables the cache)
+SAMPLING_CACHE_SIZE = int(os.environ.get("CFP_SAMPLING_CACHE_SIZE", "256"))
+
+
+def sampling_key(talk: str, conferences: Sequence[Mapping[str, Any]],
+                 params: Mapping[str, Any]) -> str:
+    """
+    Key of a sampling result.
+
+    Args:
+        talk: Talk text sent to the LLM
+        conferences: Conference summaries sent to the LLM, in order
+        params: Everything else shaping the result (prompt, temperature, batching...)
+    """
+    talk_hash = hashlib.sha256(talk.encode("utf-8")).hexdigest()
+    conferences_hash = hashlib.sha256(
+        json.dumps(conferences, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return hashlib.sha256(
+        json.dumps([talk_hash, conferences_hash, params], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class SamplingCache:
+    """
+    Sampled matches stored as one JSON file per key.
+
+    Reading an entry refreshes its modification time, and writing one removes the least
+    recently used entries beyond max_entries, so the directory stays bounded. Files are
+    written atomically; an unreadable file counts as a miss and is removed.
+    """
+
+    def __init__(self, directory: Path = SAMPLING_CACHE_DIR,
+                 max_entries: int = SAMPLING_CACHE_SIZE):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        """Return the cached matches of a key, or None on a miss."""
+        if self.max_entries <= 0:
+            return None
+        path = self._path(key)
+        try:
+            matches = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(matches, list):
+                raise ValueError("not a list of matches")
+            os.utime(path)
+        except FileNotFoundError:
+            matches = None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable sampling cache entry %s: %s", path, e)
+            # The directory itself may be unusable, the entry stays a miss
+            with suppress(OSError):
+                path.unlink(missing_ok=True)
+            matches = None
+
+        with self._lock:
+            if matches is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return matches
+
+    def put(self, key: str, matches: list[dict[str, Any]]) -> None:
+        """Store the matches of a key, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        path = self._path(key)
+        try:
+            with atomic_file(path) as f:
+                f.write(json.dumps(matches, ensure_ascii=False).encode("utf-8"))
+            self._prune()
+        except OSError as e:
+            logger.warning("Unable to write sampling cache entry %s: %s", path, e)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "max_entries": self.max_entries}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _prune(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                continue
+        entries.sort(reverse=True)
+        for _, stale in entries[self.max_entries :]:
+            stale.unlink(missing_ok=True)
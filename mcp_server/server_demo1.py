@@ -1,4 +1,5 @@
 #region Imports
+import json
 from datetime import date
 from pathlib import Path
 from typing import Annotated, Any, Optional
@@ -8,16 +9,30 @@ from fastmcp.resources import FileResource
 from pydantic import Field, AnyUrl
 
 try:
-    from .markdown_parser import MarkdownParserService
-    from .utils import apply_filter, TALKS_DIR
+    from .instrumentation import instrument
+    from .query_cache import QueryCache
+    from .startup import Startup
+    from .utils import (
+        facet_counts, search_page, CONFERENCE_FIELDS, DEFAULT_FACET_LIMIT, DEFAULT_PAGE_SIZE,
+        DEFAULT_RADIUS_KM, FACETS, MAX_PAGE_SIZE, TALKS_DIR,
+    )
 except ImportError:
-    from markdown_parser import MarkdownParserService
-    from utils import apply_filter, TALKS_DIR
+    from instrumentation import instrument
+    from query_cache import QueryCache
+    from startup import Startup
+    from utils import (
+        facet_counts, search_page, CONFERENCE_FIELDS, DEFAULT_FACET_LIMIT, DEFAULT_PAGE_SIZE,
+        DEFAULT_RADIUS_KM, FACETS, MAX_PAGE_SIZE, TALKS_DIR,
+    )
 #endregion
 
-mcp = FastMCP("cfp")
+startup = Startup()
+mcp = FastMCP("cfp", lifespan=startup.lifespan)
+instrument(mcp)
+startup.install(mcp)
 
-parser_service = MarkdownParserService()
+agenda = startup.load_agenda()
+search_cache = QueryCache()
 
 #region MCP tool
 @mcp.tool(
@@ -25,10 +40,16 @@ parser_service = MarkdownParserService()
     description=(
             "Search for technical conferences with optional filters. "
             "Returns structured JSON data. "
-            "Filters include date range, country, tags, and CFP status. "
-            "Results include conference metadata such as tags, CFP deadlines, and locations. "
+            "Filters include date range, country, distance from a city, tags, and CFP status. "
+            "A fuzzy text query on conference names, cities and countries tolerates typos "
+            "and partial words, its results come best match first. "
+            "Results include conference metadata such as tags, CFP deadlines, and locations, "
+            "sorted by date and returned by pages: pass the returned next_cursor to get the "
+            "next page, next_cursor is null on the last page. "
             "Example: search_conferences(min_date='2026-01-01', max_date='2026-12-31', "
-            "country='France', tags='python,ai', cfp_open=True)"
+            "country='France', tags='python,ai', cfp_open=True, fields='name,date,city'), "
+            "search_conferences(text='devox brussel'), "
+            "search_conferences(near='Lyon', radius_km=300)"
     ),
 )
 async def search_conferences(
@@ -67,10 +88,135 @@ async def search_conferences(
                 )
             ),
         ] = False,
-) -> list[Any]:
-    conferences = parser_service.get_conferences()
+        text: Annotated[
+            Optional[str],
+            Field(
+                description=(
+                        "Optional fuzzy text query on conference names, cities and countries, "
+                        "e.g. 'devoxx', 'kubecon amsterdam'. Every word must match a word of the "
+                        "conference, typos and partial words are tolerated. Results come best "
+                        "match first instead of by date."
+                )
+            ),
+        ] = None,
+        near: Annotated[
+            Optional[str],
+            Field(
+                description=(
+                        "Optional place to search around: a city ('Lyon', 'Portland, USA') or "
+                        "'latitude, longitude'. Only conferences within radius_km of it are "
+                        "returned, online conferences and unknown cities are left out."
+                )
+            ),
+        ] = None,
+        radius_km: Annotated[
+            float,
+            Field(description="Distance in km from near within which to search", gt=0),
+        ] = DEFAULT_RADIUS_KM,
+        limit: Annotated[
+            int,
+            Field(
+                description=f"Maximum number of conferences to return (at most {MAX_PAGE_SIZE})",
+                ge=1,
+                le=MAX_PAGE_SIZE,
+            ),
+        ] = DEFAULT_PAGE_SIZE,
+        cursor: Annotated[
+            Optional[str],
+            Field(
+                description=(
+                        "Optional next_cursor returned by a previous call with the same filters, "
+                        "to get the following page"
+                )
+            ),
+        ] = None,
+        fields: Annotated[
+            Optional[str],
+            Field(
+                description=(
+                        "Optional comma-separated list of fields to return for each conference "
+                        f"(among {','.join(CONFERENCE_FIELDS)}). All fields when omitted."
+                )
+            ),
+        ] = None,
+) -> dict[str, Any]:
+    conferences = await agenda.conferences()
+
+    return await search_page(
+        conferences, cfp_open, country, max_date, min_date, tags, limit, cursor, fields,
+        cache=search_cache, text=text, near=near, radius_km=radius_km,
+    )
+
+@mcp.tool(
+    name="conference_facets",
+    description=(
+            "Count technical conferences matching optional filters, without listing them: "
+            "total, number with an open CFP, and counts per country, month and tag. "
+            "Takes the filters of search_conferences. Use it to answer 'how many' questions "
+            "or to pick filters before searching. "
+            "Example: conference_facets(min_date='2026-01-01', max_date='2026-12-31', "
+            "tags='ai', facets='country,month')"
+    ),
+)
+async def conference_facets(
+        min_date: Annotated[
+            Optional[date], Field(description="Optional minimum conference date")
+        ] = None,
+        max_date: Annotated[
+            Optional[date], Field(description="Optional maximum conference date")
+        ] = None,
+        country: Annotated[
+            Optional[str],
+            Field(description="Optional country name (case-insensitive partial match)"),
+        ] = None,
+        tags: Annotated[
+            Optional[str],
+            Field(description="Optional comma-separated list of tags, e.g. 'ai,cloud'"),
+        ] = None,
+        cfp_open: Annotated[
+            Optional[bool],
+            Field(description="Optional filter to only count conferences with open CFPs"),
+        ] = False,
+        text: Annotated[
+            Optional[str],
+            Field(description="Optional fuzzy text query on conference names and places"),
+        ] = None,
+        near: Annotated[
+            Optional[str],
+            Field(description="Optional city ('Lyon') or 'latitude, longitude' to count around"),
+        ] = None,
+        radius_km: Annotated[
+            float,
+            Field(description="Distance in km from near within which to count", gt=0),
+        ] = DEFAULT_RADIUS_KM,
+        facets: Annotated[
+            Optional[str],
+            Field(
+                description=(
+                        "Optional comma-separated list of groups to count "
+                        f"(among {','.join(FACETS)}). All groups when omitted."
+                )
+            ),
+        ] = None,
+        limit: Annotated[
+            int,
+            Field(
+                description=(
+                        "Maximum number of countries and tags, the most frequent ones. "
+                        "Months are listed in chronological order: all of them within "
+                        "min_date and max_date, else the latest ones up to this number"
+                ),
+                ge=1,
+                le=MAX_PAGE_SIZE,
+            ),
+        ] = DEFAULT_FACET_LIMIT,
+) -> dict[str, Any]:
+    conferences = await agenda.conferences()
 
-    return await apply_filter(conferences, cfp_open, country, max_date, min_date, tags)
+    return await facet_counts(
+        conferences, cfp_open, country, max_date, min_date, tags, facets, limit,
+        cache=search_cache, text=text, near=near, radius_km=radius_km,
+    )
 #endregion
 
 #region MCP Prompt
@@ -101,16 +247,29 @@ def list_conferences_by_month_country(
 #endregion
 
 #region MCP resources
-for f in list(TALKS_DIR.glob("*.md")):
-    path = Path(TALKS_DIR / f"{f.stem}.md").resolve()
-    if path.exists():
-        resource = FileResource(
-            uri=AnyUrl(f"file://{path.as_posix()}"),
-            path=path,
-            name=f.stem,
-            mime_type="text/markdown",
-        )
-        mcp.add_resource(resource)
+@startup.defer
+def register_talks() -> None:
+    for f in list(TALKS_DIR.glob("*.md")):
+        path = Path(TALKS_DIR / f"{f.stem}.md").resolve()
+        if path.exists():
+            resource = FileResource(
+                uri=AnyUrl(f"file://{path.as_posix()}"),
+                path=path,
+                name=f.stem,
+                mime_type="text/markdown",
+            )
+            mcp.add_resource(resource)
+#endregion
+
+#region MCP stats resource
+@mcp.resource(
+    uri="stats://search_cache",
+    name="Search Cache Statistics",
+    description="Hit/miss counters of the search_conferences result cache",
+    mime_type="application/json",
+)
+def get_search_cache_stats() -> str:
+    return json.dumps(search_cache.stats())
 #endregion
 
 #region MCP templated resource
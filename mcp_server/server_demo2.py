@@ -1,6 +1,4 @@
 #region Imports
-import copy
-import json
 from datetime import date
 from typing import Annotated, Any, Optional
 
@@ -9,16 +7,31 @@ from fastmcp.server.context import Context
 from pydantic import Field
 
 try:
-    from .markdown_parser import MarkdownParserService
-    from .utils import apply_filter, TALKS_DIR
+    from .instrumentation import instrument
+    from .lexical_ranking import prerank
+    from .markdown_parser import tag_keywords
+    from .sampling_cache import SamplingCache
+    from .startup import Startup
+    from .talk_matching import match_and_elicit
+    from .utils import apply_filter, DEFAULT_RADIUS_KM, TALKS_DIR
 except ImportError:
-    from markdown_parser import MarkdownParserService
-    from utils import apply_filter, TALKS_DIR
+    from instrumentation import instrument
+    from lexical_ranking import prerank
+    from markdown_parser import tag_keywords
+    from sampling_cache import SamplingCache
+    from startup import Startup
+    from talk_matching import match_and_elicit
+    from utils import apply_filter, DEFAULT_RADIUS_KM, TALKS_DIR
 #endregion
 
-mcp = FastMCP("cfp")
+startup = Startup()
+mcp = FastMCP("cfp", lifespan=startup.lifespan)
+instrument(mcp)
+startup.install(mcp)
 
-parser_service = MarkdownParserService()
+agenda = startup.load_agenda()
+keywords = tag_keywords()
+sampling_cache = SamplingCache()
 
 @mcp.tool(
     name="apply_conferences",
@@ -42,16 +55,38 @@ async def apply_conferences(
             description="Country name to filter (case-insensitive search)"
         ),
     ] = None,
+    near: Annotated[
+        Optional[str],
+        Field(
+            description=(
+                "City ('Lyon', 'Portland, USA') or 'latitude, longitude' to apply around "
+                "(optional), only the conferences within radius_km are considered"
+            )
+        ),
+    ] = None,
+    radius_km: Annotated[
+        float, Field(description="Distance in km from near within which to apply", gt=0)
+    ] = DEFAULT_RADIUS_KM,
+    use_cache: Annotated[
+        bool,
+        Field(
+            description=(
+                "Reuse the matches found by a previous call for the same talk and conferences. "
+                "Set to False to ask the LLM again."
+            )
+        ),
+    ] = True,
 ) -> dict[str, Any]:
     #region Récupération des conférences
-    conferences = parser_service.get_conferences()
+    conferences = await agenda.conferences()
     results = await apply_filter(
-        conferences, country=country, max_date=max_date, min_date=min_date, cfp_open=True, tags=None
+        conferences, country=country, max_date=max_date, min_date=min_date, cfp_open=True,
+        tags=None, near=near, radius_km=radius_km,
     )
     conferences_summary = [{
-        "name": conf["name"],
-        "tags": conf.get("tags", []),
-        "location": f"{conf.get('city', 'Unknown')}, {conf.get('country', 'Unknown')}",
+        "name": conf.name,
+        "tags": conf.tags,
+        "location": f"{conf.city}, {conf.country}",
     } for conf in results]
     #endregion
 
@@ -70,65 +105,29 @@ async def apply_conferences(
         }
     #endregion
 
-    #region Sampling prompt
-    sampling_prompt = f"""Analyze which conferences match this talk topic: "{talk_title}"
-
-talk excerpt:
-{chr(10).join(talk_lines[:15])}
-
-Available conferences:
-{json.dumps(conferences_summary, indent=2, ensure_ascii=False)}
-
-For each conference, evaluate the match based on:
-- The conference's tags/themes
-- The conference name and theme
-- Relevance to the talk topic
-
-Respond ONLY with valid JSON (no markdown, no code blocks):
-{{
-  "matches": [
-    {{
-      "name": "exact conference name from the list",
-      "score": 0-100,
-      "reasoning": "brief explanation in English (max 1 sentence)"
-    }}
-  ]
-}}
-
-Important:
-- Only include conferences with score >= 30
-- Be strict about tag relevance
-- Consider broad themes (e.g., "AI" matches "machine learning", "data science")"""
-    #endregion
-
     #region Sampling and elicitation
     try:
-        #region Sampling
-        result = await ctx.sample(
-            messages=sampling_prompt,
-            temperature=0.3,
-            max_tokens=4000,
-        )
-
-        matches = json.loads(result.text.strip()).get("matches", [])
+        #region Pré-classement local
+        # Only the conferences closest to the talk words are sent to the LLM
+        candidates, local_scores = prerank(talk_text, conferences_summary, tag_keywords=keywords)
         #endregion
 
-        #region Elicitation
-        applied_confs = []
+        #region Sampling par lots et elicitation
+        # Conferences are scored in batches sampled concurrently; the user is asked about
+        # the matches of each batch as soon as it is scored, or about all of them at once
+        # in batch mode
+        matches, applied_confs = await match_and_elicit(
+            ctx, talk_title, chr(10).join(talk_lines[:15]), candidates,
+            cache=sampling_cache, use_cache=use_cache,
+        )
         for match in matches:
-            conf_name = match.get("name", "Unknown")
-
-            prompt = f"Do you want to apply to the CFP for the conference '{conf_name}' with your talk '{talk_title}'?"
-
-            elicit_result = await ctx.elicit(prompt, response_type=None)
-
-            if elicit_result.action == "accept":
-                applied_confs.append(conf_name)
+            match["local_score"] = local_scores[match["name"]]
 
         return {
             "talk_uri": talk_resource_uri,
             "talk_title": talk_title,
             "applied_confs": applied_confs,
+            "matches": matches,
         }
         #endregion
 
@@ -0,0 +1,406 @@
+"""
+Binary on-disk snapshots of a parsed ConferenceStore, keyed by the README content hash.
+
+Snapshots are memory-mapped read-only, so every process serving the same snapshot
+shares its pages. The snapshot currently served is published in a small pointer file
+with a generation number, which processes attached to the directory follow.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+try:
+    from .conference_index import ConferenceIndex, GeoIndex, PostingLists, TextIndex
+    from .conference_store import (
+        ARRAY_COLUMNS,
+        STRING_COLUMNS,
+        ConferenceStore,
+        PackedStrings,
+        StringPool,
+    )
+    from .gazetteer import default_gazetteer
+except ImportError:
+    from conference_index import ConferenceIndex, GeoIndex, PostingLists, TextIndex
+    from conference_store import (
+        ARRAY_COLUMNS,
+        STRING_COLUMNS,
+        ConferenceStore,
+        PackedStrings,
+        StringPool,
+    )
+    from gazetteer import default_gazetteer
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout or the parser output changes
+SNAPSHOT_VERSION = 5
+
+_MAGIC = b"CFPSNAP\0"
+_HEADER_LEN = struct.Struct("<Q")
+_ALIGN = 8
+
+# Number of snapshots kept in a snapshot directory
+_KEEP = 4
+
+# Pointer to the published snapshot of a snapshot directory, and the lock file held
+# while a process publishes a new generation
+_CURRENT = "current"
+_PUBLISH_LOCK = "current.lock"
+
+# Seconds after which a publication lock is taken to be left by a crashed process
+_LOCK_TIMEOUT = 10.0
+
+
+def source_hash(content: str) -> str:
+    """Return the SHA-256 hex digest of README content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def snapshot_path(snapshot_dir: Path, digest: str) -> Path:
+    return snapshot_dir / f"{digest}.snap"
+
+
+def published_path(snapshot_dir: Path) -> Path:
+    """Pointer file naming the published snapshot, replaced at each publication."""
+    return snapshot_dir / _CURRENT
+
+
+def write_snapshot(
+    store: ConferenceStore, path: Path, digest: str, parse_seconds: float, tagger: str
+) -> None:
+    """
+    Write a store and its indexes to a snapshot file.
+
+    The file starts with a JSON header describing every column, followed by the
+    raw, 8-byte aligned column buffers. The file is written atomically.
+
+    Args:
+        store: Store built by ConferenceStore.from_records
+        path: Destination file
+        digest: Content hash of the README the store was parsed from
+        parse_seconds: Time spent parsing, reported when the snapshot is loaded
+        tagger: Fingerprint of the TagMatcher the store was tagged with
+    """
+    buffers: dict[str, Any] = {name: getattr(store, name) for name in ARRAY_COLUMNS}
+    for name in STRING_COLUMNS:
+        column = getattr(store, name)
+        if not isinstance(column, PackedStrings):
+            column = PackedStrings.pack(column)
+        buffers[f"{name}.blob"] = column.blob
+        buffers[f"{name}.offsets"] = column.offsets
+
+    index = store.index
+    buffers["index.by_country.offsets"] = index.by_country.offsets
+    buffers["index.by_country.ids"] = index.by_country.ids
+    buffers["index.tag_sets"] = index.tag_sets
+    buffers["index.by_tag_set.offsets"] = index.by_tag_set.offsets
+    buffers["index.by_tag_set.ids"] = index.by_tag_set.ids
+    buffers["index.cfp_rows"] = index.cfp_rows
+    buffers["index.cfp_deadlines"] = index.cfp_deadlines
+    buffers["index.text.grams"] = index.text.grams
+    buffers["index.text.gram_words.offsets"] = index.text.gram_words.offsets
+    buffers["index.text.gram_words.ids"] = index.text.gram_words.ids
+    buffers["index.text.word_grams"] = index.text.word_grams
+    buffers["index.text.word_rows.offsets"] = index.text.word_rows.offsets
+    buffers["index.text.word_rows.ids"] = index.text.word_rows.ids
+    buffers["index.geo.points"] = index.geo.points
+    buffers["index.geo.axes"] = index.geo.axes
+    buffers["index.geo.latitudes"] = index.geo.latitudes
+    buffers["index.geo.longitudes"] = index.geo.longitudes
+    buffers["index.geo.place_rows.offsets"] = index.geo.place_rows.offsets
+    buffers["index.geo.place_rows.ids"] = index.geo.place_rows.ids
+
+    layout = {}
+    offset = 0
+    for name, buffer in buffers.items():
+        view = memoryview(buffer)
+        layout[name] = [_typecode(buffer), view.itemsize, offset, view.nbytes]
+        offset += _padded(view.nbytes)
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "source_hash": digest,
+        "parse_seconds": parse_seconds,
+        "tagger": tagger,
+        "gazetteer": default_gazetteer().fingerprint,
+        "rows": len(store),
+        "cities": store.cities.values,
+        "countries": store.countries.values,
+        "tag_names": store.tag_names.values,
+        "sections": store.sections.values,
+        "nullable": [name for name in STRING_COLUMNS if _nullable(getattr(store, name))],
+        "iso_dates": sorted(store.iso_dates.items()),
+        "max_duration": index.max_duration,
+        "buffers": layout,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix = len(_MAGIC) + _HEADER_LEN.size + len(header_bytes)
+
+    with atomic_file(path) as f:
+        f.write(_MAGIC)
+        f.write(_HEADER_LEN.pack(len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (_padded(prefix) - prefix))
+        for buffer in buffers.values():
+            view = memoryview(buffer).cast("B")
+            f.write(view)
+            f.write(b"\0" * (_padded(view.nbytes) - view.nbytes))
+
+
+def read_snapshot(
+    path: Path, digest: str | None, tagger: str
+) -> tuple[ConferenceStore, dict[str, Any]] | None:
+    """
+    Load a store from a snapshot file.
+
+    Columns and indexes are typed memoryviews over a read-only shared mapping of the
+    file, so loading does no per-row work and the processes loading the same snapshot
+    share its pages instead of each holding a copy. Snapshots are never modified in
+    place (they are replaced), so a mapping stays valid after its file is pruned.
+
+    Args:
+        path: Snapshot file
+        digest: Expected README content hash, None to accept the snapshot of any README
+        tagger: Fingerprint of the TagMatcher the caller parses with
+
+    Returns:
+        The store and the snapshot header, or None if the file is missing or stale
+    """
+    try:
+        with path.open("rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
+    try:
+        return _open(memoryview(data), digest, tagger)
+    except (ValueError, KeyError, TypeError, struct.error) as e:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
+
+
+def publish_snapshot(snapshot_dir: Path, path: Path) -> int:
+    """
+    Publish a snapshot as the one served from its directory.
+
+    The pointer file is replaced atomically with the snapshot name and the next
+    generation number. Processes attached to the directory pick the new generation up
+    on their next check and keep their mapping of the previous one until then.
+    Publications are serialized by a lock file, so that processes publishing at once
+    never give two snapshots the same generation.
+
+    Returns:
+        The generation of the snapshot, unchanged when it was already published
+
+    Raises:
+        OSError: If the pointer cannot be written, TimeoutError if the lock stays taken
+    """
+    with _locked(snapshot_dir / _PUBLISH_LOCK):
+        published = published_snapshot(snapshot_dir)
+        if published is not None and published[1] == path:
+            return published[0]
+        generation = published[0] + 1 if published is not None else 1
+        # Newest snapshot of the directory, so that prune_snapshots keeps it
+        os.utime(path)
+        with atomic_file(published_path(snapshot_dir)) as f:
+            f.write(json.dumps({"generation": generation, "snapshot": path.name}).encode("utf-8"))
+        return generation
+
+
+def published_snapshot(snapshot_dir: Path) -> tuple[int, Path] | None:
+    """Return the generation and the file of the published snapshot, None if there is none."""
+    try:
+        pointer = json.loads(published_path(snapshot_dir).read_bytes())
+        return int(pointer["generation"]), snapshot_dir / Path(pointer["snapshot"]).name
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning("Ignoring unreadable snapshot pointer in %s: %s", snapshot_dir, e)
+        return None
+
+
+def prune_snapshots(snapshot_dir: Path, keep: int = _KEEP) -> None:
+    """Remove all but the most recently written snapshots of a directory."""
+    published = published_snapshot(snapshot_dir)
+    snapshots = sorted(snapshot_dir.glob("*.snap"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in snapshots[keep:]:
+        if published is not None and stale == published[1]:
+            continue
+        try:
+            stale.unlink(missing_ok=True)
+        except OSError:
+            # Still mapped on a platform that does not allow it, removed by a later prune
+            continue
+
+
+def _open(
+    view: memoryview, digest: str, tagger: str
+) -> tuple[ConferenceStore, dict[str, Any]] | None:
+    if view[: len(_MAGIC)] != _MAGIC:
+        return None
+    (header_len,) = _HEADER_LEN.unpack_from(view, len(_MAGIC))
+    prefix = len(_MAGIC) + _HEADER_LEN.size + header_len
+    header = json.loads(bytes(view[len(_MAGIC) + _HEADER_LEN.size : prefix]))
+    if (
+        header["version"] != SNAPSHOT_VERSION
+        or header["byteorder"] != sys.byteorder
+        or digest is not None and header["source_hash"] != digest
+        or header["tagger"] != tagger
+        or header["gazetteer"] != default_gazetteer().fingerprint
+    ):
+        return None
+
+    base = _padded(prefix)
+    buffers = {}
+    for name, (typecode, itemsize, offset, nbytes) in header["buffers"].items():
+        if struct.calcsize(typecode) != itemsize:
+            return None
+        start = base + offset
+        buffers[name] = view[start : start + nbytes].cast(typecode)
+
+    store = ConferenceStore()
+    for name in ARRAY_COLUMNS:
+        setattr(store, name, buffers[name])
+    for name in STRING_COLUMNS:
+        column = PackedStrings(
+            buffers[f"{name}.blob"], buffers[f"{name}.offsets"], name in header["nullable"]
+        )
+        setattr(store, name, column)
+    store.cities = StringPool(header["cities"])
+    store.countries = StringPool(header["countries"])
+    store.tag_names = StringPool(header["tag_names"])
+    store.sections = StringPool(header["sections"])
+    store.source_hash = header["source_hash"]
+    store.iso_dates = {ts: iso for ts, iso in header["iso_dates"]}
+    store.index = ConferenceIndex(
+        store,
+        by_country=PostingLists(
+            buffers["index.by_country.offsets"], buffers["index.by_country.ids"]
+        ),
+        tag_sets=buffers["index.tag_sets"],
+        by_tag_set=PostingLists(
+            buffers["index.by_tag_set.offsets"], buffers["index.by_tag_set.ids"]
+        ),
+        cfp_rows=buffers["index.cfp_rows"],
+        cfp_deadlines=buffers["index.cfp_deadlines"],
+        max_duration=header["max_duration"],
+        text=TextIndex(
+            grams=buffers["index.text.grams"],
+            gram_words=PostingLists(
+                buffers["index.text.gram_words.offsets"], buffers["index.text.gram_words.ids"]
+            ),
+            word_grams=buffers["index.text.word_grams"],
+            word_rows=PostingLists(
+                buffers["index.text.word_rows.offsets"], buffers["index.text.word_rows.ids"]
+            ),
+            row_count=header["rows"],
+        ),
+        geo=GeoIndex(
+            points=buffers["index.geo.points"],
+            axes=buffers["index.geo.axes"],
+            latitudes=buffers["index.geo.latitudes"],
+            longitudes=buffers["index.geo.longitudes"],
+            place_rows=PostingLists(
+                buffers["index.geo.place_rows.offsets"], buffers["index.geo.place_rows.ids"]
+            ),
+        ),
+    )
+    return store, header
+
+
+@contextmanager
+def atomic_file(path: Path) -> Iterator[IO[bytes]]:
+    """Write a file under a temporary name and move it to path once complete."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+@contextmanager
+def _locked(path: Path, timeout: float = _LOCK_TIMEOUT) -> Iterator[None]:
+    """
+    Hold a lock file, created exclusively, while the block runs.
+
+    A lock file older than timeout was left by a crashed process and is taken over.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                stale = time.time() - path.stat().st_mtime > timeout
+            except FileNotFoundError:
+                continue
+            if stale:
+                logger.warning("Removing stale lock file %s", path)
+                path.unlink(missing_ok=True)
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Lock file {path} still held after {timeout:g} s") from None
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _typecode(buffer: Any) -> str:
+    if isinstance(buffer, array):
+        return buffer.typecode
+    if isinstance(buffer, memoryview):
+        return buffer.format
+    return "B"
+
+
+def _nullable(column: Any) -> bool:
+    if isinstance(column, PackedStrings):
+        return column.nullable
+    return any(value is None for value in column)
+
+
+def _padded(size: int) -> int:
+    return -(-size // _ALIGN) * _ALIGN
+
+
+if __name__ == "__main__":
+    # Build (or refresh) and publish the snapshot ahead of time, e.g. while building a
+    # container image. With CFP_WATCH_INTERVAL set, keep running and publish a new
+    # generation at each change of the README, for servers run with CFP_SNAPSHOT_ATTACH.
+    import threading
+
+    try:
+        from .markdown_parser import WATCH_INTERVAL, MarkdownParserService
+    except ImportError:
+        from markdown_parser import WATCH_INTERVAL, MarkdownParserService
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    data_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    service = MarkdownParserService(data_dir, attach=False)
+    print(json.dumps(service.startup_report, indent=2))
+    if WATCH_INTERVAL:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
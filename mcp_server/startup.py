@@ -0,0 +1,229 @@
+"""Startup of the servers: agenda loading, deferred registrations, readiness and profile."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+from fastmcp import FastMCP
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+try:
+    from .conference_store import ConferenceStore
+    from .markdown_parser import MarkdownParserService
+    from .metrics import OPERATION_DURATION
+except ImportError:
+    from conference_store import ConferenceStore
+    from markdown_parser import MarkdownParserService
+    from metrics import OPERATION_DURATION
+
+logger = logging.getLogger(__name__)
+
+# When the agenda is loaded: "eager" (while importing the server module), "background" (in a
+# thread as soon as the server starts, tools wait for it) or "lazy" (at the first tool call)
+STARTUP_MODES = ("eager", "background", "lazy")
+STARTUP_MODE = os.environ.get("CFP_STARTUP", "eager")
+
+READY_PATH = "/ready"
+
+
+class AgendaLoader:
+    """
+    MarkdownParserService built once, on first use, by whichever thread asks first.
+
+    get_conferences() blocks until the agenda is loaded. The tools await conferences()
+    instead, which loads it in a worker thread and leaves the event loop serving.
+    """
+
+    def __init__(self, factory: Callable[[], MarkdownParserService] = MarkdownParserService,
+                 on_load: Callable[[MarkdownParserService, float], None] | None = None):
+        """
+        Args:
+            factory: Builds the service, reading the agenda or its snapshot
+            on_load: Called with the service and the seconds it took to build
+        """
+        self.loaded = threading.Event()
+        self._factory = factory
+        self._on_load = on_load
+        self._service: MarkdownParserService | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> MarkdownParserService:
+        """Return the service, building it if needed."""
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    start = time.perf_counter()
+                    service = self._factory()
+                    seconds = time.perf_counter() - start
+                    OPERATION_DURATION.observe(seconds, operation="agenda_load")
+                    self._service = service
+                    self.loaded.set()
+                    if self._on_load is not None:
+                        self._on_load(service, seconds)
+        return self._service
+
+    def get_conferences(self) -> ConferenceStore:
+        return self.load().get_conferences()
+
+    async def conferences(self) -> ConferenceStore:
+        """Return the conferences, loading the agenda off the event loop the first time."""
+        if not self.loaded.is_set():
+            await asyncio.to_thread(self.load)
+        return self.get_conferences()
+
+    def warm_up(self) -> None:
+        """Load the agenda in a background thread."""
+        if not self.loaded.is_set():
+            threading.Thread(target=self._warm_up, name="agenda-warm-up", daemon=True).start()
+
+    def _warm_up(self) -> None:
+        try:
+            self.load()
+        except Exception:
+            logger.exception("Unable to load the agenda, retrying at the first tool call")
+
+
+class Startup:
+    """
+    Startup of a server module, and its profile.
+
+    Create it right after the imports of the server module and pass its lifespan to
+    FastMCP. The agenda is loaded according to mode (see STARTUP_MODES). Registrations
+    deferred with defer() run when the server starts, before it serves a request.
+
+    The profile breaks the cold start down, in ms since the process started: the end of
+    the imports, of the deferred registrations, of the agenda loading (with its duration
+    and source) and the first request served. The server is ready once started and, in
+    background mode, once the agenda is loaded; the profile is logged then and served
+    with the readiness on READY_PATH (503 until ready).
+    """
+
+    def __init__(self, mode: str = STARTUP_MODE):
+        if mode not in STARTUP_MODES:
+            raise ValueError(
+                f"Unknown startup mode {mode!r}, available modes: {', '.join(STARTUP_MODES)}"
+            )
+        self.mode = mode
+        self.agenda: AgendaLoader | None = None
+        self.profile: dict[str, Any] = {"mode": mode}
+        self._deferred: list[Callable[[], None]] = []
+        self._started = False
+        self._lock = threading.Lock()
+
+        age = _process_age()
+        # Origin of the profile: the start of the process, else the end of the imports
+        self._origin = time.perf_counter() - (age or 0.0)
+        self.profile["imports_ms"] = None if age is None else round(age * 1000, 1)
+
+    def load_agenda(self, factory: Callable[[], MarkdownParserService] = MarkdownParserService
+                    ) -> AgendaLoader:
+        """Return the loader of the agenda, loaded right away in eager mode."""
+        self.agenda = AgendaLoader(factory, self._agenda_loaded)
+        if self.mode == "eager":
+            self.agenda.load()
+        return self.agenda
+
+    def defer(self, register: Callable[[], None]) -> Callable[[], None]:
+        """Run register when the server starts instead of at import (usable as a decorator)."""
+        self._deferred.append(register)
+        return register
+
+    def install(self, mcp: FastMCP, path: str = READY_PATH) -> None:
+        """Serve the readiness on path and record the first request served."""
+        mcp.add_middleware(_FirstRequestMiddleware(self))
+
+        @mcp.custom_route(path, methods=["GET"], include_in_schema=False)
+        async def ready(request: Request) -> JSONResponse:
+            return JSONResponse(
+                {"ready": self.ready, "startup": self.profile},
+                status_code=200 if self.ready else 503,
+            )
+
+    @asynccontextmanager
+    async def lifespan(self, server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+        """FastMCP lifespan starting the server."""
+        self.start()
+        yield {}
+
+    def start(self) -> None:
+        """Run the deferred registrations and, in background mode, start loading the agenda."""
+        with self._lock:
+            if self._started:
+                return
+            start = time.perf_counter()
+            for register in self._deferred:
+                register()
+            self.profile["deferred_ms"] = _ms(time.perf_counter() - start)
+            self._mark("started")
+            self._started = True
+        if self.mode == "background" and self.agenda is not None:
+            self.agenda.warm_up()
+        self._check_ready()
+
+    @property
+    def ready(self) -> bool:
+        """True once the server serves requests without waiting for the agenda (lazy mode aside)."""
+        return self._started and (
+            self.mode == "lazy" or self.agenda is None or self.agenda.loaded.is_set()
+        )
+
+    def _agenda_loaded(self, service: MarkdownParserService, seconds: float) -> None:
+        self.profile["agenda_load_ms"] = _ms(seconds)
+        self.profile["agenda"] = {
+            key: service.startup_report[key]
+            for key in ("source", "conferences", "parse_ms", "load_ms")
+            if key in service.startup_report
+        }
+        self._mark("agenda_loaded")
+        self._check_ready()
+
+    def _request_served(self, method: str) -> None:
+        if "first_request_ms" not in self.profile:
+            self._mark("first_request")
+            self.profile["first_request"] = method
+            logger.info("First request (%s) served %.1f ms after the start of the process",
+                        method, self.profile["first_request_ms"])
+
+    def _check_ready(self) -> None:
+        with self._lock:
+            if not self.ready or "ready_ms" in self.profile:
+                return
+            self._mark("ready")
+        logger.info("Ready to serve: %s", self.profile)
+
+    def _mark(self, event: str) -> None:
+        self.profile[f"{event}_ms"] = _ms(time.perf_counter() - self._origin)
+
+
+class _FirstRequestMiddleware(Middleware):
+    def __init__(self, startup: Startup):
+        self.startup = startup
+
+    async def on_request(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        result = await call_next(context)
+        self.startup._request_served(context.method or "")
+        return result
+
+
+def _process_age() -> float | None:
+    """Seconds since the process started, None where /proc is not available."""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            # starttime is the 22nd field, in clock ticks since boot; the command name
+            # (2nd field) may hold spaces, so fields are counted after its closing parenthesis
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf("SC_CLK_TCK"), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
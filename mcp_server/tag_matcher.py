@@ -0,0 +1,166 @@
+"""Keyword-based tagging of conference names with a single compiled pattern."""
+
+import hashlib
+import json
+import re
+from typing import Iterable, Mapping
+
+try:
+    from .conference_store import MAX_TAGS
+except ImportError:
+    from conference_store import MAX_TAGS
+
+# Keyword boundary modes:
+#   "none"  - keywords match anywhere in the name ("js" matches "Django.js" and "Majs")
+#   "start" - keywords match at the start of a word ("js" matches "JSConf", not "Majs")
+#   "word"  - keywords match whole words only ("js" matches "JS Days", not "JSConf")
+BOUNDARIES = ("none", "start", "word")
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class TagMatcher:
+    """
+    Assigns tags to conference names from a keyword-to-tag map.
+
+    All keywords are compiled into one trie-shaped alternation scanned once per name.
+    The scan runs inside a lookahead so that overlapping keywords are all found, and
+    each found keyword maps to a precomputed tag bitmask that also covers the shorter
+    keywords matching at the same position. Tag names and keywords are
+    case-insensitive.
+    """
+
+    __slots__ = ("tag_names", "boundary", "fingerprint", "_pattern", "_masks", "_tags")
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]], boundary: str = "start"):
+        """
+        Args:
+            keywords: Keywords of each tag, tags in the order they are reported
+            boundary: Keyword boundary mode, one of BOUNDARIES
+
+        Raises:
+            ValueError: If the boundary mode is unknown or there are too many tags
+        """
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Unknown boundary mode {boundary!r} (expected one of {BOUNDARIES})")
+
+        tag_keywords: dict[str, set[str]] = {}
+        for tag, tag_words in keywords.items():
+            words = tag_keywords.setdefault(tag.strip().lower(), set())
+            words.update(word.lower() for word in tag_words if word.strip())
+        if len(tag_keywords) > MAX_TAGS:
+            raise ValueError(f"Too many tags (maximum is {MAX_TAGS})")
+
+        self.tag_names = tuple(tag_keywords)
+        self.boundary = boundary
+        self.fingerprint = hashlib.sha256(
+            json.dumps(
+                [boundary, [[tag, sorted(words)] for tag, words in tag_keywords.items()]]
+            ).encode("utf-8")
+        ).hexdigest()
+
+        # Bits of the tags each keyword belongs to
+        keyword_masks: dict[str, int] = {}
+        for bit, words in enumerate(tag_keywords.values()):
+            for word in words:
+                keyword_masks[word] = keyword_masks.get(word, 0) | 1 << bit
+
+        # The scan reports the longest keyword matching at a position; every other
+        # keyword matching there is one of its prefixes
+        self._masks = {
+            word: _fold_prefixes(word, keyword_masks, boundary) for word in keyword_masks
+        }
+        self._pattern = _compile(keyword_masks, boundary)
+        self._tags: dict[int, tuple[str, ...]] = {0: ()}
+
+    def mask(self, name: str) -> int:
+        """Return the tag bitmask of a conference name."""
+        if self._pattern is None:
+            return 0
+        mask = 0
+        masks = self._masks
+        for word in self._pattern.findall(name.lower()):
+            mask |= masks[word]
+        return mask
+
+    def tags(self, name: str) -> tuple[str, ...]:
+        """Return the tags of a conference name, in tag order."""
+        # Same as tag_list(mask(name)), inlined as it runs for every parsed entry
+        if self._pattern is None:
+            return ()
+        mask = 0
+        masks = self._masks
+        for word in self._pattern.findall(name.lower()):
+            mask |= masks[word]
+        tags = self._tags.get(mask)
+        return tags if tags is not None else self.tag_list(mask)
+
+    def tag_list(self, mask: int) -> tuple[str, ...]:
+        """Convert a tag bitmask to tag names."""
+        tags = self._tags.get(mask)
+        if tags is None:
+            tags = self._tags[mask] = tuple(
+                tag for bit, tag in enumerate(self.tag_names) if mask >> bit & 1
+            )
+        return tags
+
+
+def _fold_prefixes(word: str, keyword_masks: dict[str, int], boundary: str) -> int:
+    """Combine the masks of a keyword and of the keywords matching wherever it matches."""
+    mask = 0
+    for end in range(1, len(word) + 1):
+        prefix_mask = keyword_masks.get(word[:end])
+        if prefix_mask is None:
+            continue
+        # In "word" mode a prefix ending inside a word of the keyword does not match
+        if (
+            boundary == "word"
+            and end < len(word)
+            and _is_word_char(word[end - 1])
+            and _is_word_char(word[end])
+        ):
+            continue
+        mask |= prefix_mask
+    return mask
+
+
+def _compile(words: Iterable[str], boundary: str) -> re.Pattern[str] | None:
+    """Compile keywords into a lookahead pattern capturing the longest keyword at each position."""
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    if not trie:
+        return None
+
+    def emit(node: dict[str, dict], last: str) -> str:
+        # Longer keywords are tried first: children come before the end of a keyword
+        branches = [
+            re.escape(char) + emit(child, char) for char, child in sorted(node.items()) if char
+        ]
+        if "" in node:
+            branches.append(r"\b" if boundary == "word" and _is_word_char(last) else "")
+        return branches[0] if len(branches) == 1 else "(?:%s)" % "|".join(branches)
+
+    # Next to a word character, \b is a cheaper equivalent of (?<!\w) and (?!\w)
+    word_roots = []
+    other_roots = []
+    for char, child in sorted(trie.items()):
+        root = re.escape(char) + emit(child, char)
+        if boundary != "none" and _is_word_char(char):
+            word_roots.append(root)
+        else:
+            other_roots.append(root)
+    roots = other_roots
+    if word_roots:
+        roots = [r"\b(?:%s)" % "|".join(word_roots), *other_roots]
+
+    # The character class lets the scan skip positions where no keyword can start
+    first_chars = re.escape("".join(sorted(trie)))
+    return re.compile("(?=[%s])(?=(%s))" % (first_chars, "|".join(roots)))
+
+
+def _is_word_char(char: str) -> bool:
+    return _WORD_CHAR.match(char) is not None
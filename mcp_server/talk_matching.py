@@ -0,0 +1,427 @@
+"""Matching of conferences with a talk through LLM sampling, in concurrent batches."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Sequence
+
+from fastmcp.server.context import Context
+from mcp.shared.exceptions import McpError
+
+try:
+    from .metrics import OPERATION_DURATION
+    from .sampling_cache import SamplingCache, sampling_key
+except ImportError:
+    from metrics import OPERATION_DURATION
+    from sampling_cache import SamplingCache, sampling_key
+
+logger = logging.getLogger(__name__)
+
+# Conferences sent in one sampling request, and sampling requests running at once
+SAMPLING_BATCH_SIZE = int(os.environ.get("CFP_SAMPLING_BATCH_SIZE", "40"))
+SAMPLING_CONCURRENCY = int(os.environ.get("CFP_SAMPLING_CONCURRENCY", "4"))
+
+# Matches scoring lower are dropped
+MIN_MATCH_SCORE = 30
+
+SAMPLING_TEMPERATURE = 0.3
+
+# How the user picks the conferences to apply to:
+#   "batch"    - one multi-select elicitation listing every match, best first
+#   "per_item" - one yes/no elicitation per match
+ELICITATION_MODES = ("batch", "per_item")
+ELICITATION_MODE = os.environ.get("CFP_ELICITATION_MODE", "batch")
+
+# Output budget of a batch: a match takes about 40 tokens, the rest is margin so
+# that a batch where every conference matches still fits
+BASE_MAX_TOKENS = 200
+TOKENS_PER_CONFERENCE = 60
+
+MATCH_PROMPT = """Analyze which conferences match this talk topic: "{talk_title}"
+
+talk excerpt:
+{talk_excerpt}
+
+Available conferences (one JSON object per line):
+{conferences}
+
+For each conference, evaluate the match based on:
+- The conference's tags/themes
+- The conference name and theme
+- Relevance to the talk topic
+
+Respond ONLY with valid JSON (no markdown, no code blocks):
+{{
+  "matches": [
+    {{
+      "name": "exact conference name from the list",
+      "score": 0-100,
+      "reasoning": "brief explanation in English (max 1 sentence)"
+    }}
+  ]
+}}
+
+Important:
+- Only include conferences with score >= {min_score}
+- Be strict about tag relevance
+- Consider broad themes (e.g., "AI" matches "machine learning", "data science")"""
+
+
+def build_match_prompt(talk_title: str, talk_excerpt: str,
+                       conferences: Sequence[dict[str, Any]]) -> str:
+    """Build the sampling prompt scoring a batch of conference summaries against a talk."""
+    return MATCH_PROMPT.format(
+        talk_title=talk_title,
+        talk_excerpt=talk_excerpt,
+        conferences="\n".join(
+            json.dumps(conference, ensure_ascii=False) for conference in conferences
+        ),
+        min_score=MIN_MATCH_SCORE,
+    )
+
+
+class MatchStreamParser:
+    """
+    Incremental parser of a {"matches": [...]} sampling response.
+
+    Text is fed as it arrives and each match object is returned as soon as it is
+    complete. Text before the "matches" key (such as a code block opening) is skipped,
+    and so are commas or their absence between matches. Text that never forms a
+    complete match (a truncated or malformed tail) only loses the matches it holds.
+
+    Once all the text is fed, ``started`` tells whether the matches list was found
+    and ``complete`` whether it was closed: a list started but not complete was cut
+    short. Sampling responses arrive whole, so stream_matches feeds each one at once
+    and relies on the parser to keep the matches before a cut and to tell a response
+    cut short from one without a matches list.
+    """
+
+    _KEY = '"matches"'
+
+    def __init__(self) -> None:
+        self.started = False
+        self.complete = False
+        self._buffer = ""
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text: str) -> list[Any]:
+        """Add text to the response and return the matches it completed."""
+        self._buffer += text
+        if not self.started:
+            key = self._buffer.find(self._KEY)
+            start = self._buffer.find("[", key) if key >= 0 else -1
+            if start < 0:
+                # Keep what may be the start of the key
+                if key < 0:
+                    self._buffer = self._buffer[-len(self._KEY) :]
+                return []
+            self._buffer = self._buffer[start + 1 :]
+            self.started = True
+
+        matches = []
+        pos = 0
+        buffer = self._buffer
+        while not self.complete:
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.complete = True
+                pos += 1
+                break
+            try:
+                match, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Incomplete for now, or malformed for good
+                break
+            matches.append(match)
+        self._buffer = buffer[pos:]
+        return matches
+
+
+def _valid_matches(matches: Sequence[Any],
+                   conferences: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    names = {conference["name"] for conference in conferences}
+    valid = []
+    for match in matches:
+        if not isinstance(match, dict) or match.get("name") not in names:
+            continue
+        try:
+            score = float(match.get("score", 0))
+        except (TypeError, ValueError):
+            continue
+        if score.is_integer():
+            score = int(score)
+        if score >= MIN_MATCH_SCORE:
+            valid.append(
+                {"name": match["name"], "score": score, "reasoning": match.get("reasoning", "")}
+            )
+    return valid
+
+
+def merge_matches(batches: Sequence[list[dict[str, Any]]],
+                  conferences: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge the matches of all batches, best score first, then in conference order."""
+    order = {conference["name"]: i for i, conference in reversed(list(enumerate(conferences)))}
+    best: dict[str, dict[str, Any]] = {}
+    for matches in batches:
+        for match in matches:
+            previous = best.get(match["name"])
+            if previous is None or match["score"] > previous["score"]:
+                best[match["name"]] = match
+    return sorted(best.values(), key=lambda match: (-match["score"], order[match["name"]]))
+
+
+async def stream_matches(
+    ctx: Context,
+    talk_title: str,
+    talk_excerpt: str,
+    conferences: Sequence[dict[str, Any]],
+    batch_size: int = SAMPLING_BATCH_SIZE,
+    concurrency: int = SAMPLING_CONCURRENCY,
+    cache: SamplingCache | None = None,
+    use_cache: bool = True,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Score conferences against a talk with concurrent sampling requests, yielding the
+    matches of each request as soon as it completes.
+
+    Conferences are split into batches of at most batch_size, each scored by its own
+    sampling request with an output budget sized for the batch; at most concurrency
+    requests run at once, and keep running while the caller handles the matches
+    already yielded. When a response is cut short (the client reports that it hit the
+    token limit, or the text ends inside the matches list), the matches before the cut
+    are kept and the other conferences of the batch are sampled again, in two halves if
+    no match could be read. A response without a matches list, such as an error or a
+    refusal from the client, fails the whole call instead: the user is not asked again
+    for every part of the batch.
+
+    With a cache, the matches of the same talk, conferences and sampling parameters
+    are yielded at once without sampling; results where a conference had to be
+    dropped are not cached.
+
+    Args:
+        ctx: Context of the tool call, used to sample the client LLM
+        talk_title: Title of the talk
+        talk_excerpt: First lines of the talk
+        conferences: Conference summaries ({"name", "tags", "location"})
+        batch_size: Maximum number of conferences per sampling request
+        concurrency: Maximum number of sampling requests running at once
+        cache: Optional cache of the merged matches
+        use_cache: If False, sample again even if the cache holds the matches, and
+            replace them
+
+    Yields:
+        Matches ({"name", "score", "reasoning"}) of a sampling request, best score first
+
+    Raises:
+        ValueError: If a sampling response holds no matches list and was not cut short
+    """
+    batch_size = max(1, batch_size)
+    key = None
+    if cache is not None:
+        key = sampling_key(
+            f"{talk_title}\n{talk_excerpt}",
+            conferences,
+            {
+                "prompt": hashlib.sha256(MATCH_PROMPT.encode("utf-8")).hexdigest(),
+                "min_score": MIN_MATCH_SCORE,
+                "temperature": SAMPLING_TEMPERATURE,
+                "batch_size": batch_size,
+                "max_tokens": [BASE_MAX_TOKENS, TOKENS_PER_CONFERENCE],
+            },
+        )
+        if use_cache:
+            matches = cache.get(key)
+            if matches is not None:
+                yield matches
+                return
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: asyncio.Queue[list[dict[str, Any]] | Exception] = asyncio.Queue()
+    tasks: set[asyncio.Task[None]] = set()
+    complete = True
+
+    def submit(batch: Sequence[dict[str, Any]]) -> None:
+        tasks.add(asyncio.create_task(sample_batch(batch)))
+
+    async def sample_batch(batch: Sequence[dict[str, Any]]) -> None:
+        nonlocal complete
+        try:
+            async with semaphore:
+                with OPERATION_DURATION.time(operation="sample"):
+                    step = await ctx.sample_step(
+                        messages=build_match_prompt(talk_title, talk_excerpt, batch),
+                        temperature=SAMPLING_TEMPERATURE,
+                        max_tokens=BASE_MAX_TOKENS + TOKENS_PER_CONFERENCE * len(batch),
+                    )
+            text = step.text or ""
+            parser = MatchStreamParser()
+            matches = _valid_matches(parser.feed(text), batch)
+            truncated = step.response.stopReason == "maxTokens" or (
+                parser.started and not parser.complete
+            )
+            if not parser.complete and not truncated:
+                raise ValueError(_failure(text))
+            if not parser.complete:
+                # Retries are submitted before this batch reports, so that the stream
+                # never looks finished while they run
+                matched = {match["name"] for match in matches}
+                rest = [conference for conference in batch if conference["name"] not in matched]
+                if matches and rest:
+                    logger.info("Truncated sampling response, sampling %d of %d conferences "
+                                "again", len(rest), len(batch))
+                    submit(rest)
+                elif len(rest) > 1:
+                    logger.info("Truncated sampling response without matches for %d "
+                                "conferences, splitting the batch", len(rest))
+                    submit(rest[: len(rest) // 2])
+                    submit(rest[len(rest) // 2 :])
+                elif rest:
+                    complete = False
+                    logger.warning("Dropping conference %r, truncated sampling response",
+                                   rest[0]["name"])
+            results.put_nowait(merge_matches([matches], batch))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The batches still waiting for their turn are not sampled: a refusal would
+            # otherwise be asked again for each of them
+            for task in tasks:
+                if task is not asyncio.current_task():
+                    task.cancel()
+            results.put_nowait(e)
+
+    for i in range(0, len(conferences), batch_size):
+        submit(conferences[i : i + batch_size])
+
+    batches = []
+    try:
+        reported = 0
+        while reported < len(tasks):
+            result = await results.get()
+            reported += 1
+            if isinstance(result, Exception):
+                raise result
+            batches.append(result)
+            if result:
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if key is not None and complete:
+        cache.put(key, merge_matches(batches, conferences))
+
+
+def _failure(text: str) -> str:
+    """Describe a sampling response holding no matches list."""
+    try:
+        response = json.loads(text)
+    except ValueError:
+        response = None
+    if isinstance(response, dict) and response.get("error"):
+        return f"Sampling failed: {response['error']}"
+    if not text.strip():
+        return "Sampling failed: empty response"
+    excerpt = text if len(text) <= 200 else text[:200] + "..."
+    return f"Sampling response holds no matches list: {excerpt}"
+
+
+async def match_and_elicit(
+    ctx: Context,
+    talk_title: str,
+    talk_excerpt: str,
+    conferences: Sequence[dict[str, Any]],
+    mode: str = ELICITATION_MODE,
+    **sampling: Any,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    Score conferences against a talk and ask the user which ones to apply to.
+
+    In "per_item" mode the user is asked about the matches of each sampling request
+    as soon as it completes, while the other requests keep running, so the first
+    question comes after the first request rather than after all of them. In "batch"
+    mode the matches of all the requests are merged first, so that a single
+    multi-select elicitation lists every match, best first. Clients that fail it,
+    e.g. without support for enum array schemas, are asked again with the "per_item"
+    yes/no elicitations.
+
+    Args:
+        ctx: Context of the tool call
+        talk_title: Title of the talk
+        talk_excerpt: First lines of the talk
+        conferences: Conference summaries ({"name", "tags", "location"})
+        mode: One of ELICITATION_MODES
+        sampling: Other stream_matches arguments
+
+    Returns:
+        All the matches, best score first, and the names of the conferences the user
+        accepted, in the order they were asked
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in ELICITATION_MODES:
+        raise ValueError(f"Unknown elicitation mode {mode!r} (expected one of {ELICITATION_MODES})")
+
+    batches = []
+    applied = []
+    asked: set[str] = set()
+    async for matches in stream_matches(ctx, talk_title, talk_excerpt, conferences, **sampling):
+        batches.append(matches)
+        if mode == "per_item":
+            new = [match for match in matches if match["name"] not in asked]
+            asked.update(match["name"] for match in new)
+            applied += await _elicit_each(ctx, talk_title, new)
+
+    matches = merge_matches(batches, conferences)
+    if mode == "batch" and matches:
+        try:
+            return matches, await _elicit_batch(ctx, talk_title, matches)
+        except (McpError, ValueError) as e:
+            logger.info("Multi-select elicitation failed, asking for each conference: %s", e)
+            applied = await _elicit_each(ctx, talk_title, matches)
+    return matches, applied
+
+
+async def _elicit_batch(ctx: Context, talk_title: str,
+                        matches: Sequence[dict[str, Any]]) -> list[str]:
+    options = {}
+    for match in matches:
+        title = f"{match['name']} ({match['score']}/100)"
+        if match.get("reasoning"):
+            title += f" - {match['reasoning']}"
+        options[match["name"]] = {"title": title}
+
+    with OPERATION_DURATION.time(operation="elicit"):
+        result = await ctx.elicit(
+            f"Select the conferences whose CFP you want to apply to with your talk "
+            f"'{talk_title}'",
+            response_type=[options],
+        )
+    if result.action != "accept":
+        return []
+    if not isinstance(result.data, list):
+        raise ValueError(f"Expected a list of conferences, got {result.data!r}")
+    selected = set(result.data)
+    return [name for name in options if name in selected]
+
+
+async def _elicit_each(ctx: Context, talk_title: str,
+                       matches: Sequence[dict[str, Any]]) -> list[str]:
+    applied = []
+    for match in matches:
+        name = match.get("name", "Unknown")
+        with OPERATION_DURATION.time(operation="elicit"):
+            result = await ctx.elicit(
+                f"Do you want to apply to the CFP for the conference '{name}' "
+                f"with your talk '{talk_title}'?",
+                response_type=None,
+            )
+        if result.action == "accept":
+            applied.append(name)
+    return applied
@@ -1,24 +1,77 @@
-import copy
+import base64
+import binascii
+import hashlib
+import json
+import os
 from datetime import date, datetime
+from array import array
+from bisect import bisect_right
+from itertools import islice
 from pathlib import Path
-from typing import Any, Optional
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Sequence
+from dataclasses import dataclass, fields as dataclass_fields
+
+try:
+    from .conference_index import text_words
+    from .gazetteer import default_gazetteer
+    from .metrics import FILTER_RESULTS, OPERATION_DURATION
+except ImportError:
+    from conference_index import text_words
+    from gazetteer import default_gazetteer
+    from metrics import FILTER_RESULTS, OPERATION_DURATION
+
+if TYPE_CHECKING:
+    from .conference_store import ConferenceStore
+    from .query_cache import QueryCache
 
 TALKS_DIR = Path(__file__).parent  / "talks"
+CACHE_DIR = Path(os.environ.get("CFP_CACHE_DIR", Path.home() / ".cache" / "prez-mcp"))
+
+@dataclass(frozen=True, slots=True)
+class ConferenceDates:
+    beginning: Optional[str]  # 'YYYY-MM-DD'
+    end: Optional[str]  # 'YYYY-MM-DD'
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class ConferenceCfp:
+    link: str
+    untilDate: Optional[str]  # 'YYYY-MM-DD'
+
+@dataclass(frozen=True, slots=True)
 class Conference:
+    """Immutable row view over a ConferenceStore."""
     name: str
-    date: dict[str, Optional[str]]  # {'beginning': 'YYYY-MM-DD', 'end': 'YYYY-MM-DD'}
+    date: ConferenceDates
     location: Optional[str]
     country: Optional[str]
     city: Optional[str]
-    tags: list[str]
-    cfp: Optional[dict[str, Optional[str]]]  # {'until': 'YYYY-MM-DD', ...}
+    tags: tuple[str, ...]
+    cfp: Optional[ConferenceCfp]
     hyperlink: Optional[str]
 
-async def apply_filter(conferences: list[dict[str, Any]], cfp_open: bool | None, country: str | None,
-                       max_date: date | None, min_date: date | None, tags: str | None) -> list[Conference]:
+CONFERENCE_FIELDS = tuple(field.name for field in dataclass_fields(Conference))
+
+# Number of conferences returned per page by search_page
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Radius of a search near a place when none is given, in km
+DEFAULT_RADIUS_KM = 100.0
+
+# Groups counted by facet_counts, and number of values returned per group
+FACETS = ("country", "month", "tag")
+DEFAULT_FACET_LIMIT = 20
+
+def resolve_filters(conferences: "ConferenceStore", cfp_open: bool | None, country: str | None,
+                    max_date: date | None, min_date: date | None,
+                    tags: str | None, near: str | None = None,
+                    radius_km: float = DEFAULT_RADIUS_KM) -> dict[str, Any]:
+    """
+    Convert search filters to ``ConferenceIndex.scan`` arguments.
+
+    Raises:
+        ValueError: When the place of ``near`` is not in the gazetteer
+    """
     # Parse date filters if provided
     min_ts = None
     max_ts = None
@@ -28,90 +81,275 @@ async def apply_filter(conferences: list[dict[str, Any]], cfp_open: bool | None,
         max_ts = int(datetime.combine(max_date, datetime.max.time()).timestamp())
 
     # Parse tags filter if provided
-    tag_filters = []
+    tag_mask = None
     if tags:
-        tag_filters = [tag.strip().lower() for tag in tags.split(",")]
+        tag_mask = conferences.tag_mask(tag.strip() for tag in tags.split(","))
+
+    # Resolve the country filter against the interned country names
+    country_codes = None
+    if country:
+        # A blank country names no country: it matches nothing rather than everything
+        needle = country.strip()
+        country_codes = frozenset(conferences.countries.search(needle) if needle else ())
+
+    # Resolve the place of a radius search against the bundled gazetteer
+    point = None
+    if near:
+        coordinates = default_gazetteer().resolve(near)
+        if coordinates is None:
+            raise ValueError(
+                f"Unknown location {near!r}, give a city ('Lyon', 'Portland, USA') "
+                "or coordinates ('45.76, 4.84')"
+            )
+        point = (*coordinates, float(radius_km))
 
     # Get current timestamp for CFP filtering
     current_ts = int(datetime.now().timestamp())
 
-    # Filter conferences
-    results = []
-    for conf in conferences:
-        # Apply CFP open filter
-        if cfp_open:
-            cfp = conf.get("cfp")
-            if not cfp:
-                # No CFP information, skip this conference
-                continue
-            cfp_deadline = cfp.get("untilDate")
-            if not cfp_deadline or cfp_deadline < current_ts:
-                # CFP is closed or no deadline, skip this conference
-                continue
-
-        # Apply country filter
-        if country:
-            conf_country = conf.get("country", "").lower()
-            if country.lower() not in conf_country:
-                continue
-
-        # Apply tags filter
-        if tag_filters:
-            conf_tags = [tag.lower() for tag in conf.get("tags", [])]
-            # Check if any of the requested tags match
-            if not any(tag_filter in conf_tags for tag_filter in tag_filters):
-                continue
-
-        # Apply date filters
-        conf_dates = conf.get("date", {})
-        if min_ts is not None or max_ts is not None:
-            if not conf_dates:
-                continue
-
-            conf_start = conf_dates.get("beginning")
-            conf_end = conf_dates.get("end")
-
-            # Skip if dates are not timestamps (already formatted)
-            if not isinstance(conf_start, (int, float)) or not isinstance(conf_end, (int, float)):
-                continue
-
-            # Check if conference date range overlaps with filter range
-            if min_ts is not None and conf_end < min_ts:
-                continue
-            if max_ts is not None and conf_start > max_ts:
-                continue
-
-        # Create a copy and add formatted dates
-        conf_copy = copy.deepcopy(conf)
-        # Keep original timestamps for sorting
-        original_beginning = None
-        if conf_dates:
-            conf_start = conf_dates.get("beginning")
-            conf_end = conf_dates.get("end")
-            original_beginning = conf_start
-            # Add formatted dates to the existing date object
-            if conf_start:
-                conf_copy["date"]["beginning"] = datetime.fromtimestamp(conf_start).strftime(
-                    "%Y-%m-%d"
-                )
-            if conf_end:
-                conf_copy["date"]["end"] = datetime.fromtimestamp(conf_end).strftime("%Y-%m-%d")
-
-        # Store original timestamp for sorting
-        conf_copy["_sort_key"] = original_beginning if original_beginning else float("inf")
-
-        # Format CFP deadline if present
-        if conf_copy.get("cfp") and conf_copy["cfp"].get("untilDate"):
-            cfp_ts = conf_copy["cfp"]["untilDate"]
-            if cfp_ts:
-                conf_copy["cfp"]["untilDate"] = datetime.fromtimestamp(cfp_ts).strftime("%Y-%m-%d")
-
-        results.append(conf_copy)
-
-    # Sort by date (conferences without dates go to the end)
-    results.sort(key=lambda x: x.get("_sort_key", float("inf")))
-
-    # Remove sorting helper field
-    for conf in results:
-        conf.pop("_sort_key", None)
+    return {
+        "cfp_open_at": current_ts if cfp_open else None,
+        "country_codes": country_codes,
+        "tag_mask": tag_mask,
+        "min_ts": min_ts,
+        "max_ts": max_ts,
+        "near": point,
+    }
+
+def select_conferences(conferences: "ConferenceStore", cfp_open: bool | None, country: str | None,
+                       max_date: date | None, min_date: date | None, tags: str | None,
+                       after: int = -1, text: str | None = None, near: str | None = None,
+                       radius_km: float = DEFAULT_RADIUS_KM) -> Iterator[int]:
+    """
+    Lazily yield the ids of the matching rows in date order, starting after row ``after``.
+
+    With a ``text`` query, rows matching it come best match first instead, and ``after``
+    is not supported.
+    """
+    query = resolve_filters(
+        conferences, cfp_open, country, max_date, min_date, tags, near, radius_km
+    )
+    if text:
+        if after >= 0:
+            raise ValueError("Text searches cannot resume after a row")
+        return conferences.index.search(text, **query)
+    # Rows come back from the index already sorted by date
+    return conferences.index.scan(**query, after=after)
+
+async def apply_filter(conferences: "ConferenceStore", cfp_open: bool | None, country: str | None,
+                       max_date: date | None, min_date: date | None, tags: str | None,
+                       text: str | None = None, near: str | None = None,
+                       radius_km: float = DEFAULT_RADIUS_KM) -> list[Conference]:
+    with OPERATION_DURATION.time(operation="apply_filter"):
+        matches = select_conferences(
+            conferences, cfp_open, country, max_date, min_date, tags,
+            text=text, near=near, radius_km=radius_km,
+        )
+        results = [conferences.row(i) for i in matches]
+    FILTER_RESULTS.observe(len(results))
     return results
+
+async def search_page(conferences: "ConferenceStore", cfp_open: bool | None, country: str | None,
+                      max_date: date | None, min_date: date | None, tags: str | None,
+                      limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None,
+                      fields: str | None = None,
+                      cache: "QueryCache | None" = None,
+                      text: str | None = None, near: str | None = None,
+                      radius_km: float = DEFAULT_RADIUS_KM) -> dict[str, Any]:
+    """
+    Return one page of the conferences matching the filters.
+
+    Only the rows of the returned page are materialized: matching row ids are read
+    lazily from the index (or from the cache), one past the page to know whether
+    another page follows. Pages are in date order, or best match first with a text
+    query.
+
+    Args:
+        limit: Maximum number of conferences in the page (capped at MAX_PAGE_SIZE)
+        cursor: ``next_cursor`` of the previous page, obtained with the same filters
+        fields: Optional comma-separated subset of CONFERENCE_FIELDS to return
+        cache: Optional cache of the matching row ids, shared by all pages of a search
+            and by searches whose filters resolve to the same query
+        text: Optional fuzzy query on the words of the names, cities and countries
+        near: Optional place (city or "latitude, longitude") to search around
+        radius_km: Distance from ``near`` within which conferences are kept
+
+    Returns:
+        ``{"conferences": [...], "next_cursor": str | None}``
+
+    Raises:
+        ValueError: On unknown fields or places, or on a cursor that is malformed, was
+            issued for other filters or predates a reload of the agenda
+    """
+    projection = None
+    if fields:
+        projection = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in projection if field not in CONFERENCE_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields {unknown}, available fields: {', '.join(CONFERENCE_FIELDS)}"
+            )
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    words = " ".join(text_words(text)) if text else None
+    filters = _filters_key(
+        cfp_open, country, max_date, min_date, tags, words, near, radius_km
+    )
+    # The cursor holds the last row returned, or the number of rows returned for a
+    # text search, whose rows are not in row order
+    after = _decode_cursor(cursor, conferences.source_hash, filters) if cursor else -1
+
+    query = resolve_filters(
+        conferences, cfp_open, country, max_date, min_date, tags, near, radius_km
+    )
+    if words:
+        offset = after + 1
+        if cache is None:
+            matches = islice(conferences.index.search(words, **query), offset, None)
+        else:
+            matches = islice(_cached_rows(conferences, query, cache, words), offset, None)
+    elif cache is None:
+        matches = conferences.index.scan(**query, after=after)
+    else:
+        rows = _cached_rows(conferences, query, cache)
+        matches = islice(rows, bisect_right(rows, after), None)
+    page = list(islice(matches, limit + 1))
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last = after + limit if words else page[-1]
+        next_cursor = _encode_cursor(conferences.source_hash, filters, last)
+
+    rows = [conferences.row(i) for i in page]
+    if projection is not None:
+        rows = [{field: getattr(row, field) for field in projection} for row in rows]
+    return {"conferences": rows, "next_cursor": next_cursor}
+
+async def facet_counts(conferences: "ConferenceStore", cfp_open: bool | None,
+                       country: str | None, max_date: date | None, min_date: date | None,
+                       tags: str | None, facets: str | None = None,
+                       limit: int = DEFAULT_FACET_LIMIT, cache: "QueryCache | None" = None,
+                       text: str | None = None, near: str | None = None,
+                       radius_km: float = DEFAULT_RADIUS_KM) -> dict[str, Any]:
+    """
+    Count the conferences matching the filters, in total and per country, month and tag.
+
+    Rows are never materialized: without filters the counts come from the index, else
+    they are read from the columns of the matching row ids, which are shared through
+    the cache with the search_page calls for the same filters.
+
+    Args:
+        facets: Optional comma-separated subset of FACETS to count
+        limit: Number of values returned per country and tag facet, the most frequent
+            ones. Months are listed in chronological order: all the months within a date
+            filter, else the latest limit months
+
+    Returns:
+        ``{"total": int, "cfp_open": int, <facet>: {value: count}, "truncated": {<facet>:
+        number of values left out}}``
+
+    Raises:
+        ValueError: On unknown facets or places
+    """
+    selected = FACETS
+    if facets:
+        selected = [facet.strip() for facet in facets.split(",") if facet.strip()]
+        unknown = [facet for facet in selected if facet not in FACETS]
+        if unknown:
+            raise ValueError(f"Unknown facets {unknown}, available facets: {', '.join(FACETS)}")
+
+    with OPERATION_DURATION.time(operation="facets"):
+        query = resolve_filters(
+            conferences, cfp_open, country, max_date, min_date, tags, near, radius_km
+        )
+        words = " ".join(text_words(text)) if text else None
+        rows = None
+        if words:
+            # Text matches come best first, counting needs them in row order
+            rows = sorted(_cached_rows(conferences, query, cache, words) if cache is not None
+                          else conferences.index.search(words, **query))
+        elif any(value is not None for value in query.values()):
+            rows = (_cached_rows(conferences, query, cache) if cache is not None
+                    else array("I", conferences.index.scan(**query)))
+        counts = conferences.index.facets(rows, int(datetime.now().timestamp()))
+
+    labels = {
+        "country": lambda code: conferences.countries[code] or "unknown",
+        "tag": conferences.tag_names.values.__getitem__,
+        "month": str,
+    }
+    result: dict[str, Any] = {"total": counts["total"], "cfp_open": counts["cfp_open"]}
+    truncated = {}
+    for facet in selected:
+        if facet == "month":
+            # Months are picked by date rather than count, where ties would favour the
+            # oldest ones: a date filter already bounds them, else the latest are kept
+            values = sorted(counts[facet].items())
+            if min_date is None and max_date is None:
+                values = values[max(len(values) - limit, 0) :]
+        else:
+            values = counts[facet].most_common(limit)
+        result[facet] = {labels[facet](value): count for value, count in values}
+        if len(counts[facet]) > len(values):
+            truncated[facet] = len(counts[facet]) - len(values)
+    if truncated:
+        result["truncated"] = truncated
+    return result
+
+def _cached_rows(conferences: "ConferenceStore", query: dict[str, Any],
+                 cache: "QueryCache", words: str | None = None) -> Sequence[int]:
+    """
+    Return all the row ids matching a resolved query, computing them on a cache miss.
+
+    Rows are in row order, or best match first for the normalized words of a text query.
+    """
+    # Filters are keyed once resolved, so that "france" and "France" or reordered tags share
+    # an entry; the CFP reference time is left out, expiry takes care of it
+    key = (query["cfp_open_at"] is not None, query["country_codes"], query["tag_mask"],
+           query["min_ts"], query["max_ts"], query["near"], words)
+    rows = cache.get(conferences.source_hash, key)
+    if rows is None:
+        if words:
+            rows = array("I", conferences.index.search(words, **query))
+        else:
+            rows = array("I", conferences.index.scan(**query))
+        valid_until = None
+        if query["cfp_open_at"] is not None and rows:
+            # The result shrinks as soon as the first of its CFPs closes
+            valid_until = min(map(conferences.cfp_until.__getitem__, rows)) + 1
+        cache.put(conferences.source_hash, key, rows, valid_until)
+    return rows
+
+def _filters_key(cfp_open: bool | None, country: str | None, max_date: date | None,
+                 min_date: date | None, tags: str | None, words: str | None = None,
+                 near: str | None = None, radius_km: float = DEFAULT_RADIUS_KM) -> str:
+    """Digest of the normalized filters, so that a cursor only resumes the same search."""
+    normalized = [
+        bool(cfp_open),
+        country.strip().lower() if country else None,
+        max_date.isoformat() if max_date else None,
+        min_date.isoformat() if min_date else None,
+        sorted({tag.strip().lower() for tag in (tags or "").split(",") if tag.strip()}),
+    ]
+    if words:
+        normalized.append(words)
+    if near:
+        normalized.append([near.strip().lower(), float(radius_km)])
+    return hashlib.sha1(json.dumps(normalized).encode("utf-8")).hexdigest()[:12]
+
+def _encode_cursor(source_hash: str, filters: str, last_row: int) -> str:
+    # Row ids are only stable for one version of the agenda
+    payload = json.dumps([source_hash[:16], filters, last_row], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str, source_hash: str, filters: str) -> int:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        version, cursor_filters, last_row = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(last_row, int) or version != source_hash[:16] or cursor_filters != filters:
+        raise ValueError(
+            "Cursor is stale: the conference data was reloaded or the filters changed, "
+            "search again without a cursor"
+        )
+    return last_row
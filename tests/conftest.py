@@ -0,0 +1,64 @@
+"""Shared fixtures: agendas parsed in-process from temporary directories, local servers."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+import uvicorn
+
+from benchmarks.generate_agenda import generate_agenda
+from mcp_server.markdown_parser import MarkdownParserService
+
+
+def filter_args(query: dict | None = None, **fields) -> dict:
+    """Filter arguments of apply_filter, search_page and facet_counts, None unless given."""
+    filters = dict.fromkeys(("cfp_open", "country", "max_date", "min_date", "tags"))
+    filters.update(query or {}, **fields)
+    return filters
+
+
+@pytest.fixture
+def make_service(tmp_path: Path) -> Callable[..., MarkdownParserService]:
+    """Write an agenda README and return a parser service reading it, without snapshots."""
+
+    def make(content: str, **options) -> MarkdownParserService:
+        (tmp_path / "README.md").write_text(content, encoding="utf-8")
+        options.setdefault("snapshot_dir", None)
+        options.setdefault("watch_interval", 0)
+        options.setdefault("parse_workers", 1)
+        return MarkdownParserService(tmp_path, **options)
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def generated_agenda() -> str:
+    """A generated 3000-entry agenda, spread over the years around today."""
+    return generate_agenda(3000, seed=7)
+
+
+@pytest.fixture
+def serve():
+    """Serve ASGI applications on free local ports, over real connections."""
+    servers = []
+
+    def start(app) -> str:
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not server.started:
+            assert thread.is_alive() and time.monotonic() < deadline, "server did not start"
+            time.sleep(0.01)
+        servers.append((server, thread))
+        port = server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    yield start
+    for server, thread in servers:
+        server.should_exit = True
+        thread.join(5)
@@ -0,0 +1,139 @@
+"""
+Line-by-line agenda parser the single-pass parser replaced, kept as a reference.
+
+It reads the README one line at a time, matches the year and month headers on each
+line and extracts the fields of entry lines with successive regexes. Tags are found
+by substring tests, which is what the "none" tag boundary mode reproduces.
+"""
+
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+TECH_KEYWORDS = {
+    "ai": ["ai", "artificial intelligence", "machine learning", "ml"],
+    "cloud": ["cloud", "aws", "azure", "gcp"],
+    "devops": ["devops", "kubernetes", "docker"],
+    "security": ["security", "infosec", "cybersec"],
+    "web": ["web", "frontend", "backend", "fullstack"],
+    "data": ["data", "database", "analytics", "bigdata"],
+    "mobile": ["mobile", "ios", "android"],
+    "javascript": ["javascript", "js", "node", "react", "vue", "angular"],
+    "python": ["python", "django", "flask"],
+    "java": ["java", "spring"],
+    ".net": [".net", "dotnet", "csharp", "c#"],
+    "agile": ["agile", "scrum"],
+    "development": ["voxx", "craft", "gdg", "dev", "developers"],
+}
+
+
+def parse_markdown_conferences(readme_path: str | Path) -> list[dict[str, Any]]:
+    with open(readme_path, encoding="utf-8") as f:
+        content = f.read()
+
+    conferences = []
+    current_year = None
+    current_month = None
+    for line in content.split("\n"):
+        year_match = re.match(r"^##\s+(\d{4})$", line)
+        if year_match:
+            current_year = int(year_match.group(1))
+            continue
+
+        month_match = re.match(r"^###\s+(\w+)$", line)
+        if month_match:
+            current_month = month_match.group(1)
+            continue
+
+        if line.startswith("* ") and current_year and current_month:
+            conf = parse_conference_line(line, current_year, current_month)
+            if conf:
+                conferences.append(conf)
+
+    return conferences
+
+
+def parse_conference_line(line: str, year: int, month: str) -> dict[str, Any] | None:
+    line = line[2:].strip()
+
+    date_match = re.match(r"^([\d\-/]+):\s+", line)
+    if not date_match:
+        return None
+    date_str = date_match.group(1)
+    line = line[len(date_match.group(0)) :]
+
+    name_link_match = re.match(r"\[([^\]]+)\]\(([^)]+)\)", line)
+    if not name_link_match:
+        return None
+    name = name_link_match.group(1)
+    hyperlink = name_link_match.group(2)
+    line = line[len(name_link_match.group(0)) :].strip()
+
+    location_match = re.match(r"^-\s+([^<\n]+)", line)
+    location = "Unknown"
+    city = ""
+    country = ""
+    if location_match:
+        location = location_match.group(1).strip()
+        line = line[len(location_match.group(0)) :]
+        loc_parts = location.rsplit("(", 1)
+        if len(loc_parts) == 2:
+            city_part = loc_parts[0].strip().rstrip(",")
+            country = loc_parts[1].rstrip(")").strip()
+            if "," in city_part:
+                city = city_part.split(",")[0].strip()
+            else:
+                city = city_part
+
+    cfp_info = None
+    cfp_match = re.search(r'<a href="([^"]+)"><img[^>]*message=until%20([^"&]+)', line)
+    if cfp_match:
+        cfp_link = cfp_match.group(1)
+        try:
+            cfp_deadline = datetime.strptime(cfp_match.group(2).replace("-", " "), "%d %B %Y")
+            cfp_info = {"link": cfp_link, "untilDate": int(cfp_deadline.timestamp())}
+        except ValueError:
+            cfp_info = {"link": cfp_link, "untilDate": None}
+
+    conference = {
+        "name": name,
+        "date": parse_date_range(date_str, year, month),
+        "city": city,
+        "country": country,
+        "location": location,
+        "hyperlink": hyperlink,
+        "tags": extract_tags(name),
+    }
+    if cfp_info:
+        conference["cfp"] = cfp_info
+    return conference
+
+
+def parse_date_range(date_str: str, year: int, month: str) -> dict[str, int]:
+    month_num = datetime.strptime(month, "%B").month
+
+    if "-" in date_str and "/" in date_str:
+        parts = date_str.split("-")
+        beginning = int(datetime(year, month_num, int(parts[0])).timestamp())
+        next_month = month_num + 1 if month_num < 12 else 1
+        next_year = year if month_num < 12 else year + 1
+        end_day = int(parts[1].split("/")[0])
+        end = int(datetime(next_year, next_month, end_day).timestamp())
+    elif "-" in date_str:
+        parts = date_str.split("-")
+        beginning = int(datetime(year, month_num, int(parts[0])).timestamp())
+        end = int(datetime(year, month_num, int(parts[1])).timestamp())
+    else:
+        beginning = end = int(datetime(year, month_num, int(date_str)).timestamp())
+
+    return {"beginning": beginning, "end": end}
+
+
+def extract_tags(name: str) -> list[str]:
+    name_lower = name.lower()
+    return [
+        tag
+        for tag, keywords in TECH_KEYWORDS.items()
+        if any(keyword in name_lower for keyword in keywords)
+    ]
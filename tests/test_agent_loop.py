@@ -0,0 +1,151 @@
+"""Agent loop of the client: concurrent tool calls and the turn and time budgets."""
+
+import asyncio
+import json
+import time
+from collections import deque
+
+import pytest
+from mcp.types import TextContent
+
+from mcp_client import client
+from mcp_client.fake_llm import DEFAULT_REPLY, create_app
+from mcp_client.llm_client import LLMClient
+
+TOOLS = [{"type": "function", "function": {"name": "search", "parameters": {}}}]
+
+
+def _tool_call(number: int, country: str) -> dict:
+    return {
+        "id": f"call_{number}",
+        "type": "function",
+        "function": {"name": "search", "arguments": json.dumps({"country": country})},
+    }
+
+
+def _answer(content: str | None = None, tool_calls: list[dict] | None = None) -> dict:
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return {"choices": [{"message": message}]}
+
+
+class ScriptedLLM:
+    """Answers the chat requests with the scripted completions, the last one forever."""
+
+    def __init__(self, *answers: dict):
+        self.answers = deque(answers)
+        self.payloads: list[dict] = []
+
+    async def chat(self, payload: dict) -> dict:
+        self.payloads.append({**payload, "messages": list(payload["messages"])})
+        return self.answers.popleft() if len(self.answers) > 1 else self.answers[0]
+
+
+class FakeSession:
+    """MCP session whose tools take delay seconds and echo their arguments."""
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.calls: list[tuple[str, dict]] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def call_tool(self, name: str, arguments: dict, raise_on_error: bool = True):
+        self.calls.append((name, arguments))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.running -= 1
+        return type("Result", (), {
+            "content": [TextContent(type="text", text=json.dumps({"echo": arguments}))]
+        })
+
+
+async def test_tool_calls_of_a_turn_run_concurrently(monkeypatch):
+    calls = [_tool_call(number, country) for number, country in enumerate(("FR", "BE", "DE"))]
+    llm = ScriptedLLM(_answer(tool_calls=calls), _answer("Applied everywhere"))
+    monkeypatch.setattr(client, "llm", llm)
+    session = FakeSession(delay=0.3)
+    messages = [{"role": "user", "content": "Apply"}]
+
+    started = time.perf_counter()
+    answer = await client.run_agent(session, messages, TOOLS, max_turns=5, time_budget=10)
+    elapsed = time.perf_counter() - started
+
+    assert answer == "Applied everywhere"
+    assert session.max_running == 3
+    # One tool delay for the turn, not three
+    assert elapsed < 0.6
+    assert [message["role"] for message in messages] == [
+        "user", "assistant", "tool", "tool", "tool", "assistant"
+    ]
+    assert [message["tool_call_id"] for message in messages[2:5]] == ["call_0", "call_1", "call_2"]
+    assert [json.loads(message["content"]) for message in messages[2:5]] == [
+        {"echo": {"country": country}} for country in ("FR", "BE", "DE")
+    ]
+
+    assert len(llm.payloads) == 2
+    assert llm.payloads[0]["tools"] == TOOLS
+    assert llm.payloads[0]["tool_choice"] == "auto"
+    # The second turn sees the tool results
+    assert llm.payloads[1]["messages"] == messages[:5]
+
+
+async def test_turn_budget_stops_the_loop(monkeypatch):
+    llm = ScriptedLLM(_answer(tool_calls=[_tool_call(0, "FR")]))
+    monkeypatch.setattr(client, "llm", llm)
+    session = FakeSession()
+
+    answer = await client.run_agent(session, [], TOOLS, max_turns=3, time_budget=10)
+    assert answer is None
+    assert len(llm.payloads) == 3
+    assert len(session.calls) == 3
+
+
+async def test_time_budget_stops_slow_tool_calls(monkeypatch):
+    monkeypatch.setattr(client, "llm", ScriptedLLM(_answer(tool_calls=[_tool_call(0, "FR")])))
+    session = FakeSession(delay=5)
+
+    started = time.perf_counter()
+    answer = await client.run_agent(session, [], TOOLS, max_turns=5, time_budget=0.3)
+    assert answer is None
+    assert time.perf_counter() - started < 1
+    assert session.running == 0
+
+
+async def test_time_budget_stops_a_slow_llm(serve, monkeypatch):
+    base_url = serve(create_app(ttft=1.5))
+    async with LLMClient(base_url, max_retries=0) as llm:
+        monkeypatch.setattr(client, "llm", llm)
+        started = time.perf_counter()
+        answer = await client.run_agent(FakeSession(), [], TOOLS, max_turns=5, time_budget=0.3)
+    assert answer is None
+    assert time.perf_counter() - started < 1
+
+
+async def test_answer_without_tool_calls_ends_the_loop(serve, monkeypatch):
+    base_url = serve(create_app(ttft=0, tokens_per_second=0))
+    messages = [{"role": "user", "content": "Hello"}]
+    async with LLMClient(base_url, max_retries=0) as llm:
+        monkeypatch.setattr(client, "llm", llm)
+        answer = await client.run_agent(FakeSession(), messages, TOOLS)
+    assert answer == DEFAULT_REPLY
+    assert messages[-1] == {"role": "assistant", "content": DEFAULT_REPLY}
+
+
+@pytest.mark.parametrize("arguments, session, error", [
+    ("{not json", FakeSession(), "Expecting property name"),
+    ('{"country": "FR"}', FakeSession(error=RuntimeError("server gone")), "server gone"),
+])
+async def test_failed_tool_calls_answer_with_the_error(arguments, session, error):
+    tool_call = {"id": "call_9", "function": {"name": "search", "arguments": arguments}}
+    message = await client.execute_tool_call(session, tool_call)
+    assert message["role"] == "tool"
+    assert message["tool_call_id"] == "call_9"
+    assert error in json.loads(message["content"])["error"]
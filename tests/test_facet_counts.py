@@ -0,0 +1,115 @@
+"""facet_counts against counts of the filtered conferences, and its month facet: months
+picked by date and listed in chronological order."""
+
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+from mcp_server.query_cache import QueryCache
+from mcp_server.utils import apply_filter, facet_counts
+from tests.conftest import filter_args
+
+MONTHS = ("January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December")
+
+# Two conferences a month, so that every month ties on its count
+EVEN_AGENDA = "# Agenda\n" + "".join(
+    f"\n## {year}\n\n### {month}\n\n"
+    f"* 3: [First {month} {year}](https://example.com/a) - Paris (France)\n"
+    f"* 9: [Second {month} {year}](https://example.com/b) - Lyon (France)\n"
+    for year in (2024, 2025)
+    for month in MONTHS
+)
+
+
+QUERIES = [
+    {},
+    {"country": "France"},
+    {"country": "usa"},
+    {"tags": "python,ai"},
+    {"cfp_open": True},
+    # The generated agenda spreads around today, CFPs of the next year are still open
+    {"min_date": date.today(), "max_date": date.today() + timedelta(days=365)},
+    {"country": "Germany", "tags": "devops", "min_date": date(2024, 6, 1)},
+    {"text": "devfest"},
+    {"text": "pycon", "country": "Germany"},
+    {"near": "Brussels", "radius_km": 300},
+    {"near": "Tokyo", "radius_km": 1000, "tags": "ai"},
+    {"country": "Atlantis"},
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("cached", [False, True])
+async def test_counts_match_the_filtered_conferences(make_service, generated_agenda, query,
+                                                     cached):
+    store = make_service(generated_agenda).get_conferences()
+    cache = QueryCache() if cached else None
+    conferences = await apply_filter(store, **filter_args(query))
+    open_cfps = await apply_filter(store, **filter_args(query, cfp_open=True))
+
+    # Twice, so that the cached run reads its rows from the cache
+    for _ in range(2):
+        result = await facet_counts(store, **filter_args(query), limit=10**6, cache=cache)
+        assert result["total"] == len(conferences)
+        assert result["cfp_open"] == len(open_cfps)
+        assert result["country"] == Counter(
+            conference.country or "unknown" for conference in conferences
+        )
+        assert result["tag"] == Counter(tag for conference in conferences
+                                        for tag in conference.tags)
+        assert result["month"] == Counter(
+            conference.date.beginning[:7] for conference in conferences
+        )
+        assert "truncated" not in result
+
+
+async def test_most_frequent_values_are_kept(make_service, generated_agenda):
+    store = make_service(generated_agenda).get_conferences()
+    everything = await facet_counts(store, **filter_args(), limit=10**6)
+    result = await facet_counts(store, **filter_args(), facets="country,tag", limit=3)
+    assert set(result) == {"total", "cfp_open", "country", "tag", "truncated"}
+    for facet in ("country", "tag"):
+        counts = sorted(everything[facet].values(), reverse=True)
+        assert sorted(result[facet].values(), reverse=True) == counts[:3]
+        assert result["truncated"][facet] == len(counts) - 3
+
+
+async def test_latest_months_are_kept_on_ties(make_service):
+    store = make_service(EVEN_AGENDA).get_conferences()
+    result = await facet_counts(store, **filter_args(), facets="month", limit=3)
+    assert result["month"] == {"2025-10": 2, "2025-11": 2, "2025-12": 2}
+    assert result["truncated"] == {"month": 21}
+
+
+async def test_latest_months_in_chronological_order(make_service, generated_agenda):
+    store = make_service(generated_agenda).get_conferences()
+    everything = await facet_counts(store, **filter_args(country="France"), limit=10**6)
+    months = list(everything["month"])
+    assert months == sorted(months)
+    assert len(months) > 5
+
+    result = await facet_counts(store, **filter_args(country="France"), limit=5)
+    assert list(result["month"]) == months[-5:]
+    assert result["month"] == {month: everything["month"][month] for month in months[-5:]}
+    assert result["truncated"]["month"] == len(months) - 5
+
+
+@pytest.mark.parametrize("min_date, max_date", [
+    (date(2024, 3, 1), date(2025, 8, 31)),
+    (date(2024, 11, 1), None),
+    (None, date(2024, 9, 30)),
+])
+async def test_every_month_within_a_date_filter(make_service, min_date, max_date):
+    store = make_service(EVEN_AGENDA).get_conferences()
+    result = await facet_counts(
+        store, **filter_args(min_date=min_date, max_date=max_date), facets="month", limit=3
+    )
+    expected = [
+        f"{year}-{month:02d}" for year in (2024, 2025) for month in range(1, 13)
+        if (min_date or date.min) <= date(year, month, 3) <= (max_date or date.max)
+    ]
+    assert list(result["month"]) == expected
+    assert set(result["month"].values()) == {2}
+    assert "truncated" not in result
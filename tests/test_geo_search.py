@@ -0,0 +1,129 @@
+"""Radius searches against a brute-force great-circle filter, and the places they accept."""
+
+import math
+
+import pytest
+
+from mcp_server.gazetteer import EARTH_RADIUS_KM, GAZETTEER_PATH, default_gazetteer
+from mcp_server.markdown_parser import MarkdownParserService
+from mcp_server.utils import resolve_filters
+
+# Rounding of the coordinates stored as float32, in km
+TOLERANCE_KM = 0.01
+
+
+def _gazetteer_agenda() -> str:
+    """An agenda with one conference in every city of the gazetteer."""
+    lines = ["# Agenda", "", "## 2025", "", "### March", ""]
+    for number, line in enumerate(GAZETTEER_PATH.read_text(encoding="utf-8").splitlines()):
+        if line.strip() and not line.startswith("#"):
+            city, country = line.split("\t")[:2]
+            lines.append(f"* 3: [Conf {number}](https://example.com/{number}) - {city} ({country})")
+    return "\n".join(lines) + "\n"
+
+
+def _distance_km(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Haversine great-circle distance."""
+    phi1, phi2 = math.radians(a[0]), math.radians(b[0])
+    half_dphi, half_dlam = (phi2 - phi1) / 2, math.radians(b[1] - a[1]) / 2
+    h = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlam) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(h), 1.0))
+
+
+def _assert_radius_search(store, near: str, radius_km: float) -> set[int]:
+    rows = set(store.index.scan(**resolve_filters(store, None, None, None, None, None,
+                                                   near, radius_km)))
+    center = default_gazetteer().resolve(near)
+    distances = {
+        row: _distance_km(center, (store.latitude[row], store.longitude[row]))
+        for row in range(len(store))
+        if store.latitude[row] == store.latitude[row]
+    }
+    inside = {row for row, distance in distances.items() if distance <= radius_km - TOLERANCE_KM}
+    close = {row for row, distance in distances.items() if distance <= radius_km + TOLERANCE_KM}
+    assert inside <= rows <= close, (near, radius_km)
+    return rows
+
+
+@pytest.fixture(scope="module")
+def world(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("world")
+    (directory / "README.md").write_text(_gazetteer_agenda(), encoding="utf-8")
+    return MarkdownParserService(
+        directory, snapshot_dir=None, watch_interval=0, parse_workers=1
+    ).get_conferences()
+
+
+@pytest.mark.parametrize("near, radius_km", [
+    ("Paris", 300),
+    ("Brussels", 50),
+    ("Tokyo", 1000),
+    ("Montreal", 5000),
+    ("Sydney", 25000),
+])
+def test_generated_agenda_matches_brute_force(make_service, generated_agenda, near, radius_km):
+    store = make_service(generated_agenda).get_conferences()
+    rows = _assert_radius_search(store, near, radius_km)
+    assert rows
+
+
+@pytest.mark.parametrize("near, radius_km, expected", [
+    # Across the antimeridian, from either side of it
+    ("-38, 179.9", 1000, {"Auckland", "Hamilton"}),
+    ("-38, -179.9", 1000, {"Auckland", "Hamilton"}),
+    ("21, -179", 2500, {"Honolulu"}),
+    # Around the poles, where all longitudes meet
+    ("90, 0", 3000, {"Tromsø", "Oulu"}),
+    ("89.9, 120", 3000, {"Tromsø", "Oulu"}),
+    ("-90, 0", 5000, {"Dunedin"}),
+])
+def test_antimeridian_and_poles(world, near, radius_km, expected):
+    rows = _assert_radius_search(world, near, radius_km)
+    assert expected <= {world.cities[world.city[row]] for row in rows}
+
+
+def test_hemisphere_and_whole_earth(world):
+    located = {row for row in range(len(world)) if world.latitude[row] == world.latitude[row]}
+    assert _assert_radius_search(world, "0, 0", math.pi * EARTH_RADIUS_KM) == located
+    north = _assert_radius_search(world, "90, 0", math.pi * EARTH_RADIUS_KM / 2)
+    assert north == {row for row in located if world.latitude[row] >= 0}
+
+
+@pytest.mark.parametrize("near", ["Paris", "48.8566, 2.3522", "Lyon", "Auckland"])
+def test_radius_zero_keeps_the_place_itself(world, near):
+    rows = _assert_radius_search(world, near, 0)
+    center = default_gazetteer().resolve(near)
+    assert rows
+    assert all(
+        _distance_km(center, (world.latitude[row], world.longitude[row])) <= TOLERANCE_KM
+        for row in rows
+    )
+
+
+def test_unknown_place():
+    with pytest.raises(ValueError, match="Unknown location"):
+        resolve_filters(None, None, None, None, None, None, "Atlantis")
+
+
+@pytest.mark.parametrize("place, expected", [
+    ("Lyon", (45.7640, 4.8357)),
+    ("  lyon ", (45.7640, 4.8357)),
+    ("Bangalore", (12.9716, 77.5946)),
+    ("Tromso", (69.6492, 18.9553)),
+    ("Reykjavík", (64.1466, -21.9426)),
+    ("Portland, USA", (45.5152, -122.6784)),
+    ("Portland (USA)", (45.5152, -122.6784)),
+    ("Portland, OR", (45.5152, -122.6784)),
+    ("Portland, OR, USA", (45.5152, -122.6784)),
+    ("45.76, 4.84", (45.76, 4.84)),
+    ("45.76,4.84", (45.76, 4.84)),
+    ("-33.9 151.2", (-33.9, 151.2)),
+    ("+90;-180", (90.0, -180.0)),
+    ("91, 0", None),
+    ("0, 181", None),
+    ("Atlantis", None),
+    ("Lyon, Japan", (45.7640, 4.8357)),
+    ("Lyon (Japan)", None),
+])
+def test_resolve_place_forms(place, expected):
+    assert default_gazetteer().resolve(place) == expected
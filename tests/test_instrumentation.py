@@ -0,0 +1,75 @@
+"""Metrics of the MCP requests, rendered on the /metrics endpoint."""
+
+import re
+
+from fastmcp import Client, FastMCP
+from starlette.testclient import TestClient
+
+from mcp_server.instrumentation import METRICS_PATH, instrument
+
+
+def _server() -> FastMCP:
+    mcp = FastMCP("instrumented")
+    instrument(mcp, slow_call_ms=0)
+
+    @mcp.resource("talk://{theme}")
+    def talk(theme: str) -> str:
+        return f"Talk about {theme}"
+
+    @mcp.resource("stats://instrumented")
+    def stats() -> str:
+        return "{}"
+
+    @mcp.tool
+    def echo(text: str) -> str:
+        return text
+
+    return mcp
+
+
+def _scrape(mcp: FastMCP) -> str:
+    with TestClient(mcp.http_app()) as http:
+        response = http.get(METRICS_PATH)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return response.text
+
+
+def _count(metrics: str, metric: str, **labels: str) -> int:
+    label_text = ",".join(f'{name}="{value}"' for name, value in labels.items())
+    match = re.search(rf"^{metric}_count\{{{re.escape(label_text)}\}} (\d+)$", metrics, re.M)
+    return int(match.group(1)) if match else 0
+
+
+async def test_requests_are_rendered_as_histograms():
+    mcp = _server()
+    before = _scrape(mcp)
+    async with Client(mcp) as client:
+        for theme in ("mcp", "python", "rust"):
+            await client.read_resource(f"talk://{theme}")
+        await client.read_resource("stats://instrumented")
+        await client.call_tool("echo", {"text": "hello"})
+    metrics = _scrape(mcp)
+
+    talks = {"kind": "resource", "name": "talk://{theme}"}
+    duration = "cfp_request_duration_seconds"
+    assert _count(metrics, duration, **talks) - _count(before, duration, **talks) == 3
+    assert _count(metrics, "cfp_response_size_bytes", **talks) - (
+        _count(before, "cfp_response_size_bytes", **talks)
+    ) == 3
+    stats = {"kind": "resource", "name": "stats://"}
+    assert _count(metrics, duration, **stats) - _count(before, duration, **stats) == 1
+    tool = {"kind": "tool", "name": "echo"}
+    assert _count(metrics, duration, **tool) - _count(before, duration, **tool) == 1
+
+    # One series per template, whatever the URIs read
+    assert "talk://mcp" not in metrics and "talk://rust" not in metrics
+    buckets = re.findall(
+        r'^cfp_request_duration_seconds_bucket\{kind="resource",name="talk://\{theme\}",'
+        r'le="([^"]+)"\} (\d+)$', metrics, re.M
+    )
+    assert buckets[-1][0] == "+Inf"
+    counts = [int(count) for _, count in buckets]
+    assert counts == sorted(counts)
+    assert counts[-1] == _count(metrics, duration, **talks)
+    assert "# TYPE cfp_request_duration_seconds histogram" in metrics
@@ -0,0 +1,87 @@
+"""Local BM25 prerank of the conferences of a talk."""
+
+import pytest
+
+from mcp_server.lexical_ranking import PRERANK_TOP_K, bm25_scores, prerank, tokenize
+
+TALK = """
+# Async Python in production
+
+How we moved our Python web services to asyncio, and what the event loop taught us
+about Python performance.
+"""
+
+CONFERENCES = [
+    {"name": "Devoxx France", "tags": ["java"]},
+    {"name": "KubeCon Europe", "tags": ["cloud", "devops"]},
+    {"name": "PyCon FR", "tags": ["python"]},
+    {"name": "RustConf", "tags": ["rust"]},
+    {"name": "Python Web Summit", "tags": ["python", "web"]},
+    {"name": "Frontend Days", "tags": ["javascript"]},
+]
+
+
+def _names(conferences: list[dict]) -> list[str]:
+    return [conference["name"] for conference in conferences]
+
+
+def test_tokenize_keeps_language_names():
+    assert tokenize("The C# and C++ talks, on .NET 8 and Node.js, in Lyon") == [
+        "c#", "c++", "talks", ".net", "node.js", "lyon"
+    ]
+    assert tokenize("L'IA avec des LLMs pour les devs") == ["ai", "ai", "devs"]
+
+
+def test_relevant_conferences_rank_first():
+    kept, scores = prerank(TALK, CONFERENCES, top_k=0)
+    names = _names(kept)
+    # Python in the name and the tags, then in the tags only
+    assert names[:2] == ["Python Web Summit", "PyCon FR"]
+    assert scores["Python Web Summit"] > scores["PyCon FR"] > 0
+    # The unrelated conferences follow with no score, in date order
+    assert names[2:] == ["Devoxx France", "KubeCon Europe", "RustConf", "Frontend Days"]
+    assert {scores[name] for name in names[2:]} == {0}
+
+
+def test_tag_keywords_reach_conferences_by_topic():
+    conferences = [{"name": "Big Data Days", "tags": []}, {"name": "AI Summit", "tags": ["ai"]}]
+    talk = "Machine learning pipelines for the rest of us"
+    assert _names(prerank(talk, conferences)[0]) == ["Big Data Days", "AI Summit"]
+
+    kept, scores = prerank(talk, conferences, tag_keywords={"ai": ["machine learning"]})
+    assert _names(kept) == ["AI Summit", "Big Data Days"]
+    assert scores["AI Summit"] > 0
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 10])
+def test_output_is_capped_at_top_k(top_k):
+    conferences = [
+        {"name": f"Conference {number}", "tags": ["python"] if number % 7 == 0 else ["java"]}
+        for number in range(50)
+    ]
+    everything, _ = prerank(TALK, conferences, top_k=0)
+    kept, scores = prerank(TALK, conferences, top_k=top_k)
+    assert kept == everything[:top_k]
+    assert list(scores) == _names(kept)
+
+
+def test_default_cap_is_prerank_top_k():
+    conferences = [{"name": f"Conference {number}", "tags": []}
+                   for number in range(PRERANK_TOP_K + 20)]
+    kept, scores = prerank(TALK, conferences)
+    assert len(kept) == len(scores) == PRERANK_TOP_K
+    # Without any score, the first ones in date order are kept
+    assert kept == conferences[:PRERANK_TOP_K]
+
+
+def test_bm25_weighs_rare_terms_and_dampens_repetitions():
+    documents = [["python", "web"], ["python"], ["python", "rust"], ["java"]]
+    scores = bm25_scores(["python", "rust"], documents)
+    # "rust" appears once, "python" in most documents
+    assert scores[2] > scores[1] > scores[0] > scores[3] == 0
+    assert bm25_scores(["python"], []) == []
+
+    once = bm25_scores(["python", "rust"], documents)
+    repeated = bm25_scores(["python"] * 10 + ["rust"], documents)
+    # Ten mentions of "python" weigh more than one, far less than ten times more
+    assert once[1] < repeated[1] < 4 * once[1]
@@ -0,0 +1,175 @@
+"""Pooled LLM client against the fake LLM server: retries, connection reuse and streaming."""
+
+import json
+import time
+from collections import deque
+
+import httpx
+import pytest
+from starlette.responses import Response
+
+from mcp_client.fake_llm import _TOKEN, DEFAULT_REPLY, create_app
+from mcp_client.llm_client import LLMClient
+
+PAYLOAD = {"model": "fake", "messages": [{"role": "user", "content": "Hello"}]}
+
+
+class ScriptedFailures:
+    """ASGI wrapper answering the next scripted statuses before letting requests through."""
+
+    def __init__(self, app):
+        self.app = app
+        self.failures: deque[tuple[int, dict[str, str]]] = deque()
+        self.arrivals: list[float] = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.arrivals.append(time.perf_counter())
+            if self.failures:
+                status, headers = self.failures.popleft()
+                await Response(status_code=status, headers=headers)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+@pytest.fixture
+def fake_llm(serve):
+    app = ScriptedFailures(create_app(reply="One two three four", ttft=0, tokens_per_second=0))
+    return app, serve(app)
+
+
+async def test_pooled_connection_is_reused(fake_llm):
+    _, base_url = fake_llm
+    async with LLMClient(base_url, max_retries=0) as llm:
+        for _ in range(3):
+            answer = await llm.chat(PAYLOAD)
+            assert answer["choices"][0]["message"]["content"] == "One two three four"
+        stats = llm.stats()
+    assert stats["requests"] == stats["requests_sent"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+    assert stats["retries"] == 0
+
+
+@pytest.mark.parametrize("status", [503, 429])
+async def test_transient_statuses_honour_retry_after(fake_llm, status):
+    app, base_url = fake_llm
+    app.failures.extend([(status, {"Retry-After": "0.3"})] * 2)
+    # Without Retry-After the backoff would wait far longer than the test allows
+    async with LLMClient(base_url, max_retries=3, retry_backoff=30) as llm:
+        answer = await llm.chat(PAYLOAD)
+        stats = llm.stats()
+    assert answer["choices"][0]["message"]["content"] == "One two three four"
+    assert stats["requests"] == stats["requests_sent"] == 3
+    assert stats["retries"] == 2
+    assert stats["connections_opened"] == 1
+    gaps = [later - earlier for earlier, later in zip(app.arrivals, app.arrivals[1:])]
+    assert len(gaps) == 2
+    assert all(0.3 <= gap < 5 for gap in gaps)
+
+
+async def test_retries_give_up_with_the_last_status(fake_llm):
+    app, base_url = fake_llm
+    app.failures.extend([(503, {"Retry-After": "0"})] * 3)
+    async with LLMClient(base_url, max_retries=2) as llm:
+        with pytest.raises(httpx.HTTPStatusError) as raised:
+            await llm.chat(PAYLOAD)
+        assert llm.requests == 3
+        assert llm.retries == 2
+    assert raised.value.response.status_code == 503
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 422])
+async def test_client_errors_are_not_retried(fake_llm, status):
+    app, base_url = fake_llm
+    app.failures.append((status, {"Retry-After": "0"}))
+    async with LLMClient(base_url, max_retries=3, retry_backoff=0) as llm:
+        with pytest.raises(httpx.HTTPStatusError) as raised:
+            await llm.chat(PAYLOAD)
+        assert llm.requests == 1
+        assert llm.retries == 0
+    assert raised.value.response.status_code == status
+    assert len(app.arrivals) == 1
+
+
+async def test_client_needs_the_context_manager():
+    with pytest.raises(RuntimeError, match="async context manager"):
+        await LLMClient("http://127.0.0.1:1").chat(PAYLOAD)
+
+
+async def test_streamed_chunks_are_assembled(serve):
+    ttft, tokens_per_second = 0.2, 40.0
+    base_url = serve(create_app(ttft=ttft, tokens_per_second=tokens_per_second))
+    deltas = []
+    async with LLMClient(base_url, max_retries=0) as llm:
+        completion = await llm.stream_chat(PAYLOAD, on_delta=deltas.append)
+
+    tokens = _TOKEN.findall(DEFAULT_REPLY)
+    assert deltas == tokens
+    assert completion.content == DEFAULT_REPLY
+    assert completion.finish_reason == "stop"
+    # From the usage chunk, which the client asks for
+    assert completion.tokens == len(tokens)
+
+    generation = (len(tokens) - 1) / tokens_per_second
+    assert ttft <= completion.time_to_first_token < ttft + 1
+    assert completion.duration >= ttft + generation
+    assert 0 < completion.tokens_per_second <= tokens_per_second * 1.05
+    stats = completion.stats()
+    assert stats["tokens"] == len(tokens)
+    assert stats["ttft_s"] == round(completion.time_to_first_token, 3)
+    assert stats["tokens_per_s"] == round(completion.tokens_per_second, 1)
+
+
+async def test_deltas_arrive_before_the_stream_ends(serve):
+    base_url = serve(create_app(reply="a b c d e", ttft=0, tokens_per_second=10))
+    arrivals = []
+
+    async def on_delta(delta: str) -> None:
+        arrivals.append(time.perf_counter())
+
+    async with LLMClient(base_url, max_retries=0) as llm:
+        started = time.perf_counter()
+        completion = await llm.stream_chat(PAYLOAD, on_delta=on_delta)
+        # The stream is read to the end, so the next call reuses the connection
+        await llm.stream_chat(PAYLOAD)
+        stats = llm.stats()
+    assert completion.content == "a b c d e"
+    assert len(arrivals) == 5
+    # The deltas are 0.1 s apart: the first one is handled long before the last
+    assert arrivals[-1] - arrivals[0] >= 0.3
+    assert arrivals[0] - started < completion.duration - 0.3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 1
+
+
+async def test_stream_without_usage_counts_the_deltas(serve):
+    inner = create_app(reply="one two three", ttft=0, tokens_per_second=0)
+
+    async def without_usage(scope, receive, send):
+        # Drop stream_options from the request, as proxies without usage chunks do
+        async def read():
+            message = await receive()
+            if message["type"] == "http.request":
+                body = json.loads(message["body"])
+                body.pop("stream_options", None)
+                message = {**message, "body": json.dumps(body).encode()}
+            return message
+
+        await inner(scope, read, send)
+
+    base_url = serve(without_usage)
+    async with LLMClient(base_url, max_retries=0) as llm:
+        completion = await llm.stream_chat(PAYLOAD)
+    assert completion.content == "one two three"
+    assert completion.tokens == 3
+    assert completion.time_to_first_token is not None
+
+
+async def test_stream_retries_before_the_first_chunk(fake_llm):
+    app, base_url = fake_llm
+    app.failures.append((503, {"Retry-After": "0"}))
+    async with LLMClient(base_url, max_retries=1) as llm:
+        completion = await llm.stream_chat(PAYLOAD)
+        assert llm.retries == 1
+    assert completion.content == "One two three four"
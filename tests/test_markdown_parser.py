@@ -0,0 +1,105 @@
+"""The single-pass parser gives the same conferences as the line-by-line one it replaced."""
+
+import pytest
+
+from mcp_server.markdown_parser import DATA_DIR, TECH_KEYWORDS, MarkdownParserService
+from mcp_server.tag_matcher import TagMatcher
+from tests import reference_parser
+
+# Tags of the reference parser come from substring tests
+SUBSTRING_TAGS = TagMatcher(TECH_KEYWORDS, "none")
+
+BADGE = (
+    '<a href="https://cfp.example.com/{0}"><img alt="CFP" '
+    'src="https://img.shields.io/static/v1?label=CFP&message=until%20{1}&color=red"></a>'
+)
+
+EDGE_CASES = """\
+# Developers Conferences Agenda
+
+* 3: [Before Any Header](https://example.com/early) - Paris (France)
+
+## 2025
+
+* 4: [Year Without Month](https://example.com/no-month) - Lyon (France)
+
+### January
+
+* 5-6: [ICSTM 2026](https://waset.org/icstm) - Bali (Indonesia)
+* 15: [MongoDB.local San Francisco](https://www.mongodb.com/local) - San Francisco, CA (USA)
+*   16:  [Extra Spaces](https://example.com/spaces)   -   Nantes   (France)
+* 17: [No Location](https://example.com/none)
+* 18: [No Country](https://example.com/no-country) - Somewhere
+* 19: [Online AI Day](https://example.com/online) - Online {badge1}
+* 20: [Bad CFP Date](https://example.com/bad) - Berlin (Germany) {badge2}
+* 21: [CFP Without Location](https://example.com/cfp-only) {badge3}
+* 31-01/02: [FOSDEM 2026](https://fosdem.org/2026/) - Brussels (Belgium)
+* Not an entry
+* 22 [Missing Colon](https://example.com/colon) - Paris (France)
+*22: [Missing Space](https://example.com/space) - Paris (France)
+  * 23: [Indented](https://example.com/indented) - Paris (France)
+
+[Back to top](#top)
+
+### December
+
+* 30-02/01: [Year End DevOps Days](https://example.com/year-end) - Tokyo (Japan)
+* 10: [C# and .NET Conf](https://example.com/dotnet) - Montreal, QC (Canada)
+
+##  2026
+### Not A Month Header Either
+#### February
+
+* 1: [Kept In December](https://example.com/kept) - Madrid (Spain)
+
+## 2026
+
+### March
+
+* 2: [Devoxx France](https://www.devoxx.fr/) - Paris (France)
+""".format(
+    badge1=BADGE.format(1, "10-January-2025"),
+    badge2=BADGE.format(2, "31-Smarch-2025"),
+    badge3=BADGE.format(3, "1-January-2025"),
+)
+
+
+def _parse_both(make_service, content: str) -> tuple[list, list]:
+    service = make_service(content, tagger=SUBSTRING_TAGS)
+    parsed = service.parse_markdown_conferences(service.readme_path)
+    expected = reference_parser.parse_markdown_conferences(service.readme_path)
+    return parsed, expected
+
+
+def test_edge_cases_match_reference(make_service):
+    parsed, expected = _parse_both(make_service, EDGE_CASES)
+    assert len(expected) == 13
+    assert parsed == expected
+
+
+def test_generated_agenda_matches_reference(make_service, generated_agenda):
+    parsed, expected = _parse_both(make_service, generated_agenda)
+    assert len(expected) == 3000
+    assert parsed == expected
+
+
+@pytest.mark.skipif(
+    not (DATA_DIR / "README.md").exists(), reason="agenda submodule not checked out"
+)
+def test_bundled_readme_matches_reference():
+    service = MarkdownParserService(
+        DATA_DIR, snapshot_dir=None, watch_interval=0, tagger=SUBSTRING_TAGS, parse_workers=1
+    )
+    readme = service.readme_path
+    assert service.parse_markdown_conferences(readme) == (
+        reference_parser.parse_markdown_conferences(readme)
+    )
+
+
+def test_parse_conference_line_matches_reference(make_service):
+    service = make_service(EDGE_CASES, tagger=SUBSTRING_TAGS)
+    for line in EDGE_CASES.splitlines():
+        if line.startswith("* "):
+            assert service.parse_conference_line(line, 2025, "January") == (
+                reference_parser.parse_conference_line(line, 2025, "January")
+            )
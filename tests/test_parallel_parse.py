@@ -0,0 +1,94 @@
+"""Parsing across a process pool gives the same entries and store as parsing in-process."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from mcp_server import markdown_parser
+from mcp_server.markdown_parser import split_sections
+from mcp_server.tag_matcher import TagMatcher
+
+
+@pytest.fixture
+def pools(monkeypatch) -> list[int]:
+    """Record the worker count of every process pool the parser starts."""
+    started = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def __init__(self, max_workers, **kwargs):
+            started.append(max_workers)
+            super().__init__(max_workers, **kwargs)
+
+    monkeypatch.setattr(markdown_parser, "ProcessPoolExecutor", RecordingPool)
+    return started
+
+
+def _sections(content: str) -> list:
+    return [(year, month, body) for _, year, month, body in split_sections(content)]
+
+
+def _comparable(parsed: list) -> list:
+    # Unknown coordinates are NaN, which only equals itself when it is the same object,
+    # and entries coming back from workers hold copies of it
+    return [
+        [entry._replace(latitude=repr(entry.latitude), longitude=repr(entry.longitude))
+         for entry in entries]
+        for entries in parsed
+    ]
+
+
+@pytest.mark.parametrize("tagger", [None, TagMatcher({"python": ["py"], "web": ["js"]}, "word")])
+def test_parallel_parse_matches_serial_parse(make_service, generated_agenda, pools, tagger):
+    serial = make_service(generated_agenda, tagger=tagger)
+    assert pools == []
+    parallel = make_service(
+        generated_agenda, tagger=tagger, parse_workers=2, parallel_threshold=0
+    )
+    assert pools == [2]
+
+    sections = _sections(generated_agenda)
+    assert _comparable(parallel.parse_sections(sections)) == _comparable(
+        serial.parse_sections(sections)
+    )
+    assert pools == [2, 2]
+
+    serial_store, parallel_store = serial.get_conferences(), parallel.get_conferences()
+    assert list(parallel_store) == list(serial_store)
+    assert parallel_store.latitude.tobytes() == serial_store.latitude.tobytes()
+    assert list(parallel_store.section) == list(serial_store.section)
+    assert parallel_store.sections.values == serial_store.sections.values
+
+
+def test_parallel_records_match_serial_records(make_service, generated_agenda, pools):
+    serial = make_service(generated_agenda)
+    parallel = make_service(generated_agenda, parse_workers=3, parallel_threshold=0)
+    assert parallel.parse_markdown_conferences(parallel.readme_path) == (
+        serial.parse_markdown_conferences(serial.readme_path)
+    )
+    assert pools == [3, 3]
+
+
+def test_small_readmes_are_parsed_in_process(make_service, generated_agenda, pools):
+    make_service(generated_agenda, parse_workers=2, parallel_threshold=len(generated_agenda))
+    assert pools == []
+
+
+def test_one_worker_per_year_at_most(make_service, generated_agenda, pools):
+    years = len({year for _, year, _, _ in split_sections(generated_agenda) if year})
+    make_service(generated_agenda, parse_workers=100, parallel_threshold=0)
+    # Sections before the first year header make one more chunk
+    assert pools == [years + 1]
+
+
+def test_pool_failure_falls_back_to_serial_parse(
+    make_service, generated_agenda, monkeypatch, caplog
+):
+    def broken_pool(*args, **kwargs):
+        raise OSError("no more processes")
+
+    serial = make_service(generated_agenda)
+    monkeypatch.setattr(markdown_parser, "ProcessPoolExecutor", broken_pool)
+    parallel = make_service(generated_agenda, parse_workers=2, parallel_threshold=0)
+
+    assert "Parallel parsing failed" in caplog.text
+    assert list(parallel.get_conferences()) == list(serial.get_conferences())
@@ -0,0 +1,173 @@
+"""QueryCache: key normalization, expiry, LRU eviction and invalidation on reload."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server import query_cache
+from mcp_server.query_cache import QueryCache
+from mcp_server.utils import facet_counts, resolve_filters, search_page
+from tests.conftest import filter_args
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(query_cache, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture
+def service(make_service, generated_agenda):
+    return make_service(generated_agenda)
+
+
+@pytest.mark.parametrize("first, second", [
+    ({"country": "France"}, {"country": "france"}),
+    ({"country": "France"}, {"country": " FRANCE "}),
+    ({"tags": "python,ai"}, {"tags": "AI, Python"}),
+    ({"tags": "python,ai"}, {"tags": "ai,python,python"}),
+    ({"country": "USA", "tags": "devops,cloud"}, {"country": "usa", "tags": "Cloud,DevOps"}),
+    ({"text": "DevFest Paris"}, {"text": "devfest  paris!"}),
+])
+async def test_equivalent_filters_share_an_entry(service, first, second):
+    store = service.get_conferences()
+    cache = QueryCache()
+    expected = await search_page(store, **filter_args(**first), cache=cache)
+    assert cache.stats()["misses"] == 1
+
+    assert await search_page(store, **filter_args(**second), cache=cache) == expected
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+async def test_different_filters_do_not_share_an_entry(service):
+    store = service.get_conferences()
+    cache = QueryCache()
+    for filters in (
+        filter_args(country="France"),
+        filter_args(country="Germany"),
+        filter_args(country="France", cfp_open=True),
+        filter_args(tags="python"),
+        filter_args(tags="python,java"),
+    ):
+        await search_page(store, **filters, cache=cache)
+    assert cache.stats()["misses"] == 5
+    assert cache.stats()["hits"] == 0
+
+
+async def test_search_pages_and_facets_share_entries(service):
+    store = service.get_conferences()
+    cache = QueryCache()
+    page = await search_page(store, **filter_args(country="France"), limit=5, cache=cache)
+    await search_page(
+        store, **filter_args(country="France"), limit=5, cursor=page["next_cursor"], cache=cache
+    )
+    await facet_counts(store, **filter_args(country="france"), cache=cache)
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = QueryCache(ttl=60)
+    cache.put("v1", "key", [1, 2])
+    clock.now += 59
+    assert cache.get("v1", "key") == [1, 2]
+    clock.now += 1
+    assert cache.get("v1", "key") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_expire_when_their_result_changes(clock):
+    cache = QueryCache(ttl=60)
+    cache.put("v1", "key", [1, 2], valid_until=clock.now + 10)
+    clock.now += 9
+    assert cache.get("v1", "key") == [1, 2]
+    clock.now += 1
+    assert cache.get("v1", "key") is None
+
+    # The TTL still applies to results valid longer than it
+    cache.put("v1", "key", [1, 2], valid_until=clock.now + 3600)
+    clock.now += 60
+    assert cache.get("v1", "key") is None
+
+
+async def test_open_cfp_results_expire_at_the_first_closing_cfp(service, clock):
+    store = service.get_conferences()
+    cache = QueryCache(ttl=10**9)
+    clock.now = time.time()
+    page = await search_page(store, **filter_args(cfp_open=True), limit=500, cache=cache)
+    rows = store.index.scan(**resolve_filters(store, True, None, None, None, None))
+    first_deadline = min(store.cfp_until[row] for row in rows)
+
+    clock.now = first_deadline
+    assert await search_page(store, **filter_args(cfp_open=True), limit=500, cache=cache) == page
+    assert cache.stats()["hits"] == 1
+    clock.now = first_deadline + 1
+    await search_page(store, **filter_args(cfp_open=True), limit=500, cache=cache)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = QueryCache(max_entries=2)
+    cache.put("v1", "a", [1])
+    cache.put("v1", "b", [2])
+    assert cache.get("v1", "a") == [1]
+    cache.put("v1", "c", [3])
+
+    assert cache.get("v1", "b") is None
+    assert cache.get("v1", "a") == [1]
+    assert cache.get("v1", "c") == [3]
+    assert cache.stats()["evictions"] == 1
+
+    # Replacing an entry does not evict another one
+    cache.put("v1", "c", [4])
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("v1", "c") == [4]
+
+
+def test_a_size_of_zero_disables_the_cache():
+    cache = QueryCache(max_entries=0)
+    cache.put("v1", "a", [1])
+    assert cache.get("v1", "a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_a_new_version_drops_every_entry():
+    cache = QueryCache()
+    cache.put("v1", "a", [1])
+    cache.put("v1", "b", [2])
+    assert cache.get("v2", "a") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["version"] == "v2"
+    assert cache.get("v1", "b") is None
+
+
+async def test_reload_invalidates_cached_results(service, generated_agenda):
+    cache = QueryCache()
+    store = service.get_conferences()
+    before = await search_page(store, **filter_args(country="France"), limit=500, cache=cache)
+
+    # Drop every French conference
+    service.readme_path.write_text(
+        generated_agenda.replace(" (France)", " (Belgium)"), encoding="utf-8"
+    )
+    assert service.reload()
+    reloaded = service.get_conferences()
+    assert reloaded.source_hash != store.source_hash
+
+    after = await search_page(reloaded, **filter_args(country="France"), limit=500, cache=cache)
+    assert before["conferences"]
+    assert after["conferences"] == []
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["version"] == reloaded.source_hash
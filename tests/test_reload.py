@@ -0,0 +1,133 @@
+"""Reloading an edited agenda gives the store a fresh parse of the edited README gives."""
+
+import re
+from datetime import date
+
+import pytest
+
+from mcp_server.conference_store import ConferenceStore
+from mcp_server.utils import apply_filter, facet_counts
+from tests.conftest import filter_args
+
+INSERTED = "* 1: [Inserted Python Summit](https://example.com/inserted) - Lyon (France)"
+
+
+def _lines(content: str) -> list[str]:
+    return content.split("\n")
+
+
+def _entry_line(lines: list[str], number: int) -> int:
+    return next(i for i, line in enumerate(lines) if f" #{number}](" in line)
+
+
+def _month_blocks(lines: list[str]) -> list[tuple[int, int]]:
+    """(start, stop) line ranges of the month sections, from their header to the next one."""
+    headers = [i for i, line in enumerate(lines) if line.startswith("##")]
+    return [
+        (start, stop)
+        for start, stop in zip(headers, headers[1:] + [len(lines)])
+        if lines[start].startswith("### ")
+    ]
+
+
+def edit(content: str) -> str:
+    lines = _lines(content)
+    i = _entry_line(lines, 10)
+    lines[i] = re.sub(r"^\* [\d\-/]+:", "* 28:", lines[i]).replace(" #10](", " Edited #10](")
+    return "\n".join(lines)
+
+
+def delete(content: str) -> str:
+    lines = _lines(content)
+    del lines[_entry_line(lines, 20)]
+    return "\n".join(lines)
+
+
+def insert(content: str) -> str:
+    lines = _lines(content)
+    lines.insert(_entry_line(lines, 30) + 1, INSERTED)
+    return "\n".join(lines)
+
+
+def duplicate(content: str) -> str:
+    # The copy is identical to the original section, down to its key digest
+    lines = _lines(content)
+    start, stop = _month_blocks(lines)[4]
+    lines[stop:stop] = lines[start:stop]
+    return "\n".join(lines)
+
+
+def reorder(content: str) -> str:
+    # Unchanged sections moving around cannot reuse the row order of the previous store
+    lines = _lines(content)
+    (first, middle), (_, stop) = _month_blocks(lines)[7:9]
+    lines[first:stop] = lines[middle:stop] + lines[first:middle]
+    return "\n".join(lines)
+
+
+def everything(content: str) -> str:
+    for change in (edit, delete, insert, duplicate, reorder):
+        content = change(content)
+    return content
+
+
+QUERIES = [
+    {},
+    {"country": "france"},
+    {"country": "USA", "tags": "python, ai"},
+    {"tags": "devops"},
+    {"min_date": date(2024, 3, 1), "max_date": date(2025, 6, 30)},
+    {"cfp_open": True},
+    {"near": "Paris", "radius_km": 500},
+    {"text": "python summit"},
+    {"text": "devfest", "country": "Germany"},
+]
+
+
+async def assert_same_store(reloaded: ConferenceStore, fresh: ConferenceStore) -> None:
+    assert reloaded.source_hash == fresh.source_hash
+    assert list(reloaded) == list(fresh)
+    # Coordinates are NaN for unknown cities, compared bitwise
+    assert reloaded.latitude.tobytes() == fresh.latitude.tobytes()
+    assert reloaded.longitude.tobytes() == fresh.longitude.tobytes()
+    assert reloaded.sections.values == fresh.sections.values
+    assert [reloaded.sections[code] for code in reloaded.section] == [
+        fresh.sections[code] for code in fresh.section
+    ]
+
+    for query in QUERIES:
+        assert await apply_filter(reloaded, **filter_args(query)) == (
+            await apply_filter(fresh, **filter_args(query))
+        ), query
+        assert await facet_counts(reloaded, **filter_args(query)) == (
+            await facet_counts(fresh, **filter_args(query))
+        ), query
+
+
+@pytest.mark.parametrize("change", [edit, delete, insert, duplicate, reorder, everything])
+async def test_reload_matches_fresh_parse(make_service, generated_agenda, change):
+    service = make_service(generated_agenda)
+    edited = change(generated_agenda)
+    assert edited != generated_agenda
+    service.readme_path.write_text(edited, encoding="utf-8")
+
+    assert service.reload()
+    fresh = make_service(edited)
+    await assert_same_store(service.get_conferences(), fresh.get_conferences())
+
+
+async def test_reload_without_changes_keeps_the_store(make_service, generated_agenda):
+    service = make_service(generated_agenda)
+    store = service.get_conferences()
+    assert not service.reload()
+    assert service.get_conferences() is store
+
+
+async def test_reload_back_to_the_original(make_service, generated_agenda):
+    service = make_service(generated_agenda)
+    original = service.get_conferences()
+    service.readme_path.write_text(everything(generated_agenda), encoding="utf-8")
+    assert service.reload()
+    service.readme_path.write_text(generated_agenda, encoding="utf-8")
+    assert service.reload()
+    await assert_same_store(service.get_conferences(), original)
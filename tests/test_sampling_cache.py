@@ -0,0 +1,75 @@
+"""Disk cache of sampled matches: keys, hits and misses, eviction and unreadable entries."""
+
+import os
+
+import pytest
+
+from mcp_server.sampling_cache import SamplingCache, sampling_key
+
+MATCHES = [{"name": "PyCon FR", "score": 90, "reasoning": "Python"}]
+CONFERENCES = [{"name": "PyCon FR", "tags": ["python"], "location": "Lyon (France)"}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SamplingCache(tmp_path / "sampling", max_entries=3)
+
+
+def test_key_depends_on_everything_sent():
+    key = sampling_key("Talk", CONFERENCES, {"temperature": 0.3})
+    assert key == sampling_key("Talk", [dict(reversed(CONFERENCES[0].items()))],
+                               {"temperature": 0.3})
+    assert len({
+        key,
+        sampling_key("Other talk", CONFERENCES, {"temperature": 0.3}),
+        sampling_key("Talk", CONFERENCES + CONFERENCES, {"temperature": 0.3}),
+        sampling_key("Talk", CONFERENCES, {"temperature": 0.7}),
+    }) == 4
+
+
+def test_miss_then_hit(cache):
+    assert cache.get("key") is None
+    cache.put("key", MATCHES)
+    assert cache.get("key") == MATCHES
+    assert cache.get("other") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "max_entries": 3}
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for number in range(3):
+        cache.put(f"key{number}", [{**MATCHES[0], "score": number}])
+        os.utime(cache._path(f"key{number}"), (1_000_000 + number,) * 2)
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get("key0")[0]["score"] == 0
+
+    cache.put("key3", MATCHES)
+    assert sorted(path.stem for path in cache.directory.glob("*.json")) == [
+        "key0", "key2", "key3"
+    ]
+    assert cache.get("key1") is None
+
+
+@pytest.mark.parametrize("content", ["not json", '{"matches": []}', ""])
+def test_unreadable_entry_is_a_miss_and_removed(cache, content):
+    cache.put("key", MATCHES)
+    cache._path("key").write_text(content, encoding="utf-8")
+    assert cache.get("key") is None
+    assert not cache._path("key").exists()
+    assert cache.stats()["misses"] == 1
+
+    cache.put("key", MATCHES)
+    assert cache.get("key") == MATCHES
+
+
+def test_write_failure_is_not_raised(tmp_path):
+    (tmp_path / "file").write_text("", encoding="utf-8")
+    cache = SamplingCache(tmp_path / "file" / "sampling")
+    cache.put("key", MATCHES)
+    assert cache.get("key") is None
+
+
+def test_size_zero_disables_the_cache(tmp_path):
+    cache = SamplingCache(tmp_path / "sampling", max_entries=0)
+    cache.put("key", MATCHES)
+    assert cache.get("key") is None
+    assert not (tmp_path / "sampling").exists()
@@ -0,0 +1,176 @@
+"""Cursor paging of search_page: pages, stale and invalid cursors, field projection."""
+
+import base64
+import json
+
+import pytest
+
+from mcp_server.query_cache import QueryCache
+from mcp_server.utils import (
+    CONFERENCE_FIELDS,
+    MAX_PAGE_SIZE,
+    _encode_cursor,
+    apply_filter,
+    search_page,
+)
+from tests.conftest import filter_args
+
+QUERIES = [
+    {},
+    {"country": "France"},
+    {"tags": "python,ai"},
+    {"cfp_open": True},
+    {"country": "usa", "tags": "devops", "cfp_open": True},
+    {"near": "Brussels", "radius_km": 300},
+    {"text": "devfest"},
+    {"text": "pycon", "country": "Germany"},
+    {"country": "Atlantis"},
+    {"country": "  "},
+]
+
+
+async def _all_pages(store, query: dict, limit: int, cache: QueryCache | None = None) -> list:
+    rows = []
+    cursor = None
+    while True:
+        page = await search_page(
+            store, **filter_args(query), limit=limit, cursor=cursor, cache=cache
+        )
+        assert len(page["conferences"]) <= limit
+        rows += page["conferences"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return rows
+        assert len(page["conferences"]) == limit
+
+
+@pytest.fixture
+def store(make_service, generated_agenda):
+    return make_service(generated_agenda).get_conferences()
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("cached", [False, True])
+async def test_pages_add_up_to_the_full_result(store, query, cached):
+    expected = await apply_filter(store, **filter_args(query))
+    cache = QueryCache() if cached else None
+    assert await _all_pages(store, query, 37, cache) == expected
+    # A result filling exactly one page has no next page
+    if 0 < len(expected) <= MAX_PAGE_SIZE:
+        assert await _all_pages(store, query, len(expected), cache) == expected
+
+
+async def test_page_size_is_capped(store):
+    page = await search_page(store, **filter_args({}), limit=0)
+    assert len(page["conferences"]) == 1
+    page = await search_page(store, **filter_args({}), limit=10 * MAX_PAGE_SIZE)
+    assert len(page["conferences"]) == MAX_PAGE_SIZE
+
+
+async def test_cursor_survives_equivalentfilter_args(store):
+    first = await search_page(store, **filter_args({"country": "France", "tags": "ai,python"}),
+                              limit=5)
+    second = await search_page(
+        store, **filter_args({"country": " france", "tags": "Python, AI"}),
+        limit=5, cursor=first["next_cursor"],
+    )
+    expected = await apply_filter(store, **filter_args({"country": "France", "tags": "ai,python"}))
+    assert first["conferences"] + second["conferences"] == expected[:10]
+
+
+async def test_blank_country_matches_nothing(store):
+    assert await apply_filter(store, **filter_args({"country": "  "})) == []
+    assert len(await apply_filter(store, **filter_args({"country": ""}))) == len(store)
+    page = await search_page(store, **filter_args({"country": ""}), limit=5)
+    with pytest.raises(ValueError, match="stale"):
+        await search_page(
+            store, **filter_args({"country": " "}), limit=5, cursor=page["next_cursor"]
+        )
+
+
+@pytest.mark.parametrize("changed", [
+    {"country": "Germany"},
+    {"tags": "python"},
+    {"cfp_open": True},
+    {"text": "devfest"},
+    {"near": "Paris"},
+])
+async def test_cursor_of_other_filters_is_stale(store, changed):
+    page = await search_page(store, **filter_args({"country": "France"}), limit=5)
+    with pytest.raises(ValueError, match="stale"):
+        await search_page(
+            store, **filter_args({"country": "France", **changed}),
+            limit=5, cursor=page["next_cursor"],
+        )
+
+
+async def test_cursor_is_stale_after_a_reload(make_service, generated_agenda):
+    service = make_service(generated_agenda)
+    page = await search_page(service.get_conferences(), **filter_args({}), limit=5)
+
+    service.readme_path.write_text(
+        generated_agenda.replace(" #0](", " Renamed #0]("), encoding="utf-8"
+    )
+    assert service.reload()
+    with pytest.raises(ValueError, match="stale"):
+        await search_page(
+            service.get_conferences(), **filter_args({}), limit=5, cursor=page["next_cursor"]
+        )
+
+
+def _raw_cursor(payload: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    "%%%",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    _raw_cursor({"last": 3}),
+    _raw_cursor(["a", "b"]),
+    _raw_cursor(None),
+])
+async def test_invalid_cursor(store, cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await search_page(store, **filter_args({}), cursor=cursor)
+
+
+async def test_cursor_with_a_non_integer_row(store):
+    page = await search_page(store, **filter_args({}), limit=5)
+    version, filters, _ = json.loads(
+        base64.urlsafe_b64decode(page["next_cursor"] + "=" * (-len(page["next_cursor"]) % 4))
+    )
+    with pytest.raises(ValueError):
+        await search_page(store, **filter_args({}), cursor=_raw_cursor([version, filters, "4"]))
+
+
+async def test_forged_cursor_resumes_after_its_row(store):
+    expected = await apply_filter(store, **filter_args({}))
+    page = await search_page(store, **filter_args({}), limit=3)
+    version, filters, _ = json.loads(
+        base64.urlsafe_b64decode(page["next_cursor"] + "=" * (-len(page["next_cursor"]) % 4))
+    )
+    cursor = _encode_cursor(store.source_hash, filters, 99)
+    assert version == store.source_hash[:16]
+    page = await search_page(store, **filter_args({}), limit=3, cursor=cursor)
+    assert page["conferences"] == expected[100:103]
+
+
+async def test_fields_projection(store):
+    full = await search_page(store, **filter_args({"country": "France"}), limit=20)
+    page = await search_page(
+        store, **filter_args({"country": "France"}), limit=20, fields=" name, , cfp,date "
+    )
+    assert page["next_cursor"] == full["next_cursor"]
+    assert page["conferences"] == [
+        {"name": row.name, "cfp": row.cfp, "date": row.date} for row in full["conferences"]
+    ]
+    assert all(list(row) == ["name", "cfp", "date"] for row in page["conferences"])
+
+    page = await search_page(store, **filter_args({}), limit=3, fields=",".join(CONFERENCE_FIELDS))
+    assert all(tuple(row) == CONFERENCE_FIELDS for row in page["conferences"])
+
+
+async def test_unknown_fields(store):
+    with pytest.raises(ValueError, match="Unknown fields"):
+        await search_page(store, **filter_args({}), fields="name,organizer")
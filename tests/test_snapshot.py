@@ -0,0 +1,207 @@
+"""Parse snapshots: round trip, rejection of stale files, publication and attachment."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server import snapshot
+from mcp_server.snapshot import (
+    prune_snapshots,
+    publish_snapshot,
+    published_path,
+    published_snapshot,
+    read_snapshot,
+    snapshot_path,
+    write_snapshot,
+)
+from mcp_server.tag_matcher import TagMatcher
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    return tmp_path / "snapshots"
+
+
+def assert_same_store(loaded, fresh) -> None:
+    assert loaded.source_hash == fresh.source_hash
+    assert list(loaded) == list(fresh)
+    assert loaded.latitude.tobytes() == fresh.latitude.tobytes()
+    assert loaded.longitude.tobytes() == fresh.longitude.tobytes()
+    assert loaded.sections.values == fresh.sections.values
+    assert list(loaded.section) == list(fresh.section)
+    assert loaded.iso_dates == fresh.iso_dates
+
+    # Indexes read from the snapshot answer like the ones built by the parse
+    for query in (
+        {"country_codes": {loaded.countries.code("France")}},
+        {"tag_mask": loaded.tag_mask(["python", "ai"])},
+        {"cfp_open_at": 0},
+        {"near": (50.85, 4.35, 300.0)},
+    ):
+        assert list(loaded.index.scan(**query)) == list(fresh.index.scan(**query))
+    assert list(loaded.index.text.rank("devox paris")) == list(fresh.index.text.rank("devox paris"))
+    assert loaded.index.facets() == fresh.index.facets()
+
+
+def test_round_trip_matches_a_fresh_parse(make_service, generated_agenda, snapshot_dir):
+    service = make_service(generated_agenda, snapshot_dir=snapshot_dir)
+    assert service.startup_report["source"] == "parse"
+    fresh = make_service(generated_agenda).get_conferences()
+
+    path = snapshot_path(snapshot_dir, fresh.source_hash)
+    store, header = read_snapshot(path, fresh.source_hash, service.tagger.fingerprint)
+    assert header["rows"] == len(fresh)
+    assert_same_store(store, fresh)
+    # The service itself serves the mapping of its snapshot
+    assert_same_store(service.get_conferences(), fresh)
+
+    # The next service loads the snapshot instead of parsing
+    reloaded = make_service(generated_agenda, snapshot_dir=snapshot_dir)
+    assert reloaded.startup_report["source"] == "snapshot"
+    assert_same_store(reloaded.get_conferences(), fresh)
+
+
+def test_written_store_round_trips(make_service, generated_agenda, tmp_path):
+    fresh = make_service(generated_agenda).get_conferences()
+    path = tmp_path / "store.snap"
+    write_snapshot(fresh, path, fresh.source_hash, 1.5, "tagger")
+    store, header = read_snapshot(path, fresh.source_hash, "tagger")
+    assert header["parse_seconds"] == 1.5
+    assert_same_store(store, fresh)
+
+
+@pytest.fixture
+def written(make_service, generated_agenda, tmp_path):
+    store = make_service(generated_agenda).get_conferences()
+    path = tmp_path / "store.snap"
+    write_snapshot(store, path, store.source_hash, 0.1, "tagger")
+    return path, store.source_hash
+
+
+def test_stale_snapshots_are_rejected(written, monkeypatch):
+    path, digest = written
+    assert read_snapshot(path, digest, "tagger") is not None
+    assert read_snapshot(path, None, "tagger") is not None
+
+    assert read_snapshot(path, "0" * 64, "tagger") is None
+    assert read_snapshot(path, digest, "other tagger") is None
+    with monkeypatch.context() as patched:
+        patched.setattr(snapshot, "SNAPSHOT_VERSION", snapshot.SNAPSHOT_VERSION + 1)
+        assert read_snapshot(path, digest, "tagger") is None
+    with monkeypatch.context() as patched:
+        patched.setattr(
+            snapshot, "default_gazetteer", lambda: SimpleNamespace(fingerprint="other")
+        )
+        assert read_snapshot(path, digest, "tagger") is None
+
+
+def test_unreadable_snapshots_are_ignored(written, tmp_path):
+    path, digest = written
+    assert read_snapshot(tmp_path / "missing.snap", digest, "tagger") is None
+    for content in (b"", b"not a snapshot", path.read_bytes()[:100]):
+        broken = tmp_path / "broken.snap"
+        broken.write_bytes(content)
+        assert read_snapshot(broken, digest, "tagger") is None
+
+
+def test_other_tags_parse_again(make_service, generated_agenda, snapshot_dir):
+    make_service(generated_agenda, snapshot_dir=snapshot_dir)
+    other = make_service(
+        generated_agenda, snapshot_dir=snapshot_dir, tagger=TagMatcher({"rust": ["rust"]})
+    )
+    assert other.startup_report["source"] == "parse"
+    assert other.get_conferences().tag_names.values == ["rust"]
+
+
+def test_attached_service_follows_new_generations(make_service, generated_agenda, snapshot_dir):
+    publisher = make_service(generated_agenda, snapshot_dir=snapshot_dir)
+    assert publisher.generation == 1
+    attached = make_service(generated_agenda, snapshot_dir=snapshot_dir, attach=True)
+    assert attached.startup_report["source"] == "attach"
+    assert attached.generation == 1
+    assert_same_store(attached.get_conferences(), publisher.get_conferences())
+    assert not attached.reload()
+
+    edited = generated_agenda.replace(" #0](", " Renamed #0](")
+    publisher.readme_path.write_text(edited, encoding="utf-8")
+    assert publisher.reload()
+    assert publisher.generation == 2
+
+    assert attached.reload()
+    assert attached.generation == 2
+    assert_same_store(attached.get_conferences(), make_service(edited).get_conferences())
+    assert not attached.reload()
+
+
+def test_attaching_without_a_published_snapshot_times_out(make_service, snapshot_dir):
+    with pytest.raises(TimeoutError, match="No usable snapshot"):
+        make_service("", snapshot_dir=snapshot_dir, attach=True, snapshot_wait=0)
+
+
+def _snapshots(written, snapshot_dir, count: int) -> list:
+    """Copies of a snapshot under different names, oldest first."""
+    path, _ = written
+    snapshot_dir.mkdir(exist_ok=True)
+    paths = []
+    for i in range(count):
+        copy = snapshot_path(snapshot_dir, f"{i:064d}")
+        copy.write_bytes(path.read_bytes())
+        os.utime(copy, (1_000_000 + i, 1_000_000 + i))
+        paths.append(copy)
+    return paths
+
+
+def test_publishing_bumps_the_generation(written, snapshot_dir):
+    first, second = _snapshots(written, snapshot_dir, 2)
+    assert published_snapshot(snapshot_dir) is None
+    assert publish_snapshot(snapshot_dir, first) == 1
+    assert publish_snapshot(snapshot_dir, first) == 1
+    assert publish_snapshot(snapshot_dir, second) == 2
+    assert publish_snapshot(snapshot_dir, first) == 3
+    assert published_snapshot(snapshot_dir) == (3, first)
+    assert not (snapshot_dir / "current.lock").exists()
+
+
+def test_prune_keeps_the_published_snapshot(written, snapshot_dir):
+    paths = _snapshots(written, snapshot_dir, 6)
+    publish_snapshot(snapshot_dir, paths[0])
+    # Published long ago, older than every other snapshot
+    os.utime(paths[0], (1, 1))
+
+    prune_snapshots(snapshot_dir, keep=2)
+    assert sorted(snapshot_dir.glob("*.snap")) == [paths[0], paths[4], paths[5]]
+    assert published_snapshot(snapshot_dir) == (1, paths[0])
+
+
+def test_concurrent_publications_get_distinct_generations(written, snapshot_dir, monkeypatch):
+    paths = _snapshots(written, snapshot_dir, 8)
+    barrier = threading.Barrier(len(paths))
+    read = snapshot.published_snapshot
+
+    def slow_read(directory):
+        # Every publisher reads the pointer before any of them writes it, unless the
+        # publication lock keeps them apart
+        published = read(directory)
+        try:
+            barrier.wait(timeout=0.2)
+        except threading.BrokenBarrierError:
+            pass
+        return published
+
+    monkeypatch.setattr(snapshot, "published_snapshot", slow_read)
+    with ThreadPoolExecutor(len(paths)) as pool:
+        generations = list(pool.map(lambda path: publish_snapshot(snapshot_dir, path), paths))
+    assert sorted(generations) == list(range(1, len(paths) + 1))
+
+
+def test_stale_publication_lock_is_taken_over(written, snapshot_dir):
+    (path,) = _snapshots(written, snapshot_dir, 1)
+    lock = snapshot_dir / "current.lock"
+    lock.touch()
+    os.utime(lock, (1, 1))
+    assert publish_snapshot(snapshot_dir, path) == 1
+    assert published_path(snapshot_dir).exists()
+    assert not lock.exists()
@@ -0,0 +1,154 @@
+"""Startup modes of the servers: when the agenda loads, readiness and deferred registrations."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastmcp import Client, FastMCP
+from starlette.testclient import TestClient
+
+from mcp_server.startup import READY_PATH, Startup
+
+AGENDA = """# Agenda
+
+## 2026
+
+### March
+
+* 3: [PyCon FR](https://example.com/pycon) - Lyon (France)
+* 9: [Devoxx France](https://example.com/devoxx) - Paris (France)
+* 12: [KubeCon Europe](https://example.com/kubecon) - Amsterdam (Netherlands)
+"""
+
+
+class GatedFactory:
+    """Builds the parser service once released, counting the builds."""
+
+    def __init__(self, make_service, released: bool = True):
+        self.make_service = make_service
+        self.gate = threading.Event()
+        if released:
+            self.gate.set()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        assert self.gate.wait(10), "factory never released"
+        return self.make_service(AGENDA)
+
+
+def _server(mode: str, factory: GatedFactory) -> tuple[FastMCP, Startup]:
+    startup = Startup(mode)
+    mcp = FastMCP("startup", lifespan=startup.lifespan)
+    startup.install(mcp)
+    agenda = startup.load_agenda(factory)
+
+    @mcp.tool
+    async def count() -> int:
+        return len(await agenda.conferences())
+
+    @startup.defer
+    def register_later() -> None:
+        @mcp.tool
+        def deferred() -> str:
+            return "registered at start"
+
+    return mcp, startup
+
+
+def _ready(http: TestClient) -> tuple[int, dict]:
+    response = http.get(READY_PATH)
+    return response.status_code, response.json()
+
+
+def _wait(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition never met"
+        time.sleep(0.01)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown startup mode 'early'"):
+        Startup("early")
+
+
+async def test_eager_mode_loads_at_import(make_service):
+    factory = GatedFactory(make_service)
+    mcp, startup = _server("eager", factory)
+    assert factory.calls == 1
+    assert startup.agenda.loaded.is_set()
+    # Loaded, but the deferred registrations have not run yet
+    assert not startup.ready
+
+    async with Client(mcp) as client:
+        assert startup.ready
+        assert {tool.name for tool in await client.list_tools()} == {"count", "deferred"}
+        assert (await client.call_tool("count")).data == 3
+    assert factory.calls == 1
+    assert startup.profile["agenda"]["source"] == "parse"
+    assert startup.profile["first_request"]
+
+
+async def test_lazy_mode_loads_at_the_first_call(make_service):
+    factory = GatedFactory(make_service)
+    mcp, startup = _server("lazy", factory)
+    async with Client(mcp) as client:
+        # Ready at once, the first call waits for the agenda
+        assert startup.ready
+        assert factory.calls == 0
+        await client.list_tools()
+        assert factory.calls == 0
+        assert (await client.call_tool("count")).data == 3
+        assert (await client.call_tool("count")).data == 3
+    assert factory.calls == 1
+    assert "agenda_load_ms" in startup.profile
+
+
+def test_ready_endpoint_waits_for_a_background_load(make_service):
+    factory = GatedFactory(make_service, released=False)
+    mcp, startup = _server("background", factory)
+    with TestClient(mcp.http_app()) as http:
+        _wait(lambda: factory.calls == 1)
+        status, body = _ready(http)
+        assert status == 503
+        assert body["ready"] is False
+        assert "started_ms" in body["startup"]
+        assert "ready_ms" not in body["startup"]
+
+        factory.gate.set()
+        _wait(startup.agenda.loaded.is_set)
+        status, body = _ready(http)
+        assert status == 200
+        assert body["ready"] is True
+        assert body["startup"]["mode"] == "background"
+        assert body["startup"]["agenda"]["conferences"] == 3
+        assert body["startup"]["ready_ms"] >= body["startup"]["agenda_loaded_ms"]
+    assert factory.calls == 1
+
+
+@pytest.mark.parametrize("mode, status", [("eager", 200), ("lazy", 200)])
+def test_ready_endpoint_of_the_other_modes(make_service, mode, status):
+    mcp, startup = _server(mode, GatedFactory(make_service))
+    with TestClient(mcp.http_app()) as http:
+        assert _ready(http)[0] == status
+
+
+async def test_call_during_a_background_load_waits_for_the_agenda(make_service):
+    factory = GatedFactory(make_service, released=False)
+    mcp, startup = _server("background", factory)
+    async with Client(mcp) as client:
+        # The event loop keeps serving while the agenda loads
+        assert {tool.name for tool in await client.list_tools()} == {"count", "deferred"}
+        await asyncio.to_thread(_wait, lambda: factory.calls == 1)
+
+        call = asyncio.create_task(client.call_tool("count"))
+        await asyncio.sleep(0.2)
+        assert not call.done()
+        assert not startup.ready
+
+        factory.gate.set()
+        assert (await asyncio.wait_for(call, 5)).data == 3
+        assert startup.ready
+    assert factory.calls == 1
@@ -0,0 +1,170 @@
+"""Tag keyword boundary modes and custom tag files."""
+
+import json
+
+import pytest
+
+from mcp_server.markdown_parser import TECH_KEYWORDS, tag_keywords
+from mcp_server.tag_matcher import TagMatcher
+
+NAMES = [
+    "Majs Conf",
+    "Mainz Tech Day",
+    "JSConf EU",
+    "JS Days",
+    "Node.js Summit",
+    "AI Summit",
+    "Paris AI Week",
+    "Machine Learning Week",
+    "Machine Learnings",
+    "Devoxx France",
+    "Developers Summit",
+    "DevFest Nantes",
+    "Détente",
+    ".NET Conf",
+    "DotNet Day",
+    "C# Days",
+    "Cloud Native Days",
+    "Clouds of Data",
+    "Java Day",
+    "JavaScript Day",
+    "Scrum Gathering",
+    "Android Makers",
+    "DjangoCon",
+    "Spring I/O",
+    "Vue.js Live",
+    "Bazar",
+    "",
+]
+
+
+def _substring_tags(name: str) -> tuple[str, ...]:
+    """Tags of the baseline parser: a keyword anywhere in the lowercased name."""
+    name = name.lower()
+    return tuple(tag for tag, keywords in TECH_KEYWORDS.items()
+                 if any(keyword in name for keyword in keywords))
+
+
+@pytest.mark.parametrize("name, tags", [
+    ("Majs Conf", ()),
+    ("Mainz Tech Day", ()),
+    ("Bazar", ()),
+    ("JSConf EU", ("javascript",)),
+    ("Node.js Summit", ("javascript",)),
+    ("AI Summit", ("ai",)),
+    ("Paris AI Week", ("ai",)),
+    ("Machine Learnings", ("ai",)),
+    ("Devoxx France", ("development",)),
+    ("Détente", ()),
+    ("Clouds of Data", ("cloud", "data")),
+    ("JavaScript Day", ("javascript", "java")),
+    (".NET Conf", (".net",)),
+    ("C# Days", (".net",)),
+])
+def test_start_mode_matches_keywords_at_word_starts(name, tags):
+    assert TagMatcher(TECH_KEYWORDS, "start").tags(name) == tags
+
+
+@pytest.mark.parametrize("name, tags", [
+    ("Majs Conf", ()),
+    ("Mainz Tech Day", ()),
+    ("JSConf EU", ()),
+    ("JS Days", ("javascript",)),
+    ("Node.js Summit", ("javascript",)),
+    ("AI Summit", ("ai",)),
+    ("Machine Learning Week", ("ai",)),
+    ("Machine Learnings", ()),
+    ("Devoxx France", ()),
+    ("Developers Summit", ("development",)),
+    ("DevFest Nantes", ()),
+    ("Clouds of Data", ("data",)),
+    ("JavaScript Day", ("javascript",)),
+    (".NET Conf", (".net",)),
+    ("DotNet Day", (".net",)),
+    ("C# Days", (".net",)),
+])
+def test_word_mode_matches_whole_words(name, tags):
+    assert TagMatcher(TECH_KEYWORDS, "word").tags(name) == tags
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_none_mode_matches_substrings_like_the_baseline(name):
+    assert TagMatcher(TECH_KEYWORDS, "none").tags(name) == _substring_tags(name)
+
+
+def test_none_mode_on_the_generated_agenda(make_service, generated_agenda):
+    matcher = TagMatcher(TECH_KEYWORDS, "none")
+    store = make_service(generated_agenda, tagger=matcher).get_conferences()
+    names = set(store.name)
+    assert len(names) > 100
+    assert all(matcher.tags(name) == _substring_tags(name) for name in names)
+    # Substrings match inside words, which the other modes avoid
+    assert matcher.tags("Majs Mainz") == ("ai", "javascript")
+
+
+def test_masks_and_tag_lists_agree():
+    matcher = TagMatcher(TECH_KEYWORDS)
+    for name in NAMES:
+        assert matcher.tag_list(matcher.mask(name)) == matcher.tags(name)
+
+
+def test_unknown_boundary_mode():
+    with pytest.raises(ValueError, match="Unknown boundary mode"):
+        TagMatcher(TECH_KEYWORDS, "prefix")
+
+
+def test_fingerprint_follows_keywords_and_mode():
+    fingerprints = {
+        TagMatcher(TECH_KEYWORDS, "start").fingerprint,
+        TagMatcher(TECH_KEYWORDS, "word").fingerprint,
+        TagMatcher({**TECH_KEYWORDS, "rust": ["rust"]}, "start").fingerprint,
+    }
+    assert len(fingerprints) == 3
+    assert TagMatcher(dict(TECH_KEYWORDS)).fingerprint == TagMatcher(TECH_KEYWORDS).fingerprint
+
+
+def test_custom_tags_file_is_merged(tmp_path):
+    tags_file = tmp_path / "tags.json"
+    tags_file.write_text(json.dumps({
+        "rust": ["rust", "rustacean"],
+        "python": ["pycon", "python"],
+    }), encoding="utf-8")
+
+    keywords = tag_keywords(tags_file)
+    # New tags come after the built-in ones, same-named tags are replaced in place
+    assert list(keywords) == [*TECH_KEYWORDS, "rust"]
+    assert keywords["python"] == ["pycon", "python"]
+    assert keywords["java"] == TECH_KEYWORDS["java"]
+    assert tag_keywords(None) == TECH_KEYWORDS
+
+    matcher = TagMatcher(keywords)
+    assert matcher.tags("RustConf") == ("rust",)
+    assert matcher.tags("PyCon US") == ("python",)
+    # "django" only tagged python through the replaced keywords
+    assert matcher.tags("DjangoCon") == ()
+
+
+def test_custom_tags_are_searchable(make_service, tmp_path):
+    tags_file = tmp_path / "tags.json"
+    tags_file.write_text(json.dumps({"rust": ["rust"]}), encoding="utf-8")
+    agenda = (
+        "## 2025\n\n### June\n\n"
+        "* 3: [RustConf](https://example.com/rust) - Portland (USA)\n"
+        "* 4: [PyCon](https://example.com/pycon) - Pittsburgh (USA)\n"
+    )
+    store = make_service(agenda, tagger=TagMatcher(tag_keywords(tags_file))).get_conferences()
+    assert [store.name[row] for row in store.index.scan(tag_mask=store.tag_mask(["rust"]))] == [
+        "RustConf"
+    ]
+
+
+@pytest.mark.parametrize("content", [
+    '["rust"]',
+    '{"rust": "rust"}',
+    '{"rust": ["rust", 1]}',
+])
+def test_malformed_tags_file(tmp_path, content):
+    tags_file = tmp_path / "tags.json"
+    tags_file.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError, match="must map tag names"):
+        tag_keywords(tags_file)
@@ -0,0 +1,292 @@
+"""Sampling of talk matches: retries of truncated responses, failure on refusals, and
+the elicitation of the matches."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from mcp_server.sampling_cache import SamplingCache
+from mcp_server.talk_matching import match_and_elicit, stream_matches
+
+CONFERENCES = [
+    {"name": f"Conf {i}", "tags": ["python"], "location": "Paris (France)"} for i in range(10)
+]
+
+
+def _batch(prompt: str) -> list[str]:
+    """Names of the conferences listed in a sampling prompt."""
+    return [
+        json.loads(line)["name"] for line in prompt.splitlines() if line.startswith('{"name"')
+    ]
+
+
+def _answer(names: list[str]) -> str:
+    return json.dumps(
+        {"matches": [{"name": name, "score": 80, "reasoning": "Python"} for name in names]}
+    )
+
+
+class FakeContext:
+    """
+    Context whose sampling requests are answered by reply(batch, call number), and
+    whose elicitations by elicit(response_type).
+    """
+
+    def __init__(self, reply, elicit=None):
+        self.reply = reply
+        self.batches: list[list[str]] = []
+        self.elicit_reply = elicit
+        self.elicitations: list[object] = []
+
+    async def sample_step(self, messages: str, temperature: float, max_tokens: int):
+        await asyncio.sleep(0)
+        batch = _batch(messages)
+        self.batches.append(batch)
+        text, stop_reason = self.reply(batch, len(self.batches))
+        return SimpleNamespace(text=text, response=SimpleNamespace(stopReason=stop_reason))
+
+    async def elicit(self, message: str, response_type: object):
+        self.elicitations.append(response_type)
+        return self.elicit_reply(response_type)
+
+
+async def _sample(ctx, **options) -> list[dict]:
+    options.setdefault("batch_size", 4)
+    return [
+        match
+        async for matches in stream_matches(ctx, "MCP", "About MCP", CONFERENCES, **options)
+        for match in matches
+    ]
+
+
+@pytest.mark.parametrize("reply, error", [
+    ('{"error": "Sampling denied by user"}', "Sampling denied by user"),
+    ('{"error": "Invalid user response"}', "Invalid user response"),
+    ("I cannot score these conferences.", "no matches list"),
+    ("", "empty response"),
+    ('{"result": []}', "no matches list"),
+])
+async def test_responses_without_matches_fail_at_once(reply, error):
+    ctx = FakeContext(lambda batch, call: (reply, "endTurn"))
+    with pytest.raises(ValueError, match=error):
+        await _sample(ctx, concurrency=1)
+    # Neither the batch nor its halves are sampled again
+    assert len(ctx.batches) == 1
+
+
+async def test_concurrent_requests_stop_at_the_first_refusal():
+    ctx = FakeContext(lambda batch, call: ('{"error": "Sampling denied by user"}', None))
+    with pytest.raises(ValueError, match="denied"):
+        await _sample(ctx, concurrency=4)
+    # Requests already sent may be answered, but none is sent again or split
+    assert len(ctx.batches) <= 3
+
+
+async def test_empty_matches_list_is_a_complete_answer():
+    ctx = FakeContext(lambda batch, call: ('{"matches": []}', "endTurn"))
+    assert await _sample(ctx) == []
+    assert len(ctx.batches) == 3
+
+
+async def test_truncated_list_samples_the_rest_again():
+    def reply(batch, call):
+        if call == 1:
+            # Cut inside the third match
+            return _answer(batch)[:-80], "endTurn"
+        return _answer(batch), "endTurn"
+
+    ctx = FakeContext(reply)
+    matches = await _sample(ctx, concurrency=1)
+    assert sorted(match["name"] for match in matches) == sorted(c["name"] for c in CONFERENCES)
+    first, *others = ctx.batches
+    assert first[2:] in others
+
+
+async def test_token_limit_without_a_list_splits_the_batch():
+    def reply(batch, call):
+        if call == 1:
+            return '```json\n{"mat', "maxTokens"
+        return _answer(batch), "endTurn"
+
+    ctx = FakeContext(reply)
+    matches = await _sample(ctx, concurrency=1)
+    assert len(matches) == len(CONFERENCES)
+    first = ctx.batches[0]
+    assert first[:2] in ctx.batches and first[2:] in ctx.batches
+
+
+async def test_conference_dropped_when_it_never_fits():
+    def reply(batch, call):
+        if "Conf 0" in batch:
+            return "", "maxTokens"
+        return _answer(batch), "endTurn"
+
+    ctx = FakeContext(reply)
+    matches = await _sample(ctx, concurrency=1)
+    assert sorted(match["name"] for match in matches) == [f"Conf {i}" for i in range(1, 10)]
+    assert ["Conf 0"] in ctx.batches
+
+
+async def test_cached_matches_are_not_sampled_again(tmp_path):
+    cache = SamplingCache(tmp_path)
+    ctx = FakeContext(lambda batch, call: (_answer(batch), "endTurn"))
+    first = await _sample(ctx, cache=cache)
+    assert len(ctx.batches) == 3
+
+    assert await _sample(ctx, cache=cache) == first
+    assert len(ctx.batches) == 3
+    assert cache.stats()["hits"] == 1
+    # Another batching is another sampling
+    await _sample(ctx, cache=cache, batch_size=5)
+    assert len(ctx.batches) == 5
+
+
+async def test_use_cache_false_samples_again_and_replaces(tmp_path):
+    cache = SamplingCache(tmp_path)
+    await _sample(FakeContext(lambda batch, call: ('{"matches": []}', "endTurn")), cache=cache)
+
+    ctx = FakeContext(lambda batch, call: (_answer(batch), "endTurn"))
+    matches = await _sample(ctx, cache=cache, use_cache=False)
+    assert len(matches) == len(CONFERENCES)
+    assert len(ctx.batches) == 3
+
+    assert await _sample(ctx, cache=cache) == matches
+    assert len(ctx.batches) == 3
+
+
+async def test_corrupt_cache_entry_is_sampled_again(tmp_path):
+    cache = SamplingCache(tmp_path)
+    ctx = FakeContext(lambda batch, call: (_answer(batch), "endTurn"))
+    matches = await _sample(ctx, cache=cache)
+    (entry,) = tmp_path.glob("*.json")
+    entry.write_text('[{"name": "Conf', encoding="utf-8")
+
+    assert await _sample(ctx, cache=cache) == matches
+    assert len(ctx.batches) == 6
+    assert await _sample(ctx, cache=cache) == matches
+    assert len(ctx.batches) == 6
+
+
+async def test_incomplete_matches_are_not_cached(tmp_path):
+    cache = SamplingCache(tmp_path)
+
+    def reply(batch, call):
+        if "Conf 0" in batch:
+            return "", "maxTokens"
+        return _answer(batch), "endTurn"
+
+    await _sample(FakeContext(reply), cache=cache)
+    assert not list(tmp_path.glob("*.json"))
+
+
+def _scores(batch, call):
+    # Later conferences score higher, so that the merged order differs from the batches
+    return json.dumps({"matches": [
+        {"name": name, "score": 40 + int(name.split()[1]), "reasoning": "Python"}
+        for name in batch if name != "Conf 3"
+    ]}), "endTurn"
+
+
+def _select(*names):
+    def elicit(response_type):
+        return SimpleNamespace(action="accept", data=list(names))
+    return elicit
+
+
+async def test_batch_mode_asks_once_for_every_batch():
+    ctx = FakeContext(_scores, _select("Conf 1", "Conf 8", "Conf 5"))
+    matches, applied = await match_and_elicit(
+        ctx, "MCP", "About MCP", CONFERENCES, mode="batch", batch_size=4
+    )
+    assert len(ctx.batches) == 3
+    [options] = ctx.elicitations
+    expected = [f"Conf {i}" for i in (9, 8, 7, 6, 5, 4, 2, 1, 0)]
+    assert [match["name"] for match in matches] == expected
+    assert list(options[0]) == expected
+    assert applied == ["Conf 8", "Conf 5", "Conf 1"]
+
+
+@pytest.mark.parametrize("failure", [
+    McpError(ErrorData(code=-32602, message="Unsupported schema")),
+    None,
+])
+async def test_batch_mode_falls_back_to_one_question_per_match(failure):
+    def elicit(response_type):
+        if response_type is not None:
+            if failure is not None:
+                raise failure
+            return SimpleNamespace(action="accept", data="Conf 1")
+        return SimpleNamespace(action="accept", data=None)
+
+    ctx = FakeContext(_scores, elicit)
+    matches, applied = await match_and_elicit(
+        ctx, "MCP", "About MCP", CONFERENCES[:3], mode="batch", batch_size=2
+    )
+    assert ctx.elicitations[1:] == [None, None, None]
+    assert applied == ["Conf 2", "Conf 1", "Conf 0"]
+
+
+async def test_per_item_mode_asks_for_each_match():
+    def elicit(response_type):
+        return SimpleNamespace(action="accept" if len(ctx.elicitations) == 2 else "decline")
+
+    ctx = FakeContext(_scores, elicit)
+    matches, applied = await match_and_elicit(
+        ctx, "MCP", "About MCP", CONFERENCES[:6], mode="per_item", batch_size=2, concurrency=1
+    )
+    assert ctx.elicitations == [None] * 5
+    # Batches are asked about in turn, best match first
+    assert applied == ["Conf 0"]
+    assert [match["name"] for match in matches] == ["Conf 5", "Conf 4", "Conf 2", "Conf 1",
+                                                    "Conf 0"]
+
+
+class SlowContext(FakeContext):
+    """Context whose sampling requests take longer one after the other."""
+
+    def __init__(self, reply, elicit):
+        super().__init__(reply, elicit)
+        self.events: list[str] = []
+        self.started = 0
+
+    async def sample_step(self, messages: str, temperature: float, max_tokens: int):
+        self.started += 1
+        await asyncio.sleep(0.01 * self.started)
+        step = await super().sample_step(messages, temperature, max_tokens)
+        self.events.append("sampled")
+        return step
+
+    async def elicit(self, message: str, response_type: object):
+        self.events.append("elicit")
+        return await super().elicit(message, response_type)
+
+
+async def test_per_item_mode_asks_before_the_last_batch_is_scored():
+    ctx = SlowContext(_scores, lambda response_type: SimpleNamespace(action="decline"))
+    await match_and_elicit(ctx, "MCP", "About MCP", CONFERENCES, mode="per_item", batch_size=4)
+    assert ctx.events.count("sampled") == 3
+    last_sampled = len(ctx.events) - 1 - ctx.events[::-1].index("sampled")
+    assert ctx.events.index("elicit") < last_sampled
+    # Every match is asked about once
+    assert ctx.events.count("elicit") == 9
+
+
+async def test_batch_mode_asks_once_every_batch_is_scored():
+    ctx = SlowContext(_scores, _select())
+    await match_and_elicit(ctx, "MCP", "About MCP", CONFERENCES, mode="batch", batch_size=4)
+    assert ctx.events == ["sampled"] * 3 + ["elicit"]
+
+
+async def test_no_question_without_matches():
+    ctx = FakeContext(lambda batch, call: ('{"matches": []}', "endTurn"), _select())
+    assert await match_and_elicit(ctx, "MCP", "About MCP", CONFERENCES) == ([], [])
+    assert ctx.elicitations == []
+
+
+async def test_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown elicitation mode"):
+        await match_and_elicit(FakeContext(_scores), "MCP", "About MCP", CONFERENCES, mode="all")
@@ -0,0 +1,95 @@
+"""Fuzzy text search: misspelled words, multi-word queries, ranking and threshold."""
+
+import pytest
+
+from mcp_server.conference_index import TEXT_MIN_SIMILARITY
+
+AGENDA = """\
+# Agenda
+
+## 2025
+
+### March
+
+* 2: [Python Summit](https://example.com/python) - Berlin (Germany)
+* 3: [Devoxx France](https://example.com/devoxx-fr) - Paris (France)
+* 4: [DevFest Brussels](https://example.com/devfest) - Brussels (Belgium)
+* 5: [Devoxx Belgium](https://example.com/devoxx-be) - Antwerp (Belgium)
+* 6: [Brussels JS](https://example.com/js) - Brussels (Belgium)
+* 7: [React Summit](https://example.com/react) - Amsterdam (The Netherlands)
+* 8: [PyCon Lyon](https://example.com/pycon) - Lyon (France)
+* 9: [Café Conf](https://example.com/cafe) - Zürich (Switzerland)
+"""
+
+
+@pytest.fixture
+def store(make_service):
+    return make_service(AGENDA).get_conferences()
+
+
+def _names(store, rows) -> list[str]:
+    return [store.name[row] for row in rows]
+
+
+def _code(store, word: str) -> int:
+    """Code of an agenda word, the only word fully similar to itself."""
+    similarity, code = store.index.text.similar_words(word)[0]
+    assert similarity == 1
+    return code
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Devox", ["Devoxx France", "Devoxx Belgium"]),
+    ("devoxx", ["Devoxx France", "Devoxx Belgium"]),
+    ("Brussel", ["DevFest Brussels", "Brussels JS"]),
+    ("BRUSSELS", ["DevFest Brussels", "Brussels JS"]),
+    ("zurich", ["Café Conf"]),
+    ("cafe", ["Café Conf"]),
+    ("kubernetes", []),
+    ("", []),
+])
+def test_misspelled_and_folded_words(store, query, expected):
+    assert _names(store, store.index.text.rank(query)) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    # Every query word must match a word of the row, in its name, city or country
+    ("devoxx belgium", ["Devoxx Belgium"]),
+    ("belgium devox", ["Devoxx Belgium"]),
+    ("devfest brussel", ["DevFest Brussels"]),
+    ("summit germany", ["Python Summit"]),
+    ("devoxx netherlands", []),
+    ("devoxx kubernetes", []),
+])
+def test_multi_word_queries_intersect(store, query, expected):
+    assert _names(store, store.index.text.rank(query)) == expected
+
+
+def test_closer_matches_rank_first(store):
+    # "python" shares 3 of the 10 trigrams of "pycon" and "python" together
+    assert _names(store, store.index.text.rank("pycon")) == ["PyCon Lyon", "Python Summit"]
+    assert _names(store, store.index.text.rank("python")) == ["Python Summit", "PyCon Lyon"]
+    # The row matching both words exactly comes before rows matching one loosely
+    assert _names(store, store.index.text.rank("pycon lyon")) == ["PyCon Lyon"]
+    assert _names(store, store.index.text.rank("summit python")) == ["Python Summit"]
+
+
+def test_similarity_is_the_trigram_jaccard_index(store):
+    text = store.index.text
+    # "devox" has 6 trigrams, "devoxx" 7, and they share 5
+    assert text.similar_words("devox") == [(0.625, _code(store, "devoxx"))]
+    similar = text.similar_words("pycon")
+    assert similar == [(1.0, _code(store, "pycon")), (0.3, _code(store, "python"))]
+
+
+def test_similarity_threshold(store):
+    text = store.index.text
+    assert TEXT_MIN_SIMILARITY == 0.3
+    assert [code for _, code in text.similar_words("pycon", 0.31)] == [_code(store, "pycon")]
+    assert _names(store, text.rank("pycon", min_similarity=0.31)) == ["PyCon Lyon"]
+    assert text.similar_words("devox", 0.625) and not text.similar_words("devox", 0.63)
+    assert _names(store, text.rank("devox", min_similarity=0.7)) == []
+    # Short words: "jsx" shares 2 of their 5 trigrams with "js", "css" 1 of 8 with "cafe"
+    assert _names(store, text.rank("jsx")) == ["Brussels JS"]
+    assert _names(store, text.rank("jsx", min_similarity=0.41)) == []
+    assert _names(store, text.rank("css")) == []